@@ -0,0 +1,44 @@
+from argparse import ArgumentParser
+from json import dump
+from platform import platform, python_version
+from subprocess import run
+from sys import stdout
+from time import strftime
+
+from benchmarks.suite import Params, run_benchmarks
+
+
+def main():
+    parser = ArgumentParser(prog='python -m benchmarks',
+                            description='Times Store, PC and data operations on synthetic store.')
+    parser.add_argument('--pcs', type=int, default=20_000, help='number of PCs in the store')
+    parser.add_argument('--components', type=int, default=6, help='number of components of each PC')
+    parser.add_argument('--params', type=int, default=3, help='number of specification parameters of each component')
+    parser.add_argument('--repeat', type=int, default=3, help='number of timed runs of each benchmark')
+    parser.add_argument('--output', help='path to JSON file with results, printed to stdout by default')
+    parser.add_argument('selected', nargs='*', help='prefixes of names of benchmarks to be run, i.e. store.')
+    args = parser.parse_args()
+
+    params = Params(args.pcs, args.components, args.params)
+    results = run_benchmarks(params, args.repeat, args.selected)
+    report = {'meta': {'commit': __get_commit(), 'python': python_version(), 'platform': platform(),
+                       'time': strftime('%Y-%m-%dT%H:%M:%S'), 'params': params._asdict(), 'repeat': args.repeat},
+              'results': {name: result._asdict() for name, result in results.items()}}
+
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            dump(report, output_file, indent=2)
+    else:
+        dump(report, stdout, indent=2)
+        print()
+
+
+def __get_commit() -> str:
+    try:
+        return run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, ValueError):
+        return ''
+
+
+if __name__ == '__main__':
+    main()
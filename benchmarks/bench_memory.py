@@ -0,0 +1,95 @@
+from argparse import ArgumentParser
+from json import dumps, load, loads
+from pathlib import Path
+from subprocess import run
+from sys import executable
+from tempfile import TemporaryDirectory
+from tracemalloc import start, take_snapshot
+from typing import Dict
+
+from benchmarks.generators import generate_store
+from benchmarks.measures import get_resident_size
+from pc_spec.data import load_store, save_store
+from pc_spec.pc import PC
+from pc_spec.store import Store
+
+VARIANTS = {
+    'json-no-pool': 'json',
+    'json': 'json',
+    'json-read-only': 'json',
+    'binary': 'binary',
+    'binary-read-only': 'binary',
+}
+
+
+def measure_memory(pcs: int, components: int, params: int) -> Dict[str, Dict[str, float]]:
+    """
+    Measures memory taken by single loaded PC for every variant of loading.
+    'json-no-pool' loads PCs like load_store did before string pool was introduced.
+    Each variant is measured in separate processes, so they don't affect each other.
+    :param pcs: number of generated PCs
+    :param components: number of components of each PC
+    :param params: number of specification parameters of each component
+    :return: bytes allocated by Python and bytes of resident memory per PC for each variant
+    """
+    results = {}
+
+    with TemporaryDirectory() as temp_dir:
+        store = generate_store(pcs, components, params)
+
+        for format in set(VARIANTS.values()):
+            save_store(store, Path(temp_dir, format), format=format)
+
+        for variant, format in VARIANTS.items():
+            source_dir = Path(temp_dir, format)
+            results[variant] = {'allocated_bytes_per_pc': __measure_in_process(variant, source_dir, 'allocated') / pcs,
+                                'resident_bytes_per_pc': __measure_in_process(variant, source_dir, 'resident') / pcs}
+
+    return results
+
+
+def __measure_in_process(variant: str, source_dir: Path, measure: str) -> int:
+    command = [executable, '-m', 'benchmarks.bench_memory', '--variant', variant, '--source-dir', str(source_dir),
+               '--measure', measure]
+    return loads(run(command, capture_output=True, text=True, check=True).stdout)
+
+
+def __load(variant: str, source_dir: Path) -> Store:
+    if variant == 'json-no-pool':
+        with open(Path(source_dir, 'store.json')) as json_file:
+            return Store(PC(*next(iter(serialized_pc.items()))) for serialized_pc in load(json_file))
+    return load_store(source_dir, read_only=variant.endswith('read-only'))
+
+
+def __measure_variant(variant: str, source_dir: Path, measure: str) -> int:
+    if measure == 'allocated':
+        start()
+        store = __load(variant, source_dir)
+        size = sum(stat.size for stat in take_snapshot().statistics('filename'))
+    else:
+        resident_size = get_resident_size()
+        store = __load(variant, source_dir)
+        size = get_resident_size() - resident_size
+
+    assert store.pcs
+    return size
+
+
+def main():
+    parser = ArgumentParser(description='Measures memory taken by loaded PCs.')
+    parser.add_argument('--pcs', type=int, default=100_000)
+    parser.add_argument('--components', type=int, default=6)
+    parser.add_argument('--params', type=int, default=3)
+    parser.add_argument('--variant', choices=list(VARIANTS), help='measure only given variant of loading')
+    parser.add_argument('--source-dir', type=Path, help='directory with store of measured variant')
+    parser.add_argument('--measure', choices=['allocated', 'resident'], default='resident')
+    args = parser.parse_args()
+
+    if args.variant:
+        print(__measure_variant(args.variant, args.source_dir, args.measure))
+    else:
+        print(dumps(measure_memory(args.pcs, args.components, args.params), indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+from argparse import ArgumentParser
+from json import load
+from sys import exit
+from typing import Dict, List, Tuple
+
+
+def compare(baseline: Dict, current: Dict, threshold: float) -> Tuple[List[str], List[str]]:
+    """
+    Compares two benchmark reports.
+    :param baseline: report of reference run, i.e. from main branch
+    :param current: report of compared run
+    :param threshold: ratio of current to baseline time (or peak memory) above which result is a regression
+    :return: lines of comparison table and names of regressed benchmarks
+    """
+    lines = [f'{"benchmark":<40} {"baseline us/op":>15} {"current us/op":>15} {"time":>7} {"memory":>7}']
+    regressions = []
+
+    for name, result in current['results'].items():
+        if (baseline_result := baseline['results'].get(name)) is None:
+            lines.append(f'{name:<40} {"-":>15} {result["per_op_us"]:>15.3f}')
+            continue
+
+        time_ratio = result['per_op_us'] / baseline_result['per_op_us'] if baseline_result['per_op_us'] else 1.0
+        memory_ratio = result['peak_bytes'] / baseline_result['peak_bytes'] if baseline_result['peak_bytes'] else 1.0
+        lines.append(f'{name:<40} {baseline_result["per_op_us"]:>15.3f} {result["per_op_us"]:>15.3f} '
+                     f'{time_ratio:>6.2f}x {memory_ratio:>6.2f}x')
+
+        if time_ratio > threshold or memory_ratio > threshold:
+            regressions.append(name)
+
+    return lines, regressions
+
+
+def main():
+    parser = ArgumentParser(prog='python -m benchmarks.compare', description='Compares two benchmark reports.')
+    parser.add_argument('baseline', help='path to JSON report of reference run')
+    parser.add_argument('current', help='path to JSON report of compared run')
+    parser.add_argument('--threshold', type=float, default=1.25,
+                        help='ratio of time or peak memory above which benchmark is reported as regression')
+    args = parser.parse_args()
+
+    with open(args.baseline) as baseline_file, open(args.current) as current_file:
+        lines, regressions = compare(load(baseline_file), load(current_file), args.threshold)
+
+    print('\n'.join(lines))
+
+    if regressions:
+        print(f'Regressions: {", ".join(regressions)}')
+        exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,35 @@
+from random import Random
+from typing import List
+
+from pc_spec.pc import PC
+from pc_spec.store import Store
+
+
+def generate_pcs(pcs: int, components: int, params: int, distinct_values: int = 50, seed: int = 0) -> List[PC]:
+    """
+    Generates synthetic PCs, which look like real ones - categories and parameter names repeat in every PC
+    and values are drawn from limited pool, i.e. the same CPU model is used by many PCs.
+    :param pcs: number of PCs to be generated
+    :param components: number of components of each PC
+    :param params: number of specification parameters of each component
+    :param distinct_values: number of distinct values of each parameter
+    :param seed: seed of random generator, same seed gives same PCs
+    :return: generated PCs
+    """
+    random = Random(seed)
+    categories = [f'category_{category_id}' for category_id in range(components)]
+    param_names = [f'param_{param_id}' for param_id in range(params)]
+    values = [f'value {value_id}' for value_id in range(distinct_values)]
+
+    return [PC(name=f'pc_{pc_id}',
+               components={category: {param_name: random.choice(values) for param_name in param_names}
+                           for category in categories})
+            for pc_id in range(pcs)]
+
+
+def generate_store(pcs: int, components: int, params: int, distinct_values: int = 50, seed: int = 0) -> Store:
+    """
+    Generates store of synthetic PCs, see generate_pcs.
+    :return: generated store
+    """
+    return Store(generate_pcs(pcs, components, params, distinct_values, seed))
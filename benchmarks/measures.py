@@ -0,0 +1,14 @@
+from resource import getrusage, RUSAGE_SELF
+from sys import platform
+
+
+def get_resident_size() -> int:
+    """
+    Gets resident memory size of current process.
+    On Linux it is the current size, elsewhere it is the peak size.
+    :return: size in bytes
+    """
+    if platform.startswith('linux'):
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * 4096
+    return getrusage(RUSAGE_SELF).ru_maxrss * (1 if platform == 'darwin' else 1024)
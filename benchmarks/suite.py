@@ -0,0 +1,463 @@
+from pathlib import Path
+from random import Random
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from tracemalloc import get_traced_memory, start, stop
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from benchmarks.generators import generate_pcs, generate_store
+from pc_spec.columnar import to_columns
+from pc_spec.data import load_store, open_cached_store, save_store
+from pc_spec.diff import ContentHashes, diff_stores
+from pc_spec.events import EventStream
+from pc_spec.formats import EncodedPCCache
+from pc_spec.search import SearchIndex
+from pc_spec.shards import load_sharded_store, save_sharded_store
+from pc_spec.shared import load_shared_store, save_shared_store
+from pc_spec.sqlite import DATABASE_FILE_NAME, SqliteDatabase, load_sqlite_store, save_sqlite_store
+from pc_spec.store import Store
+
+
+class Params(NamedTuple):
+    """ Size of synthetic store used by benchmarks. """
+
+    pcs: int
+    components: int
+    params: int
+
+
+class Result(NamedTuple):
+    """ Outcome of single benchmark. """
+
+    ops: int
+    seconds: float
+    per_op_us: float
+    peak_bytes: int
+    disk_bytes: int
+
+
+Run = Callable[[], object]  # pragma: no mutate
+Setup = Callable[[Params, Path], Tuple[Run, int]]  # pragma: no mutate
+
+BENCHMARKS: Dict[str, Setup] = {}
+
+
+def benchmark(name: str) -> Callable[[Setup], Setup]:
+    """
+    Registers benchmark under given name.
+    Decorated function prepares data (it isn't timed) and returns timed callable and number of operations it runs.
+    :param name: name of the benchmark, i.e. 'store.add_pc'
+    :return: decorator
+    """
+    def register(setup: Setup) -> Setup:
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+def run_benchmarks(params: Params, repeat: int = 3, selected: Optional[List[str]] = None) -> Dict[str, Result]:
+    """
+    Runs registered benchmarks. Time is the best of given number of runs, each one on freshly prepared data.
+    Peak memory is traced during additional run, so tracing doesn't affect time,
+    and size of files left by that run is measured, so time can be weighed against I/O.
+    :param params: size of synthetic store
+    :param repeat: number of timed runs of each benchmark
+    :param selected: prefixes of names of benchmarks to be run, all are run by default
+    :return: results by benchmark name
+    """
+    results = {}
+
+    for name, setup in BENCHMARKS.items():
+        if selected and not any(name.startswith(prefix) for prefix in selected):
+            continue
+
+        with TemporaryDirectory() as temp_dir:
+            seconds = min(__time(setup, params, Path(temp_dir)) for _ in range(repeat))
+            ops, peak_bytes = __trace(setup, params, Path(temp_dir))
+            disk_bytes = sum(file_path.stat().st_size for file_path in Path(temp_dir).rglob('*') if file_path.is_file())
+
+        results[name] = Result(ops, seconds, seconds / ops * 1e6, peak_bytes, disk_bytes)
+
+    return results
+
+
+def __time(setup: Setup, params: Params, temp_dir: Path) -> float:
+    run, _ = setup(params, temp_dir)
+    started = perf_counter()
+    run()
+    return perf_counter() - started
+
+
+def __trace(setup: Setup, params: Params, temp_dir: Path) -> Tuple[int, int]:
+    run, ops = setup(params, temp_dir)
+    start()
+
+    try:
+        run()
+        _, peak_bytes = get_traced_memory()
+    finally:
+        stop()
+
+    return ops, peak_bytes
+
+
+def __shuffled_names(params: Params) -> List[str]:
+    names = [f'pc_{pc_id}' for pc_id in range(params.pcs)]
+    Random(0).shuffle(names)
+    return names
+
+
+@benchmark('store.add_pc')
+def __add_pc(params: Params, _: Path) -> Tuple[Run, int]:
+    pcs = generate_pcs(*params)
+
+    def run():
+        store = Store()
+        for pc in pcs:
+            store.add_pc(pc)
+
+    return run, len(pcs)
+
+
+@benchmark('store.get_pc')
+def __get_pc(params: Params, _: Path) -> Tuple[Run, int]:
+    store = generate_store(*params)
+    names = __shuffled_names(params)
+
+    def run():
+        for name in names:
+            store.get_pc(name)
+
+    return run, len(names)
+
+
+@benchmark('store.get_pc[concurrent]')
+def __get_pc_concurrently(params: Params, _: Path) -> Tuple[Run, int]:
+    store = Store(generate_pcs(*params), concurrent=True)
+    names = __shuffled_names(params)
+
+    def run():
+        for name in names:
+            store.get_pc(name)
+
+    return run, len(names)
+
+
+@benchmark('store.snapshot+change')
+def __snapshot_and_change(params: Params, _: Path) -> Tuple[Run, int]:
+    store = generate_store(*params)
+    pcs = store.pcs
+
+    def run():
+        snapshot = store.snapshot()
+        for pc in pcs:
+            pc.update_component('category_0', 'param_0', 'value 0')
+        return snapshot
+
+    return run, len(pcs)
+
+
+@benchmark('store.remove_pc')
+def __remove_pc(params: Params, _: Path) -> Tuple[Run, int]:
+    store = generate_store(*params)
+    names = __shuffled_names(params)
+
+    def run():
+        for name in names:
+            store.remove_pc(name)
+
+    return run, len(names)
+
+
+@benchmark('store.add_pcs')
+def __add_pcs(params: Params, _: Path) -> Tuple[Run, int]:
+    pcs = generate_pcs(*params)
+    return lambda: Store().add_pcs(pcs), len(pcs)
+
+
+@benchmark('store.get_pcs')
+def __get_pcs(params: Params, _: Path) -> Tuple[Run, int]:
+    store = generate_store(*params)
+    names = __shuffled_names(params)
+    return lambda: store.get_pcs(names), len(names)
+
+
+@benchmark('store.remove_pcs')
+def __remove_pcs(params: Params, _: Path) -> Tuple[Run, int]:
+    store = generate_store(*params)
+    names = __shuffled_names(params)[:params.pcs // 2]
+    return lambda: store.remove_pcs(names), len(names)
+
+
+@benchmark('store.find_by_component')
+def __find_by_component(params: Params, _: Path) -> Tuple[Run, int]:
+    store = generate_store(*params)
+    store.find_by_component('category_0')
+    queries = [{'param_0': f'value {value_id}'} for value_id in range(50)]
+
+    def run():
+        for query in queries:
+            store.find_by_component('category_0', **query)
+
+    return run, len(queries)
+
+
+@benchmark('pc.add_component')
+def __add_component(params: Params, _: Path) -> Tuple[Run, int]:
+    pcs = generate_store(*params).pcs
+
+    def run():
+        for pc in pcs:
+            pc.add_component('new category', {'param_0': 'value 0'})
+
+    return run, len(pcs)
+
+
+@benchmark('pc.remove_component')
+def __remove_component(params: Params, _: Path) -> Tuple[Run, int]:
+    pcs = generate_store(*params).pcs
+
+    def run():
+        for pc in pcs:
+            pc.remove_component('category_0')
+
+    return run, len(pcs)
+
+
+@benchmark('pc.swap_component')
+def __swap_component(params: Params, _: Path) -> Tuple[Run, int]:
+    pcs = generate_store(*params).pcs
+
+    def run():
+        for pc in pcs:
+            pc.swap_component('category_0', {'param_0': 'value 0'})
+
+    return run, len(pcs)
+
+
+@benchmark('pc.update_component')
+def __update_component(params: Params, _: Path) -> Tuple[Run, int]:
+    pcs = generate_store(*params).pcs
+
+    def run():
+        for pc in pcs:
+            pc.update_component('category_0', 'param_0', 'value 0')
+
+    return run, len(pcs)
+
+
+@benchmark('events.EventStream.batch+update_component')
+def __update_component_in_batch(params: Params, _: Path) -> Tuple[Run, int]:
+    store = generate_store(*params)
+    stream = EventStream(store)
+    stream.subscribe(lambda events: None)
+    pcs = store.pcs
+
+    def run():
+        with stream.batch():
+            for pc in pcs:
+                pc.update_component('category_0', 'param_0', 'value 0')
+                pc.update_component('category_0', 'param_1', 'value 1')
+
+    return run, 2 * len(pcs)
+
+
+@benchmark('columnar.to_columns')
+def __to_columns(params: Params, _: Path) -> Tuple[Run, int]:
+    pcs = generate_store(*params).pcs
+    return lambda: to_columns(pcs), len(pcs)
+
+
+@benchmark('columnar.count_pcs_by_category')
+def __count_pcs_by_category(params: Params, _: Path) -> Tuple[Run, int]:
+    columns = to_columns(generate_store(*params).pcs)
+    return columns.count_pcs_by_category, params.pcs
+
+
+@benchmark('search.SearchIndex.complete')
+def __complete(params: Params, _: Path) -> Tuple[Run, int]:
+    index = SearchIndex(generate_store(*params).pcs)
+    prefixes = [name[:-1] for name in __shuffled_names(params)]
+
+    def run():
+        for prefix in prefixes:
+            index.complete(prefix)
+
+    return run, len(prefixes)
+
+
+@benchmark('search.SearchIndex.search')
+def __search(params: Params, _: Path) -> Tuple[Run, int]:
+    index = SearchIndex(generate_store(*params).pcs)
+    queries = [f'{name}x' for name in __shuffled_names(params)[:100]]
+
+    def run():
+        for query in queries:
+            index.search(query, min_score=0.5)
+
+    return run, len(queries)
+
+
+@benchmark('search.SearchIndex.apply+update_component')
+def __update_search_index(params: Params, _: Path) -> Tuple[Run, int]:
+    store = generate_store(*params)
+    store.subscribe(SearchIndex(store.pcs).apply)
+    pcs = store.pcs
+
+    def run():
+        for pc in pcs:
+            pc.update_component('category_0', 'param_0', f'{pc.name} value')
+
+    return run, len(pcs)
+
+
+@benchmark('diff.diff_stores')
+def __diff_stores(params: Params, _: Path) -> Tuple[Run, int]:
+    old_store, new_store = generate_store(*params), generate_store(*params)
+    for pc in new_store.pcs[::100]:
+        pc.update_component('category_0', 'param_0', 'changed value')
+    return lambda: diff_stores(old_store, new_store), params.pcs
+
+
+@benchmark('diff.diff_stores[cached_hashes]')
+def __diff_stores_with_cached_hashes(params: Params, _: Path) -> Tuple[Run, int]:
+    old_store, new_store = generate_store(*params), generate_store(*params)
+    old_hashes, new_hashes = ContentHashes(), ContentHashes()
+    diff_stores(old_store, new_store, old_hashes, new_hashes)
+    for pc in new_store.pcs[::100]:
+        pc.update_component('category_0', 'param_0', 'changed value')
+    return lambda: diff_stores(old_store, new_store, old_hashes, new_hashes), params.pcs
+
+
+def __save(format: str, compression: Optional[str] = None) -> Setup:
+    def setup(params: Params, temp_dir: Path) -> Tuple[Run, int]:
+        store = generate_store(*params)
+        return lambda: save_store(store, temp_dir, format=format, compression=compression), params.pcs
+    return setup
+
+
+def __save_with_cache(params: Params, temp_dir: Path) -> Tuple[Run, int]:
+    store, cache = generate_store(*params), EncodedPCCache(max_bytes=None)
+    save_store(store, temp_dir, cache=cache)
+    for pc in store.pcs[::100]:
+        pc.update_component('category_0', 'param_0', 'changed value')
+    return lambda: save_store(store, temp_dir, cache=cache), params.pcs
+
+
+def __load(format: str, compression: Optional[str] = None, **options) -> Setup:
+    def setup(params: Params, temp_dir: Path) -> Tuple[Run, int]:
+        save_store(generate_store(*params), temp_dir, format=format, compression=compression)
+        return lambda: load_store(temp_dir, **options), params.pcs
+    return setup
+
+
+def __get_cached(params: Params, temp_dir: Path) -> Tuple[Run, int]:
+    save_store(generate_store(*params), temp_dir)
+    open_cached_store(temp_dir).close()
+    names = __shuffled_names(params)
+
+    def run():
+        store = open_cached_store(temp_dir, capacity=max(params.pcs // 10, 1))
+        for name in names:
+            store.get_pc(name)
+        store.close()
+
+    return run, len(names)
+
+
+def __save_sqlite(params: Params, temp_dir: Path) -> Tuple[Run, int]:
+    store = generate_store(*params)
+    return lambda: save_sqlite_store(store, temp_dir, force=True), params.pcs
+
+
+def __load_sqlite(params: Params, temp_dir: Path) -> Tuple[Run, int]:
+    save_sqlite_store(generate_store(*params), temp_dir, force=True)
+    return lambda: load_sqlite_store(temp_dir), params.pcs
+
+
+def __get_from_sqlite(params: Params, temp_dir: Path) -> Tuple[Run, int]:
+    save_sqlite_store(generate_store(*params), temp_dir, force=True)
+    names = __shuffled_names(params)[:1000]
+
+    def run():
+        with SqliteDatabase(Path(temp_dir, DATABASE_FILE_NAME)) as database:
+            for name in names:
+                database.get_pc(name)
+
+    return run, len(names)
+
+
+def __save_sharded(params: Params, temp_dir: Path) -> Tuple[Run, int]:
+    store = generate_store(*params)
+    return lambda: save_sharded_store(store, temp_dir, force=True), params.pcs
+
+
+def __load_sharded(params: Params, temp_dir: Path) -> Tuple[Run, int]:
+    save_sharded_store(generate_store(*params), temp_dir, force=True)
+    return lambda: load_sharded_store(temp_dir), params.pcs
+
+
+def __load_lazy_and_get(params: Params, temp_dir: Path) -> Tuple[Run, int]:
+    save_store(generate_store(*params), temp_dir, format='binary')
+    names = __shuffled_names(params)[:100]
+
+    def run():
+        store = load_store(temp_dir, lazy=True)
+        for name in names:
+            store.get_pc(name)
+
+    return run, len(names)
+
+
+def __save_shared(params: Params, _: Path) -> Tuple[Run, int]:
+    store = generate_store(*params)
+
+    def run():
+        segment = save_shared_store(store)
+        segment.close()
+        segment.unlink()
+
+    return run, params.pcs
+
+
+def __load_shared_and_get(params: Params, _: Path) -> Tuple[Run, int]:
+    segment = save_shared_store(generate_store(*params))
+    names = __shuffled_names(params)[:100]
+
+    def run():
+        try:
+            store = load_shared_store(segment.name)
+            for name in names:
+                store.get_pc(name)
+            store.close()
+        finally:
+            segment.close()
+            segment.unlink()
+
+    return run, len(names)
+
+
+benchmark('data.save_store[json]')(__save('json'))
+benchmark('data.save_store[binary]')(__save('binary'))
+benchmark('data.save_store[json,cache]')(__save_with_cache)
+benchmark('data.load_store[json]')(__load('json'))
+benchmark('data.load_store[json,read_only]')(__load('json', read_only=True))
+benchmark('data.load_store[json,strict]')(__load('json', validation='strict'))
+benchmark('data.load_store[binary]')(__load('binary'))
+benchmark('data.save_store[json,gzip]')(__save('json', 'gzip'))
+benchmark('data.save_store[json,bz2]')(__save('json', 'bz2'))
+benchmark('data.save_store[json,lzma]')(__save('json', 'lzma'))
+benchmark('data.save_store[binary,gzip]')(__save('binary', 'gzip'))
+benchmark('data.load_store[json,gzip]')(__load('json', 'gzip'))
+benchmark('data.load_store[json,bz2]')(__load('json', 'bz2'))
+benchmark('data.load_store[json,lzma]')(__load('json', 'lzma'))
+benchmark('data.load_store[binary,gzip]')(__load('binary', 'gzip'))
+benchmark('data.load_store[binary,lazy]+get_pc')(__load_lazy_and_get)
+benchmark('data.open_cached_store+get_pc')(__get_cached)
+benchmark('sqlite.save_sqlite_store')(__save_sqlite)
+benchmark('sqlite.load_sqlite_store')(__load_sqlite)
+benchmark('sqlite.SqliteDatabase.get_pc')(__get_from_sqlite)
+benchmark('shards.save_sharded_store[json]')(__save_sharded)
+benchmark('shards.load_sharded_store[json]')(__load_sharded)
+benchmark('shared.save_shared_store')(__save_shared)
+benchmark('shared.load_shared_store+get_pc')(__load_shared_and_get)
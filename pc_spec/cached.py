@@ -0,0 +1,265 @@
+from collections import OrderedDict
+from json import JSONEncoder, dumps, loads
+from os import stat
+from typing import Callable, Dict, Iterable, Iterator, List, MutableMapping, NamedTuple, Optional
+
+from pc_spec.pc import PC, Components
+
+
+class CacheStats(NamedTuple):
+    """ Counters of PC cache, which help to choose its size. """
+
+    hits: int
+    misses: int
+    evictions: int
+    write_backs: int
+
+
+class CachedPCs(MutableMapping[str, PC]):
+    """
+    PCs kept in disk-backed key-value storage (i.e. dbm database), of which only recently used ones stay in memory.
+    When the cache exceeds its capacity, least recently used PCs are evicted and changed ones are written back.
+    Every PC is kept in the storage as JSON array of its position and components, so order of PCs is kept too.
+    Positions of all PCs are also kept together under separate key, so opening the storage doesn't decode every PC.
+    That key is removed when the storage is changed and written again on flush, so it's never out of date.
+    PCs shouldn't be kept and changed outside of the store, as evicted PC is loaded again from the storage.
+    """
+
+    __encode = JSONEncoder(default=dict).encode
+    __POSITIONS_KEY = '\0positions'  # pragma: no mutate
+    __SOURCES_KEY = '\0sources'  # pragma: no mutate
+    __CLEAN_KEY = '\0clean'  # pragma: no mutate
+
+    def __init__(self, storage: MutableMapping, capacity: Optional[int] = None, max_bytes: Optional[int] = None):
+        """
+        :param storage: mapping of names to encoded PCs kept on disk, i.e. opened dbm database;
+                        PCs which are already in it are available from the cache
+        :param capacity: maximal number of PCs kept in memory, unlimited by default
+        :param max_bytes: maximal size of PCs kept in memory (measured as size of encoded PCs), unlimited by default
+        :raises ValueError: if capacity or max_bytes isn't positive or storage contains malformed PC
+        """
+        if capacity is not None and capacity < 1 or max_bytes is not None and max_bytes < 1:
+            raise ValueError('Capacity and maximal size of cache must be positive')
+
+        self.__storage: MutableMapping = storage
+        self.__capacity: Optional[int] = capacity
+        self.__max_bytes: Optional[int] = max_bytes
+        self.on_load: Optional[Callable[[PC], None]] = None
+
+        self.__cache: OrderedDict[str, PC] = OrderedDict()
+        self.__sizes: Dict[str, int] = {}
+        self.__bytes: int = 0
+        self.__saved_versions: Dict[str, int] = {}
+        self.__hits: int = 0
+        self.__misses: int = 0
+        self.__evictions: int = 0
+        self.__write_backs: int = 0
+
+        self.__sources: Dict[str, List[int]] = loads(storage.get(self.__SOURCES_KEY, '{}'))
+        self.__clean_target: Optional[str] = self.__to_str(clean_target) \
+            if (clean_target := storage.get(self.__CLEAN_KEY)) is not None else None
+        self.__positions: Dict[str, int] = self.__read_positions()
+        self.__are_positions_saved: bool = self.__POSITIONS_KEY in storage
+        self.__next_position: int = max(self.__positions.values(), default=-1) + 1
+
+    @property
+    def stats(self) -> CacheStats:
+        """
+        Gets counters of the cache since it was created.
+        :return: numbers of hits, misses, evictions and write backs
+        """
+        return CacheStats(self.__hits, self.__misses, self.__evictions, self.__write_backs)
+
+    @property
+    def resident(self) -> int:
+        """
+        Gets number of PCs kept in memory.
+        :return: number of cached PCs
+        """
+        return len(self.__cache)
+
+    @property
+    def clean_target(self) -> Optional[str]:
+        """
+        Gets store file which PCs were last saved to or loaded from, if they weren't changed since then.
+        :return: resolved path of store file, None if PCs were changed since they were last saved or loaded
+        """
+        return self.__clean_target
+
+    def flush(self):
+        """
+        Writes all changed PCs kept in memory to the storage, together with positions of all PCs.
+        """
+        for pc in self.__cache.values():
+            self.__write_back(pc)
+
+        if not self.__are_positions_saved:
+            self.__storage[self.__POSITIONS_KEY] = dumps(self.__positions)
+            self.__are_positions_saved = True
+
+    def close(self):
+        """
+        Flushes changed PCs and closes the storage, if it can be closed.
+        """
+        self.flush()
+
+        if hasattr(self.__storage, 'close'):
+            self.__storage.close()
+
+    def mark_clean(self, target: Optional[str], has_changes: bool = False):
+        """
+        Records that PCs were saved to or loaded from given store file, so it can be checked later whether the cache
+        is still based on that file (see is_based_on). Called by the store which is backed by the cache.
+        If the store has no changes which weren't saved then changed PCs are flushed and the file becomes clean target.
+        :param target: resolved path of store file, nothing is recorded if it's None or the file doesn't exist
+        :param has_changes: whether the store was changed since the saved state, i.e. while it was being saved
+        """
+        if target is not None and (fingerprint := self.__get_fingerprint(target)) is not None:
+            self.__sources[target] = fingerprint
+            self.__storage[self.__SOURCES_KEY] = dumps(self.__sources)
+
+            if not has_changes:
+                self.flush()
+                self.__clean_target = target
+                self.__storage[self.__CLEAN_KEY] = target
+
+    def is_based_on(self, target: str) -> bool:
+        """
+        Checks whether PCs were last saved to or loaded from given store file by this cache, and the file wasn't
+        replaced since then, i.e. by another store - otherwise the cache is out of date and should be built again.
+        :param target: resolved path of store file
+        :return: True if the file is the same as when the cache was last marked as clean with it, False otherwise
+        """
+        return target in self.__sources and self.__sources[target] == self.__get_fingerprint(target)
+
+    @staticmethod
+    def fill(storage: MutableMapping, pcs: Iterable[PC]):
+        """
+        Writes given PCs to empty storage, so they are available from the cache created for it afterwards.
+        If several PCs share the same name then only the first one is written.
+        :param storage: mapping of names to encoded PCs kept on disk, i.e. dbm database opened for writing
+        :param pcs: PCs to be written, in their order
+        """
+        positions: Dict[str, int] = {}
+
+        for pc in pcs:
+            if pc.name not in positions:
+                positions[pc.name] = len(positions)
+                storage[pc.name] = CachedPCs.encode_pc(positions[pc.name], pc.components)
+
+        storage[CachedPCs.__POSITIONS_KEY] = dumps(positions)
+
+    @staticmethod
+    def encode_pc(position: int, components: Components) -> str:
+        """
+        Encodes PC in form in which it is kept in the storage.
+        :param position: position of the PC in order of PCs
+        :param components: component parts of the PC
+        :return: encoded PC
+        """
+        return CachedPCs.__encode([position, components])
+
+    def __getitem__(self, name: str) -> PC:
+        if (pc := self.__cache.get(name)) is not None:
+            self.__cache.move_to_end(name)
+            self.__hits += 1
+            return pc
+        if name not in self.__positions:
+            raise KeyError(name)
+
+        self.__misses += 1
+        data = self.__storage[name]
+        pc = PC(name, loads(data)[1])
+        self.__saved_versions[name] = pc.version
+        self.__cache_pc(pc, len(data))
+
+        if self.on_load:
+            self.on_load(pc)
+        return pc
+
+    def __setitem__(self, name: str, pc: PC):
+        if name not in self.__positions:
+            self.__positions[name] = self.__next_position
+            self.__next_position += 1
+
+        self.__uncache(name)
+        self.__saved_versions.pop(name, None)
+        self.__cache_pc(pc, len(self.encode_pc(self.__positions[name], pc.components)))
+
+    def __delitem__(self, name: str):
+        del self.__positions[name]
+        self.__uncache(name)
+
+        self.__saved_versions.pop(name, None)
+
+        if name in self.__storage:
+            self.__unsave_positions()
+            self.__unsave_clean_target()
+            del self.__storage[name]
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.__positions
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self.__positions))
+
+    def __len__(self) -> int:
+        return len(self.__positions)
+
+    def __cache_pc(self, pc: PC, size: int):
+        self.__cache[pc.name] = pc
+        self.__sizes[pc.name] = size
+        self.__bytes += size
+
+        while len(self.__cache) > 1 and (self.__capacity is not None and len(self.__cache) > self.__capacity or
+                                         self.__max_bytes is not None and self.__bytes > self.__max_bytes):
+            self.__evict(next(iter(self.__cache.values())))
+
+    def __evict(self, pc: PC):
+        self.__write_back(pc)
+        self.__uncache(pc.name)
+        self.__saved_versions.pop(pc.name, None)
+        self.__evictions += 1
+
+    def __uncache(self, name: str):
+        if self.__cache.pop(name, None) is not None:
+            self.__bytes -= self.__sizes.pop(name)
+
+    def __write_back(self, pc: PC):
+        if self.__saved_versions.get(pc.name) != pc.version:
+            self.__unsave_positions()
+            self.__unsave_clean_target()
+            self.__storage[pc.name] = self.encode_pc(self.__positions[pc.name], pc.components)
+            self.__saved_versions[pc.name] = pc.version
+            self.__write_backs += 1
+
+    def __read_positions(self) -> Dict[str, int]:
+        if (data := self.__storage.get(self.__POSITIONS_KEY)) is not None:
+            return loads(data)
+
+        reserved_keys = {self.__POSITIONS_KEY, self.__SOURCES_KEY, self.__CLEAN_KEY}
+        positions = {self.__to_str(name): loads(data)[0] for name, data in self.__storage.items()
+                     if self.__to_str(name) not in reserved_keys}
+        return dict(sorted(positions.items(), key=lambda item: item[1]))
+
+    def __unsave_positions(self):
+        if self.__are_positions_saved:
+            del self.__storage[self.__POSITIONS_KEY]
+            self.__are_positions_saved = False
+
+    def __unsave_clean_target(self):
+        if self.__clean_target is not None:
+            del self.__storage[self.__CLEAN_KEY]
+            self.__clean_target = None
+
+    @staticmethod
+    def __get_fingerprint(target: str) -> Optional[List[int]]:
+        try:
+            status = stat(target)
+        except FileNotFoundError:
+            return None
+        return [status.st_size, status.st_mtime_ns, status.st_ino]
+
+    @staticmethod
+    def __to_str(name) -> str:
+        return name.decode() if isinstance(name, bytes) else name
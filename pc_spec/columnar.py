@@ -0,0 +1,144 @@
+from array import array
+from collections import Counter
+from itertools import compress, repeat
+from operator import add, eq, mod, mul
+from typing import Any, Dict, Iterable, List, NamedTuple
+
+from pc_spec.pc import PC
+
+MISSING = -1  # pragma: no mutate
+
+
+class StoreColumns(NamedTuple):
+    """
+    PCs in long format - one row per specification parameter (or per component without parameters,
+    or per PC without components) - kept as dictionary-coded columns.
+    Every column is an array of codes, which are indices in its string table, or MISSING if row has no such value.
+    Columns can be turned into categorical data without copying, i.e. for pandas:
+    Categorical.from_codes(columns.to_numpy()['category'], columns.categories).
+    """
+
+    names: List[str]
+    categories: List[str]
+    params: List[str]
+    values: List[str]
+    name_codes: array
+    category_codes: array
+    param_codes: array
+    value_codes: array
+
+    def count_pcs_by_category(self) -> Dict[str, int]:
+        """
+        Counts PCs which have component of each category.
+        PCs are counted over code arrays - with NumPy by flags of pairs of PC and category,
+        otherwise by set of such pairs coded as integers - so no object is created per row.
+        :return: numbers of PCs by category, in order in which categories were first found
+        """
+        width = len(self.categories) + 1  # the first code of pair stands for MISSING category
+
+        if (numpy := self.__import_numpy()) is not None:
+            columns = self.to_numpy()
+            flags = numpy.zeros(len(self.names) * width, dtype=bool)
+            flags[columns['name'].astype('intp') * width + columns['category'] + 1] = True
+            counts = flags.reshape(-1, width).sum(axis=0).tolist()
+        else:
+            pairs = set(map(add, map(mul, self.name_codes, repeat(width)), self.category_codes))
+            pair_counts = Counter(map(mod, map(add, pairs, repeat(1)), repeat(width)))
+            counts = [pair_counts[code] for code in range(width)]
+
+        return {category: counts[category_code + 1] for category_code, category in enumerate(self.categories)}
+
+    def count_pcs_by_value(self, category: str, param_name: str) -> Dict[str, int]:
+        """
+        Counts PCs by value of given parameter of given component, i.e. PCs per CPU model.
+        Values are counted over code arrays, with NumPy if it is installed.
+        :param category: type of component, i.e. 'cpu'
+        :param param_name: name of specification's parameter, i.e. 'name'
+        :return: numbers of PCs by value, from the most common one, equally common in order they were first found
+        """
+        if category not in self.categories or param_name not in self.params:
+            return {}
+
+        category_code, param_code = self.categories.index(category), self.params.index(param_name)
+
+        if (numpy := self.__import_numpy()) is not None:
+            columns = self.to_numpy()
+            rows = (columns['category'] == category_code) & (columns['param'] == param_code)
+            value_counts = numpy.bincount(columns['value'][rows], minlength=len(self.values))
+            counts = {code: count for code, count in enumerate(value_counts.tolist()) if count}
+        else:
+            in_category = bytes(map(eq, self.category_codes, repeat(category_code)))
+            counts = Counter(compress(compress(self.value_codes, in_category),
+                                      map(eq, compress(self.param_codes, in_category), repeat(param_code))))
+
+        return {self.values[value_code]: counts[value_code]
+                for value_code in sorted(counts, key=lambda value_code: (-counts[value_code], value_code))}
+
+    def to_numpy(self) -> Dict[str, Any]:
+        """
+        Gets columns as NumPy arrays sharing memory with them. Requires NumPy to be installed.
+        :return: arrays of codes by column name ('name', 'category', 'param' and 'value')
+        :raises ImportError: if NumPy isn't installed
+        """
+        from numpy import frombuffer  # type: ignore
+
+        return {column: frombuffer(codes, dtype=f'i{codes.itemsize}')
+                for column, codes in (('name', self.name_codes), ('category', self.category_codes),
+                                      ('param', self.param_codes), ('value', self.value_codes))}
+
+    @staticmethod
+    def __import_numpy() -> Any:
+        try:
+            import numpy  # type: ignore
+        except ImportError:
+            return None
+        return numpy
+
+
+def to_columns(pcs: Iterable[PC]) -> StoreColumns:
+    """
+    Builds columns of given PCs in single pass, without creating object per row.
+    :param pcs: PCs to be exported, i.e. Store.pcs or iter_store(...) to export store file without loading the store
+    :return: columns of PCs
+    """
+    name_ids: Dict[str, int] = {}
+    category_ids: Dict[str, int] = {}
+    param_ids: Dict[str, int] = {}
+    value_ids: Dict[str, int] = {}
+    name_codes, category_codes, param_codes, value_codes = array('i'), array('i'), array('i'), array('i')
+    append_name, append_category = name_codes.append, category_codes.append
+    append_param, append_value = param_codes.append, value_codes.append
+
+    for pc in pcs:
+        if (name_code := name_ids.get(pc.name)) is None:
+            name_code = name_ids[pc.name] = len(name_ids)
+
+        if not (components := pc.components):
+            append_name(name_code)
+            append_category(MISSING)
+            append_param(MISSING)
+            append_value(MISSING)
+
+        for category, spec in components.items():
+            if (category_code := category_ids.get(category)) is None:
+                category_code = category_ids[category] = len(category_ids)
+
+            if not spec:
+                append_name(name_code)
+                append_category(category_code)
+                append_param(MISSING)
+                append_value(MISSING)
+
+            for param_name, value in spec.items():
+                if (param_code := param_ids.get(param_name)) is None:
+                    param_code = param_ids[param_name] = len(param_ids)
+                if (value_code := value_ids.get(value)) is None:
+                    value_code = value_ids[value] = len(value_ids)
+
+                append_name(name_code)
+                append_category(category_code)
+                append_param(param_code)
+                append_value(value_code)
+
+    return StoreColumns(list(name_ids), list(category_ids), list(param_ids), list(value_ids),
+                        name_codes, category_codes, param_codes, value_codes)
@@ -1,38 +1,505 @@
-from json import dump, load, JSONDecodeError
+from asyncio import Semaphore, gather, get_running_loop
+from concurrent.futures import Executor
+from dbm import open as open_dbm, whichdb
+from functools import partial
+from json import dumps, loads, JSONDecodeError
+from os import close, fsync, link, open as open_fd, replace, O_RDONLY
 from pathlib import Path
-from typing import List, Dict, Tuple
+from secrets import token_hex
+from shutil import copyfile
+from stat import S_IMODE
+from sys import intern
+from typing import Any, BinaryIO, Callable, Iterable, List, Dict, Iterator, NamedTuple, Optional, Sequence, Set, \
+    Tuple, Union, cast
 
-from pc_spec.pc import PC, Components
-from pc_spec.store import Store
+from pc_spec.cached import CachedPCs
+from pc_spec.formats import COMPRESSIONS, FORMATS, Compression, EncodedPCCache, JsonFormat, SerializedPC, StoreFormat, \
+    get_compression, get_compression_by_path, get_format, get_format_by_path
+from pc_spec.mapped import MappedPCs
+from pc_spec.metrics import timed
+from pc_spec.pc import PC, Components, FrozenSpec
+from pc_spec.store import Store, StoreChange, StoreChanges, StoreSnapshot
 
 
-def save_store(store: Store, target_dir: Path):
+CACHE_FILE_NAME = 'store.cache'  # pragma: no mutate
+VALIDATIONS = ('trusted', 'report', 'strict')  # pragma: no mutate
+
+
+class InvalidPC(NamedTuple):
+    """ Describes entry of store file which isn't a valid PC. """
+
+    position: int  # index of the entry in store file, starting from 0
+    reason: str
+
+
+@timed('data.save_store')
+def save_store(store: Union[Store, StoreSnapshot], target_dir: Path, backups: int = 0, format: str = 'json',
+               force: bool = False, cache: Optional[EncodedPCCache] = None, compression: Optional[str] = None,
+               compresslevel: Optional[int] = None) -> StoreChanges:
     """
-    Saves given store to JSON file created in given directory.
+    Saves given store to file created in given directory.
+    If the store wasn't changed since it was last saved to or loaded from the same store file, and that file
+    and no journal are kept in given directory, then nothing is written.
     If given directory doesn't exist then it is created (together with all missing parent directories).
-    :param store: collection of PCs to be saved
-    :param target_dir: path to directory where JSON file will be created
+    Store is written to temporary file which replaces store file only after it safely reached the disk,
+    so crash during saving never leaves store file empty or half-written.
+    Store file can be compressed while it is written, which trades CPU time for smaller file.
+    Store files of other formats or compressions and journal kept in given directory are removed,
+    as all PCs and changes recorded in them are saved in new store file.
+    :param store: collection of PCs to be saved, or its snapshot so the store can be changed while it is being saved
+    :param target_dir: path to directory where store file will be created
+    :param backups: number of previous generations of store file to be kept, i.e. 'store.json.1' is the newest one
+    :param format: name of store file format, 'json' (store.json) or 'binary' (store.pcsb)
+    :param force: whether the store should be written even if it wasn't changed since it was saved to the same file
+    :param cache: cache of encoded PCs kept between saves, so only PCs changed since the previous save are encoded;
+                  supported by JSON format only
+    :param compression: name of compression of store file, 'gzip' (i.e. store.json.gz), 'bz2' (store.json.bz2)
+                        or 'lzma' (store.json.xz); not compressed by default
+    :param compresslevel: compression level, default of given compression if not given
+    :return: PCs changed since the store was last saved or loaded, empty if nothing was changed
+    :raises ValueError: if cache is given for format other than JSON, or format or compression is unknown
     """
-    file_path = Path(target_dir, __get_store_file_name())
-    __create_dir_if_necessary(target_dir)
-    serializable_pcs = __to_serializable_pcs(store.pcs)
-    __save_to_json(serializable_pcs, file_path)
+    changes = store.changes
+
+    if (target := __write_store(store, target_dir, backups, format, force, cache, compression, compresslevel)) is None:
+        return StoreChanges([], [])
+
+    store.mark_clean(target=target)
+    return changes
 
 
-def load_store(source_dir: Path) -> Store:
+@timed('data.load_store')
+def load_store(source_dir: Path, format: Optional[str] = None, lazy: bool = False, read_only: bool = False,
+               validation: str = 'trusted', invalid_pcs: Optional[List[InvalidPC]] = None) -> Store:
     """
-    Loads store from JSON file saved in given directory.
+    Loads store from file saved in given directory.
+    PCs are parsed and added to the store one by one, so whole file is never held in memory.
+    Compressed store file is decompressed while it is read, so it is never held in memory either.
+    In lazy mode binary store file is mapped into memory instead and each PC is decoded only on first access,
+    so loading takes the same time regardless of file size.
+    If journal is kept in given directory then changes recorded in it are applied to loaded store,
+    which are its only changes reported afterwards.
     If given directory doesn't exist then empty store is loaded.
-    If JSON file in given directory doesn't exist or is empty then empty store is loaded.
-    :param source_dir: path to directory which contains store JSON file
+    If store file in given directory doesn't exist or is empty then empty store is loaded.
+    :param source_dir: path to directory which contains store file
+    :param format: name of store file format, 'json' or 'binary'; detected from existing store file by default
+    :param lazy: whether PCs should be decoded on first access, requires uncompressed binary store file
+    :param read_only: whether specifications of components should be loaded as compact FrozenSpec objects,
+                      which can't be updated
+    :param validation: how PCs are validated while they are parsed (see iter_store), PCs decoded lazily aren't
+    :param invalid_pcs: list to which entries which aren't valid PCs are appended in 'report' validation mode
+    :return: loaded store
+    :raises ValueError: if store file or journal is malformed (JSONDecodeError for JSON files),
+                        lazy loading was requested for JSON or compressed file,
+                        or entry of store file isn't valid PC in 'strict' validation mode
+    """
+    if lazy:
+        store = __load_lazy_store(source_dir, format, read_only)
+    else:
+        store = Store(iter_store(source_dir, format=format, read_only=read_only, validation=validation,
+                                 invalid_pcs=invalid_pcs))
+
+    file_path = __find_store_file(source_dir, format)
+    store.mark_clean(target=__get_target(file_path) if file_path else None)
+    Journal.replay(store, source_dir)
+    return store
+
+
+@timed('data.open_cached_store')
+def open_cached_store(source_dir: Path, capacity: Optional[int] = None, max_bytes: Optional[int] = None) -> Store:
+    """
+    Opens store of which only recently used PCs are kept in memory, while all of them are kept in cache database
+    in given directory ('store.cache', dbm database). PCs which aren't in memory are loaded from the database on access
+    and changed ones are written back to it when they are evicted or when the store is closed.
+    If cache database doesn't exist yet then it is built from store file, which is read one PC at a time.
+    Cache database is a working copy of the store - changes are kept in store file only after the store is saved.
+    If it wasn't changed since it was last saved to or loaded from store file then the store is clean with that file,
+    so saving it there again writes only later changes.
+    It is built again if store file was replaced since the cached store was last saved to it, i.e. by another store,
+    in which case changes which weren't saved are lost.
+    :param source_dir: path to directory which contains store file
+    :param capacity: maximal number of PCs kept in memory, unlimited by default
+    :param max_bytes: maximal size of PCs kept in memory (measured as size of encoded PCs), unlimited by default
+    :return: store backed by the cache database, which should be closed when it is no longer used;
+             counters of the cache are reported by its cache_stats and resident_pcs properties
+    :raises ValueError: if store file is malformed (JSONDecodeError for JSON files),
+                        or capacity or max_bytes isn't positive
+    """
+    cache_path = Path(source_dir, CACHE_FILE_NAME)
+    file_path = __find_store_file(source_dir, None)
+    target = __get_target(file_path) if file_path else None
+
+    if whichdb(str(cache_path)) is not None:
+        cached_pcs = CachedPCs(open_dbm(str(cache_path), 'w'), capacity, max_bytes)
+
+        if target is None or cached_pcs.is_based_on(target):
+            store = Store(mapping=cached_pcs)
+
+            if target is not None and cached_pcs.clean_target == target:
+                store.mark_clean(target=target)
+            return store
+        cached_pcs.close()
+
+    __create_dir_if_necessary(source_dir)
+
+    with open_dbm(str(cache_path), 'n') as storage:
+        CachedPCs.fill(storage, iter_store(source_dir))
+
+    store = Store(mapping=CachedPCs(open_dbm(str(cache_path), 'w'), capacity, max_bytes))
+    store.mark_clean(target=target)
+    return store
+
+
+@timed('data.async_save_store')
+async def async_save_store(store: Store, target_dir: Path, backups: int = 0, format: str = 'json',
+                           force: bool = False, executor: Optional[Executor] = None, compression: Optional[str] = None,
+                           compresslevel: Optional[int] = None) -> StoreChanges:
+    """
+    Saves given store like save_store, without blocking the event loop.
+    Snapshot of the store is taken in the event loop, so the store can be changed while it is being saved,
+    then the snapshot is serialized and written by given executor. Taking it doesn't copy PCs.
+    If the store was changed while it was being saved then it stays dirty.
+    :param store: collection of PCs to be saved
+    :param target_dir: path to directory where store file will be created
+    :param backups: number of previous generations of store file to be kept
+    :param format: name of store file format, 'json' (store.json) or 'binary' (store.pcsb)
+    :param force: whether the store should be written even if it wasn't changed
+    :param executor: executor running threads in which the store is saved, defaults to event loop's executor
+    :param compression: name of compression of store file, 'gzip', 'bz2' or 'lzma'; not compressed by default
+    :param compresslevel: compression level, default of given compression if not given
+    :return: PCs changed since the store was last saved or loaded, empty if nothing was changed
+    """
+    snapshot = store.snapshot()
+    target = await get_running_loop().run_in_executor(
+        executor, partial(__write_store, snapshot, target_dir, backups, format, force, None, compression,
+                          compresslevel))
+
+    if target is None:
+        return StoreChanges([], [])
+
+    snapshot.mark_clean(target)
+    return snapshot.changes
+
+
+@timed('data.async_load_store')
+async def async_load_store(source_dir: Path, format: Optional[str] = None, lazy: bool = False,
+                           read_only: bool = False, executor: Optional[Executor] = None, validation: str = 'trusted',
+                           invalid_pcs: Optional[List[InvalidPC]] = None) -> Store:
+    """
+    Loads store like load_store, without blocking the event loop.
+    Store file is read and parsed by given executor.
+    :param source_dir: path to directory which contains store file
+    :param format: name of store file format, 'json' or 'binary'; detected from existing store file by default
+    :param lazy: whether PCs should be decoded on first access, requires binary store file
+    :param read_only: whether specifications of components should be loaded as compact FrozenSpec objects
+    :param executor: executor running threads in which the store is loaded, defaults to event loop's executor
+    :param validation: how PCs are validated while they are parsed, 'trusted', 'report' or 'strict'
+    :param invalid_pcs: list to which entries which aren't valid PCs are appended in 'report' validation mode
     :return: loaded store
+    :raises ValueError: if store file or journal is malformed (JSONDecodeError for JSON files),
+                        lazy loading was requested for JSON file, or entry isn't valid PC in 'strict' validation mode
     """
-    file_path = Path(source_dir, __get_store_file_name())
-    return Store(__get_pcs_from_json_file(file_path)) if file_path.is_file() else Store()
+    return await get_running_loop().run_in_executor(
+        executor, partial(load_store, source_dir, format, lazy, read_only, validation, invalid_pcs))
+
+
+@timed('data.async_load_stores')
+async def async_load_stores(source_dirs: Iterable[Path], concurrency: int = 4,
+                            executor: Optional[Executor] = None, **options: Any) -> List[Store]:
+    """
+    Loads stores from several directories concurrently, without blocking the event loop.
+    :param source_dirs: paths to directories which contain store files
+    :param concurrency: maximal number of stores loaded at the same time
+    :param executor: executor running threads in which stores are loaded, defaults to event loop's executor
+    :param options: options of async_load_store, i.e. format='binary'
+    :return: loaded stores, in order of given directories
+    :raises ValueError: if any store file or journal is malformed (JSONDecodeError for JSON files)
+    """
+    semaphore = Semaphore(concurrency)
+
+    async def load(source_dir: Path) -> Store:
+        async with semaphore:
+            return await async_load_store(source_dir, executor=executor, **options)
+
+    return list(await gather(*[load(source_dir) for source_dir in source_dirs]))
+
+
+@timed('data.iter_store')
+def iter_store(source_dir: Path, chunk_size: int = 1024 * 1024, format: Optional[str] = None,
+               read_only: bool = False, validation: str = 'trusted',
+               invalid_pcs: Optional[List[InvalidPC]] = None) -> Iterator[PC]:
+    """
+    Lazily loads PCs from file saved in given directory.
+    File is read in chunks and each PC is parsed only when it is requested.
+    Categories, parameter names and values of loaded PCs are taken from shared string pool,
+    so each distinct string is kept in memory once.
+    If given directory doesn't exist or store file in it doesn't exist or is empty then nothing is yielded.
+    Each entry of store file can be checked whether it is valid PC - {name: {category: {param: value}}} object
+    with name not used by earlier PCs - as soon as it is parsed, so the file is still read once.
+    In 'trusted' validation mode nothing is checked, which is the fastest, but malformed entries may be loaded
+    partially (i.e. only first PC of entry with many names). In 'report' mode invalid entries are skipped
+    and reported, in 'strict' mode the first one stops loading.
+    :param source_dir: path to directory which contains store file
+    :param chunk_size: number of characters (bytes for binary files) read from the file at once
+    :param format: name of store file format, 'json' or 'binary'; detected from existing store file by default
+    :param read_only: whether specifications of components should be loaded as compact FrozenSpec objects
+    :param validation: how PCs are validated, 'trusted', 'report' or 'strict'
+    :param invalid_pcs: list to which entries which aren't valid PCs are appended in 'report' validation mode
+    :return: iterator over loaded PCs
+    :raises ValueError: if store file is malformed (JSONDecodeError for JSON files), validation mode is unknown,
+                        or entry of store file isn't valid PC in 'strict' validation mode
+    """
+    if validation not in VALIDATIONS:
+        raise ValueError(f'Unknown validation mode: {validation!r}')
+
+    if file_path := __find_store_file(source_dir, format):
+        string_pool: Dict[Any, Any] = {}
+        names: Set[str] = set()
+        validate = validation != 'trusted'
+
+        for index, serialized_pc in enumerate(__read_store_file(file_path, chunk_size)):
+            if validate and (reason := __check_serialized_pc(serialized_pc, names)):
+                if validation == 'strict':
+                    raise ValueError(f'Invalid PC at index {index} of {file_path}: {reason}')
+                if invalid_pcs is not None:
+                    invalid_pcs.append(InvalidPC(index, reason))
+                continue
+
+            name, components = __unpack_serialized_pc(serialized_pc)
+            yield PC(name, __intern_components(components, string_pool, read_only))
+
+
+@timed('data.convert_store_file')
+def convert_store_file(source_path: Path, target_path: Path):
+    """
+    Converts store file from one format or compression to another, i.e. 'store.json' to 'store.pcsb.xz'.
+    Formats and compressions are chosen by extensions of given files.
+    If target file already exists then it is replaced.
+    :param source_path: path to existing store file
+    :param target_path: path to store file which will be created
+    :raises ValueError: if extension of any file doesn't match known format or source file is malformed
+    """
+    target_format = get_format_by_path(target_path)
+    write = partial(target_format.write, __read_store_file(source_path, 1024 * 1024))
+
+    if target_compression := get_compression_by_path(target_path):
+        write = partial(__write_compressed, write, target_compression, None)
+
+    temp_file_path = __save_to_temp_file(write, target_path)
+    replace(temp_file_path, target_path)
+
+
+class Journal:
+    """
+    Append-only log of changes made to the store.
+    Every change of the store and of its PCs is recorded as small JSON record,
+    so saving the store costs as much as the change itself instead of rewriting whole store file.
+    Records are replayed on top of store file by load_store.
+    """
+
+    def __init__(self, store: Store, target_dir: Path, compaction_size: int = 16 * 1024 * 1024,
+                 format: str = 'json'):
+        """
+        :param store: store which changes will be recorded
+        :param target_dir: path to directory where journal and store file are kept
+        :param compaction_size: size of journal (in bytes) above which it is folded into store file on flush
+        :param format: name of format of store file written during compaction
+        """
+        self.__store: Store = store
+        self.__target_dir: Path = target_dir
+        self.__format: str = format
+        self.__file_path: Path = Journal.get_file_path(target_dir)
+        self.__compaction_size: int = compaction_size
+        self.__records: List[str] = []
+
+        self.__truncate_torn_record()
+        store.subscribe(self.__on_store_change)
+
+    def __enter__(self) -> 'Journal':
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    @property
+    def pending(self) -> int:
+        """
+        Gets number of recorded changes which weren't written to the journal yet.
+        :return: number of pending records
+        """
+        return len(self.__records)
+
+    @staticmethod
+    def get_file_path(target_dir: Path) -> Path:
+        """
+        Gets path to journal kept in given directory.
+        :param target_dir: path to directory where journal is kept
+        :return: path to journal file
+        """
+        return Path(target_dir, 'store.journal')
+
+    @staticmethod
+    def replay(store: Store, source_dir: Path):
+        """
+        Applies changes recorded in journal kept in given directory to given store.
+        If journal doesn't exist then nothing will change.
+        Record torn by crash during writing is ignored if it is the last one.
+        :param store: store to which changes will be applied
+        :param source_dir: path to directory where journal is kept
+        :raises JSONDecodeError: if journal contains malformed record other than the last one
+        """
+        file_path = Journal.get_file_path(source_dir)
+
+        if file_path.is_file():
+            with open(file_path, 'r') as journal_file:
+                torn_record_error = None
+
+                for line in journal_file:
+                    if torn_record_error:
+                        raise torn_record_error
+                    try:
+                        record = loads(line)
+                    except JSONDecodeError as error:
+                        torn_record_error = error
+                        continue
+                    Journal.__apply(store, record)
+
+    def flush(self):
+        """
+        Appends all pending records to the journal and makes sure they reached the disk.
+        If journal grows above compaction size then it is compacted.
+        """
+        if self.__records:
+            if not self.__target_dir.is_dir():
+                self.__target_dir.mkdir(parents=True)
+
+            with open(self.__file_path, 'a') as journal_file:
+                journal_file.write(''.join(self.__records))
+                journal_file.flush()
+                fsync(journal_file.fileno())
+
+            self.__records.clear()
 
+            if self.__file_path.stat().st_size > self.__compaction_size:
+                self.compact()
 
-def __get_store_file_name() -> str:
-    return 'store.json'
+    def compact(self):
+        """
+        Folds the journal into store file by saving whole store, which also removes the journal.
+        """
+        save_store(self.__store, self.__target_dir, format=self.__format, force=True)
+        self.__records.clear()
+
+    def close(self):
+        """
+        Flushes pending records and stops recording changes of the store.
+        """
+        self.flush()
+        self.__store.unsubscribe(self.__on_store_change)
+
+    def __on_store_change(self, change: StoreChange):
+        record: Dict[str, Any] = {'op': change.operation, 'name': change.pc.name}
+
+        if change.operation == 'add_pc':
+            record['components'] = change.pc.components
+        elif change.component_change:
+            record['category'] = change.component_change.category
+            record['spec'] = change.component_change.new_spec
+
+        self.__records.append(dumps(record, default=dict) + '\n')
+
+    def __truncate_torn_record(self):
+        if self.__file_path.is_file():
+            with open(self.__file_path, 'r+b') as journal_file:
+                end = journal_file.seek(0, 2)
+                position = end
+
+                while position > 0:
+                    block_start = max(0, position - 64 * 1024)
+                    journal_file.seek(block_start)
+                    block = journal_file.read(position - block_start)
+
+                    if (newline := block.rfind(b'\n')) >= 0:
+                        position = block_start + newline + 1
+                        break
+                    position = block_start
+
+                if position < end:
+                    journal_file.truncate(position)
+
+    @staticmethod
+    def __apply(store: Store, record: Dict[str, Any]):
+        if record['op'] == 'add_pc':
+            store.add_pc(PC(record['name'], record['components']))
+        elif record['op'] == 'remove_pc':
+            store.remove_pc(record['name'])
+        elif pc := store.get_pc(record['name']):
+            if record['spec'] is None:
+                pc.remove_component(record['category'])
+            elif record['category'] in pc.components:
+                pc.swap_component(record['category'], record['spec'])
+            else:
+                pc.add_component(record['category'], record['spec'])
+
+
+def __get_store_file_path(dir_path: Path, store_format: StoreFormat, compression: Optional[Compression] = None) -> Path:
+    return Path(dir_path, f'store{store_format.extension}{compression.suffix if compression else ""}')
+
+
+def __get_target(file_path: Path) -> str:
+    return str(file_path.resolve())
+
+
+def __get_store_file_paths(dir_path: Path, store_formats: Iterable[StoreFormat]) -> Iterator[Path]:
+    for store_format in store_formats:
+        yield __get_store_file_path(dir_path, store_format)
+
+        for compression in COMPRESSIONS.values():
+            yield __get_store_file_path(dir_path, store_format, compression)
+
+
+def __find_store_file(dir_path: Path, format: Optional[str]) -> Optional[Path]:
+    store_formats = [get_format(format)] if format else FORMATS.values()
+
+    for file_path in __get_store_file_paths(dir_path, store_formats):
+        if file_path.is_file():
+            return file_path
+    return None
+
+
+def __read_store_file(file_path: Path, chunk_size: int) -> Iterator[SerializedPC]:
+    store_format = get_format_by_path(file_path)
+
+    with open(file_path, 'rb') as store_file:
+        if not (compression := get_compression_by_path(file_path)) or not file_path.stat().st_size:
+            yield from store_format.read(store_file, chunk_size)
+            return
+
+        try:
+            with compression.open(store_file, 'rb') as decompressed_file:
+                yield from store_format.read(decompressed_file, chunk_size)
+        except compression.errors as error:
+            raise ValueError(f'Malformed compressed store file: {file_path}') from error
+
+
+def __write_compressed(write: Callable[[BinaryIO], None], compression: Compression, compresslevel: Optional[int],
+                       binary_file: BinaryIO):
+    with compression.open(binary_file, 'wb', compresslevel) as compressed_file:
+        write(compressed_file)
+
+
+def __load_lazy_store(dir_path: Path, format: Optional[str], read_only: bool) -> Store:
+    if not (file_path := __find_store_file(dir_path, format)) or not file_path.stat().st_size:
+        return Store()
+    if get_format_by_path(file_path) is not get_format('binary') or get_compression_by_path(file_path):
+        raise ValueError(f'Lazy loading requires uncompressed binary store file, got: {file_path}')
+    return Store(mapping=MappedPCs.open(file_path, read_only))
+
+
+def __remove_other_store_files(dir_path: Path, store_file_path: Path):
+    for file_path in __get_store_file_paths(dir_path, FORMATS.values()):
+        if file_path != store_file_path:
+            __remove_file_if_exists(file_path)
 
 
 def __create_dir_if_necessary(dir_path: Path):
@@ -40,21 +507,150 @@ def __create_dir_if_necessary(dir_path: Path):
         dir_path.mkdir(parents=True)
 
 
-def __to_serializable_pcs(pcs: List[PC]) -> List[Dict[str, Components]]:
+def __remove_file_if_exists(file_path: Path):
+    if file_path.is_file():
+        file_path.unlink()
+
+
+def __to_serializable_pcs(pcs: Sequence[PC]) -> List[Dict[str, Components]]:
     return [{pc.name: pc.components} for pc in pcs]
 
 
-def __save_to_json(serializable: List, file_path: Path):
-    with open(file_path, 'w') as json_file:
-        dump(serializable, json_file)
+def __save_to_temp_file(write: Callable[[BinaryIO], None], file_path: Path) -> Path:
+    store_file, temp_file_path = __open_temp_file(file_path)
+
+    try:
+        with store_file:
+            if file_path.is_file():
+                temp_file_path.chmod(S_IMODE(file_path.stat().st_mode))
+
+            write(store_file)
+            store_file.flush()
+            fsync(store_file.fileno())
+    except BaseException:
+        temp_file_path.unlink()
+        raise
 
+    return temp_file_path
+
+
+def __open_temp_file(file_path: Path) -> Tuple[BinaryIO, Path]:
+    # unlike mkstemp, which lets only the owner access the file, open creates it with permissions allowed by umask,
+    # so the file replacing store file gets the same permissions as store file created without temporary file
+    while True:
+        temp_file_path = file_path.with_name(f'.{file_path.name}.{token_hex(4)}.tmp')
 
-def __get_pcs_from_json_file(file_path: Path) -> List[PC]:
-    with open(file_path, 'r') as json_file:
         try:
-            return[PC(*__unpack_serialized_pc(serialized_pc)) for serialized_pc in load(json_file)]
-        except JSONDecodeError:
-            return []
+            return cast(BinaryIO, open(temp_file_path, 'xb', buffering=1024 * 1024)), temp_file_path
+        except FileExistsError:
+            continue
+
+
+def __rotate_backups(file_path: Path, backups: int):
+    if backups > 0 and file_path.is_file():
+        for generation in range(backups - 1, 0, -1):
+            if (backup_path := __get_backup_path(file_path, generation)).is_file():
+                replace(backup_path, __get_backup_path(file_path, generation + 1))
+
+        newest_backup_path = __get_backup_path(file_path, 1)
+        __remove_file_if_exists(newest_backup_path)
+
+        try:
+            link(file_path, newest_backup_path)
+        except OSError:
+            copyfile(file_path, newest_backup_path)
+
+
+def __get_backup_path(file_path: Path, generation: int) -> Path:
+    return file_path.with_name(f'{file_path.name}.{generation}')
+
+
+def __sync_dir(dir_path: Path):
+    try:
+        dir_descriptor = open_fd(dir_path, O_RDONLY)
+    except OSError:
+        return
+
+    try:
+        fsync(dir_descriptor)
+    except OSError:
+        pass
+    finally:
+        close(dir_descriptor)
+
+
+def __write_store(store: Union[Store, StoreSnapshot], target_dir: Path, backups: int, format: str, force: bool,
+                  cache: Optional[EncodedPCCache], compression: Optional[str], compresslevel: Optional[int]) \
+        -> Optional[str]:
+    store_format = get_format(format)
+    store_compression = get_compression(compression) if compression else None
+    file_path = __get_store_file_path(target_dir, store_format, store_compression)
+    target = __get_target(file_path)
+
+    if cache is not None and not isinstance(store_format, JsonFormat):
+        raise ValueError(f'Cache of encoded PCs is not supported by {format!r} format')
+    if not force and not store.is_dirty and store.clean_target == target and file_path.is_file() and \
+            not Journal.get_file_path(target_dir).is_file():
+        return None
+
+    __create_dir_if_necessary(target_dir)
+
+    if cache is not None:
+        write = partial(cast(JsonFormat, store_format).write_pcs, store.pcs, cache=cache)
+    else:
+        write = partial(store_format.write, __to_serializable_pcs(store.pcs))
+
+    if store_compression:
+        write = partial(__write_compressed, write, store_compression, compresslevel)
+
+    temp_file_path = __save_to_temp_file(write, file_path)
+    __rotate_backups(file_path, backups)
+    replace(temp_file_path, file_path)
+    __sync_dir(target_dir)
+    __remove_other_store_files(target_dir, file_path)
+    __remove_file_if_exists(Journal.get_file_path(target_dir))
+    return target
+
+
+def __intern_components(components: Components, string_pool: Dict[Any, Any], read_only: bool) -> Components:
+    interned_components: Components = {}
+
+    for category, spec in components.items():
+        interned_spec = {intern(param_name): string_pool.setdefault(param_value, param_value)
+                         for param_name, param_value in spec.items()}
+
+        if read_only:
+            params = tuple(interned_spec)
+            interned_spec = FrozenSpec(interned_spec, string_pool.setdefault(params, params))  # type: ignore
+
+        interned_components[intern(category)] = interned_spec
+
+    return interned_components
+
+
+def __check_serialized_pc(serialized_pc: Any, names: Set[str]) -> Optional[str]:
+    if type(serialized_pc) is not dict:
+        return 'PC is not an object'
+    if len(serialized_pc) != 1:
+        return f'PC has {len(serialized_pc)} names instead of one'
+
+    (name, components), = serialized_pc.items()
+
+    if name in names:
+        return f'PC {name!r} is duplicated'
+    if type(components) is not dict:
+        return f'components of PC {name!r} are not an object'
+
+    for category, spec in components.items():
+        if type(spec) is not dict:
+            return f'component {category!r} of PC {name!r} is not an object'
+
+        for param_name, param_value in spec.items():
+            if type(param_value) is not str:
+                return f'parameter {param_name!r} of component {category!r} of PC {name!r} is not a string'
+
+    names.add(name)
+    return None
 
 
 def __unpack_serialized_pc(serialized_pc: Dict[str, Components]) -> Tuple[str, Components]:
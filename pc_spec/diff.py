@@ -0,0 +1,237 @@
+from hashlib import blake2b
+from typing import Dict, List, Mapping, NamedTuple, Optional, Tuple, Union
+
+from pc_spec.pc import PC, Components
+from pc_spec.store import Store, StoreSnapshot
+
+
+class ParamChange(NamedTuple):
+    """ Describes change of single parameter of component's specification. """
+
+    category: str
+    param_name: str
+    old_value: Optional[str]  # None if parameter was added
+    new_value: Optional[str]  # None if parameter was removed
+
+
+class PCDiff(NamedTuple):
+    """ Differences between two PCs with the same name. """
+
+    name: str
+    added: Components
+    removed: Components
+    changed: List[ParamChange]
+
+
+class StoreDiff(NamedTuple):
+    """ Differences between two stores, which turn the old store into the new one. """
+
+    added: List[PC]
+    removed: List[PC]
+    changed: List[PCDiff]
+
+    def is_empty(self) -> bool:
+        """
+        Checks whether stores were equal.
+        :return: True if there are no differences, False otherwise
+        """
+        return not (self.added or self.removed or self.changed)
+
+
+class Conflict(NamedTuple):
+    """
+    Describes change of a diff which couldn't be applied, because target store was changed in different way.
+    Reason is one of: 'pc_exists', 'pc_changed', 'pc_missing', 'component_exists', 'component_changed',
+    'component_missing' and 'param_changed'.
+    """
+
+    name: str
+    category: Optional[str]
+    param_name: Optional[str]
+    reason: str
+
+
+class ContentHashes:
+    """
+    Cache of content hashes of PCs of single store.
+    Hash is computed again only if components of PC were replaced since it was cached, which happens on every change,
+    so repeated diffs of the store (or of its snapshots) hash only PCs changed in the meantime.
+    """
+
+    def __init__(self):
+        self.__hashes: Dict[str, Tuple[Components, bytes]] = {}
+
+    def get(self, pc: PC) -> bytes:
+        """
+        Gets content hash of given PC, which doesn't depend on order of its components and parameters.
+        :param pc: PC to be hashed
+        :return: hash of PC's components
+        """
+        cached = self.__hashes.get(pc.name)
+
+        if cached is None or cached[0] is not pc.components:
+            cached = self.__hashes[pc.name] = (pc.components, content_hash(pc.components))
+
+        return cached[1]
+
+    def discard(self, names: List[str]):
+        """
+        Forgets hashes of PCs with given names, i.e. after they were removed from the store.
+        :param names: names of PCs
+        """
+        for name in names:
+            self.__hashes.pop(name, None)
+
+
+def content_hash(components: Mapping[str, Mapping[str, str]]) -> bytes:
+    """
+    Computes hash of given components, which doesn't depend on their order and order of their parameters.
+    :param components: components of PC
+    :return: 16-byte BLAKE2 digest
+    """
+    canonical = sorted((category, sorted(spec.items())) for category, spec in components.items())
+    return blake2b(repr(canonical).encode(), digest_size=16).digest()
+
+
+def diff_pcs(old_pc: PC, new_pc: PC) -> PCDiff:
+    """
+    Compares components of two PCs down to parameters of their specifications.
+    :param old_pc: PC before the change
+    :param new_pc: PC after the change
+    :return: differences, named after the new PC
+    """
+    old_components, new_components = old_pc.components, new_pc.components
+    added = {category: dict(spec) for category, spec in new_components.items() if category not in old_components}
+    removed = {category: dict(spec) for category, spec in old_components.items() if category not in new_components}
+    changed: List[ParamChange] = []
+
+    for category, old_spec in old_components.items():
+        if (new_spec := new_components.get(category)) is None or old_spec == new_spec:
+            continue
+
+        for param_name, old_value in old_spec.items():
+            if (new_value := new_spec.get(param_name)) != old_value:
+                changed.append(ParamChange(category, param_name, old_value, new_value))
+        for param_name, new_value in new_spec.items():
+            if param_name not in old_spec:
+                changed.append(ParamChange(category, param_name, None, new_value))
+
+    return PCDiff(new_pc.name, added, removed, changed)
+
+
+def diff_stores(old_store: Union[Store, StoreSnapshot], new_store: Union[Store, StoreSnapshot],
+                old_hashes: Optional[ContentHashes] = None, new_hashes: Optional[ContentHashes] = None) -> StoreDiff:
+    """
+    Compares PCs of two stores by their names.
+    If caches of content hashes are given then PCs with equal hashes are skipped without comparing their components,
+    otherwise components are compared directly, which is faster than hashing them only once.
+    :param old_store: store before the change, or its snapshot
+    :param new_store: store after the change, or its snapshot
+    :param old_hashes: cache of content hashes of the old store, which can be reused by following diffs
+    :param new_hashes: cache of content hashes of the new store, which can be reused by following diffs
+    :return: differences, with added and changed PCs in order of the new store and removed in order of the old one
+    """
+    old_pcs = {pc.name: pc for pc in old_store.pcs}
+    added: List[PC] = []
+    changed: List[PCDiff] = []
+
+    if old_hashes is None and new_hashes is None:
+        def differ(old_pc: PC, new_pc: PC) -> bool:
+            return old_pc.components != new_pc.components
+    else:
+        old_hash = (old_hashes or ContentHashes()).get
+        new_hash = (new_hashes or ContentHashes()).get
+
+        def differ(old_pc: PC, new_pc: PC) -> bool:
+            return old_hash(old_pc) != new_hash(new_pc)
+
+    for new_pc in new_store.pcs:
+        if (old_pc := old_pcs.pop(new_pc.name, None)) is None:
+            added.append(new_pc)
+        elif old_pc is not new_pc and differ(old_pc, new_pc):
+            changed.append(diff_pcs(old_pc, new_pc))
+
+    return StoreDiff(added, list(old_pcs.values()), changed)
+
+
+def apply_diff(store: Store, diff: StoreDiff) -> List[Conflict]:
+    """
+    Applies given differences to the store.
+    Change is applied only if affected part of the store is the same as before the change, otherwise it is skipped
+    and reported as conflict, unless the store already has the same content as after the change.
+    :param store: store to be changed
+    :param diff: differences to be applied
+    :return: conflicts, in order of the diff's added, removed and changed PCs
+    """
+    conflicts: List[Conflict] = []
+
+    for new_pc in diff.added:
+        if (pc := store.get_pc(new_pc.name)) is None:
+            store.add_pc(PC(new_pc.name, __copy(new_pc.components)))
+        elif content_hash(pc.components) != content_hash(new_pc.components):
+            conflicts.append(Conflict(new_pc.name, None, None, 'pc_exists'))
+
+    for old_pc in diff.removed:
+        if (pc := store.get_pc(old_pc.name)) is None:
+            continue
+        if content_hash(pc.components) == content_hash(old_pc.components):
+            store.remove_pc(old_pc.name)
+        else:
+            conflicts.append(Conflict(old_pc.name, None, None, 'pc_changed'))
+
+    for pc_diff in diff.changed:
+        if (pc := store.get_pc(pc_diff.name)) is None:
+            conflicts.append(Conflict(pc_diff.name, None, None, 'pc_missing'))
+        else:
+            conflicts.extend(__apply_pc_diff(pc, pc_diff))
+
+    return conflicts
+
+
+def merge_stores(base: Union[Store, StoreSnapshot], ours: Store, theirs: Union[Store, StoreSnapshot]) -> List[Conflict]:
+    """
+    Merges changes made in their store since the common base into our store.
+    Changes which conflict with changes made in our store since the base are skipped, so our store wins.
+    :param base: common ancestor of both stores, i.e. snapshot taken before both stores were changed
+    :param ours: store to which changes will be applied
+    :param theirs: store which changes will be merged
+    :return: conflicts between the stores
+    """
+    return apply_diff(ours, diff_stores(base, theirs))
+
+
+def __apply_pc_diff(pc: PC, pc_diff: PCDiff) -> List[Conflict]:
+    conflicts: List[Conflict] = []
+
+    # components are read again for every change, as each change replaces them with new ones
+    for category, spec in pc_diff.added.items():
+        if category not in pc.components:
+            pc.add_component(category, dict(spec))
+        elif pc.components[category] != spec:
+            conflicts.append(Conflict(pc.name, category, None, 'component_exists'))
+
+    for category, spec in pc_diff.removed.items():
+        if category not in pc.components:
+            continue
+        if pc.components[category] == spec:
+            pc.remove_component(category)
+        else:
+            conflicts.append(Conflict(pc.name, category, None, 'component_changed'))
+
+    for category, param_name, old_value, new_value in pc_diff.changed:
+        if (current_spec := pc.components.get(category)) is None:
+            conflicts.append(Conflict(pc.name, category, param_name, 'component_missing'))
+        elif (current_value := current_spec.get(param_name)) == new_value:
+            continue
+        elif current_value != old_value:
+            conflicts.append(Conflict(pc.name, category, param_name, 'param_changed'))
+        elif new_value is not None:
+            pc.update_component(category, param_name, new_value)
+        else:
+            pc.swap_component(category, {name: value for name, value in current_spec.items() if name != param_name})
+
+    return conflicts
+
+
+def __copy(components: Components) -> Components:
+    return {category: dict(spec) for category, spec in components.items()}
@@ -0,0 +1,227 @@
+from contextlib import contextmanager
+from threading import RLock
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Union
+
+from pc_spec.pc import PC, ComponentChange, FrozenSpec, Spec
+from pc_spec.store import Store, StoreChange
+
+EVENT_TYPES = {'add': 'component_added', 'remove': 'component_removed', 'swap': 'component_swapped',
+               'update': 'component_updated'}  # pragma: no mutate
+
+
+class Event(NamedTuple):
+    """ Describes single change of PCs, in form which doesn't depend on the source of the change. """
+
+    type: str  # 'pc_added', 'pc_removed', 'component_added', 'component_removed', 'component_swapped' or ...updated
+    pc: PC
+    category: Optional[str] = None
+    old_spec: Optional[Spec] = None
+    new_spec: Optional[Spec] = None
+
+
+EventListener = Callable[[List[Event]], None]  # pragma: no mutate
+
+
+def to_event(change: StoreChange) -> Event:
+    """
+    Converts change of the store to event.
+    :param change: description of the change
+    :return: event describing the change
+    """
+    if change.operation == 'add_pc':
+        return Event('pc_added', change.pc)
+    if change.operation == 'remove_pc':
+        return Event('pc_removed', change.pc)
+
+    component_change: ComponentChange = change.component_change  # type: ignore
+    return Event(EVENT_TYPES[component_change.operation], change.pc, component_change.category,
+                 component_change.old_spec, component_change.new_spec)
+
+
+def coalesce(events: List[Event]) -> List[Event]:
+    """
+    Reduces given events to the smallest list of events which leads to the same result.
+    PCs added and then removed are left out, changes of components of added or removed PCs are folded into them,
+    and subsequent changes of the same component are merged into single one.
+    :param events: events in order in which they happened
+    :return: coalesced events, in order in which PCs were first changed
+    """
+    pending: Dict[str, __PendingPC] = {}
+
+    for event in events:
+        if (pending_pc := pending.get(event.pc.name)) is None:
+            pending_pc = pending[event.pc.name] = __PendingPC(event)
+        pending_pc.apply(event)
+
+    return [event for pending_pc in pending.values() for event in pending_pc.events()]
+
+
+class EventStream:
+    """
+    Stream of events describing changes of the store or single PC.
+    Events are delivered in batches, synchronously to listeners and without waiting to the queue, if given.
+    Outside of batch() every event is delivered at once, as single-element batch.
+    Inside of batch() events are collected and delivered, coalesced if requested, when the outermost batch ends.
+    Specifications of events which are collected or put to the queue are copied, so they aren't affected
+    by changes of specifications made before the events are handled.
+    """
+
+    def __init__(self, source: Union[Store, PC], queue: Any = None, coalesce: bool = True):
+        """
+        :param source: store or PC which changes will be streamed
+        :param queue: queue (i.e. queue.Queue or asyncio.Queue) to which batches will be put with put_nowait
+        :param coalesce: whether events collected in batch should be coalesced before delivery
+        """
+        self.__source: Union[Store, PC] = source
+        self.__queue: Any = queue
+        self.__coalesce: bool = coalesce
+        self.__listeners: List[EventListener] = []
+        self.__lock: RLock = RLock()
+        self.__depth: int = 0
+        self.__pending: List[Event] = []
+
+        if isinstance(source, Store):
+            source.subscribe(self.__on_store_change)
+        else:
+            source.subscribe(self.__on_component_change)
+
+    def subscribe(self, listener: EventListener):
+        """
+        Registers listener which will be called with every delivered batch of events.
+        If given listener is already registered then nothing will change.
+        :param listener: callable which receives list of events
+        """
+        if listener not in self.__listeners:
+            self.__listeners.append(listener)
+
+    def unsubscribe(self, listener: EventListener):
+        """
+        Unregisters listener of events.
+        If given listener isn't registered then nothing will change.
+        :param listener: previously registered listener
+        """
+        if listener in self.__listeners:
+            self.__listeners.remove(listener)
+
+    @contextmanager
+    def batch(self) -> Iterator['EventStream']:
+        """
+        Collects events until the outermost batch ends and delivers them at once.
+        :return: context manager of the batch
+        """
+        with self.__lock:
+            self.__depth += 1
+        try:
+            yield self
+        finally:
+            with self.__lock:
+                self.__depth -= 1
+                if not self.__depth:
+                    self.flush()
+
+    def flush(self):
+        """
+        Delivers events collected so far in current batch.
+        If there are no such events then nothing will be delivered.
+        """
+        with self.__lock:
+            events, self.__pending = self.__pending, []
+
+        if events and self.__coalesce:
+            events = coalesce(events)
+        if events:
+            self.__deliver(events)
+
+    def close(self):
+        """
+        Delivers pending events and stops streaming changes of the source.
+        """
+        self.flush()
+
+        if isinstance(self.__source, Store):
+            self.__source.unsubscribe(self.__on_store_change)
+        else:
+            self.__source.unsubscribe(self.__on_component_change)
+
+    def __on_store_change(self, change: StoreChange):
+        self.__emit(to_event(change))
+
+    def __on_component_change(self, pc: PC, change: ComponentChange):
+        self.__emit(Event(EVENT_TYPES[change.operation], pc, change.category, change.old_spec, change.new_spec))
+
+    def __emit(self, event: Event):
+        with self.__lock:
+            if self.__depth:
+                self.__pending.append(self.__copy_specs(event))
+                return
+
+        self.__deliver([self.__copy_specs(event) if self.__queue is not None else event])
+
+    def __deliver(self, events: List[Event]):
+        for listener in list(self.__listeners):
+            listener(events)
+
+        if self.__queue is not None:
+            self.__queue.put_nowait(events)
+
+    @staticmethod
+    def __copy_specs(event: Event) -> Event:
+        if event.category is None:
+            return event
+        return event._replace(old_spec=EventStream.__copy_spec(event.old_spec),
+                              new_spec=EventStream.__copy_spec(event.new_spec))
+
+    @staticmethod
+    def __copy_spec(spec: Optional[Spec]) -> Optional[Spec]:
+        return dict(spec) if spec is not None and not isinstance(spec, FrozenSpec) else spec
+
+
+class __PendingPC:
+    def __init__(self, event: Event):
+        self.__first_pc: PC = event.pc
+        self.__last_pc: Optional[PC] = event.pc
+        self.__existed: bool = event.type != 'pc_added'
+        self.__was_removed: bool = False
+        self.__components: Dict[str, Event] = {}
+
+    def apply(self, event: Event):
+        if event.type == 'pc_added':
+            self.__last_pc = event.pc
+            self.__components.clear()
+        elif event.type == 'pc_removed':
+            self.__last_pc = None
+            self.__was_removed = True
+            self.__components.clear()
+        elif event.category in self.__components:
+            self.__merge(self.__components[event.category], event)  # type: ignore
+        else:
+            self.__components[event.category] = event  # type: ignore
+
+    def events(self) -> List[Event]:
+        if not self.__existed:
+            return [Event('pc_added', self.__last_pc)] if self.__last_pc is not None else []
+        if self.__last_pc is None:
+            return [Event('pc_removed', self.__first_pc)]
+        if self.__was_removed:
+            # PC could be changed while it wasn't in the store, even if the same object was added again
+            return [Event('pc_removed', self.__first_pc), Event('pc_added', self.__last_pc)]
+        return list(self.__components.values())
+
+    def __merge(self, first: Event, last: Event):
+        category: str = last.category  # type: ignore
+        old_spec, new_spec = first.old_spec, last.new_spec
+
+        if old_spec is None and new_spec is None or old_spec is not None and old_spec == new_spec:
+            del self.__components[category]
+            return
+
+        if old_spec is None:
+            event_type = 'component_added'
+        elif new_spec is None:
+            event_type = 'component_removed'
+        elif first.type == last.type == 'component_updated':
+            event_type = 'component_updated'
+        else:
+            event_type = 'component_swapped'
+
+        self.__components[category] = Event(event_type, last.pc, category, old_spec, new_spec)
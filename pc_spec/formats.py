@@ -0,0 +1,523 @@
+from array import array
+from bz2 import BZ2File
+from collections import OrderedDict
+from gzip import BadGzipFile, GzipFile
+from hashlib import blake2b
+from io import TextIOWrapper
+from json import JSONDecodeError, JSONDecoder, JSONEncoder
+from lzma import LZMAError, LZMAFile
+from pathlib import Path
+from re import compile as compile_regex
+from struct import Struct
+from sys import byteorder
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Type
+from zlib import error as ZlibError
+
+from pc_spec.cached import CacheStats
+from pc_spec.pc import PC, Components
+
+SerializedPC = Dict[str, Components]  # pragma: no mutate
+
+
+class StoreFormat:
+    """ Represents on-disk encoding of serialized PCs. """
+
+    name: str = ''
+    extension: str = ''
+
+    def write(self, serialized_pcs: Iterable[SerializedPC], binary_file: BinaryIO):
+        """
+        Encodes given serialized PCs and writes them to given file.
+        :param serialized_pcs: PCs in form of {name: components} dicts, which are iterated only once
+        :param binary_file: file opened for writing in binary mode
+        """
+        raise NotImplementedError
+
+    def read(self, binary_file: BinaryIO, chunk_size: int) -> Iterator[SerializedPC]:
+        """
+        Lazily reads and decodes serialized PCs from given file.
+        :param binary_file: file opened for reading in binary mode
+        :param chunk_size: number of bytes read from the file at once
+        :return: iterator over PCs in form of {name: components} dicts
+        :raises ValueError: if file is malformed
+        """
+        raise NotImplementedError
+
+
+class EncodedPCCache:
+    """
+    Cache of PCs encoded to JSON, which lets repeated saves encode only PCs changed since the previous save.
+    Encoded PC is valid as long as PC has the same components object, which is replaced by every change of the PC,
+    so PCs shouldn't be changed other than by their methods. PCs got from snapshots share it with PCs of the store.
+    When the cache exceeds its size, least recently used encoded PCs are evicted.
+    """
+
+    def __init__(self, capacity: Optional[int] = None, max_bytes: Optional[int] = 64 * 1024 * 1024):
+        """
+        :param capacity: maximal number of cached PCs, unlimited by default
+        :param max_bytes: maximal size of cached PCs, 64 MiB by default, None for unlimited
+        :raises ValueError: if capacity or max_bytes isn't positive
+        """
+        if capacity is not None and capacity < 1 or max_bytes is not None and max_bytes < 1:
+            raise ValueError('Capacity and maximal size of cache must be positive')
+
+        self.__capacity: Optional[int] = capacity
+        self.__max_bytes: Optional[int] = max_bytes
+        self.__cache: OrderedDict[str, Tuple[Components, bytes]] = OrderedDict()
+        self.__bytes: int = 0
+        self.__hits: int = 0
+        self.__misses: int = 0
+        self.__evictions: int = 0
+
+    @property
+    def stats(self) -> CacheStats:
+        """
+        Gets counters of the cache since it was created.
+        :return: numbers of hits, misses and evictions, write backs are always 0
+        """
+        return CacheStats(self.__hits, self.__misses, self.__evictions, 0)
+
+    @property
+    def size(self) -> int:
+        """
+        Gets size of cached PCs.
+        :return: number of bytes of encoded PCs
+        """
+        return self.__bytes
+
+    def encode(self, pc: PC) -> bytes:
+        """
+        Gets given PC encoded as JSON object {name: components}, encoding it only if it isn't cached.
+        :param pc: PC to be encoded
+        :return: UTF-8 encoded JSON
+        """
+        cache = self.__cache
+
+        if (cached := cache.get(pc.name)) is not None and cached[0] is pc.components:
+            cache.move_to_end(pc.name)
+            self.__hits += 1
+            return cached[1]
+
+        self.__misses += 1
+        encoded = JsonFormat.encode_pc(pc).encode()
+
+        if cached is not None:
+            self.__bytes -= len(cached[1])
+        cache[pc.name] = (pc.components, encoded)
+        cache.move_to_end(pc.name)
+        self.__bytes += len(encoded)
+        self.__evict()
+        return encoded
+
+    def clear(self):
+        """
+        Forgets all cached PCs.
+        """
+        self.__cache.clear()
+        self.__bytes = 0
+
+    def __evict(self):
+        while self.__capacity is not None and len(self.__cache) > self.__capacity or \
+                self.__max_bytes is not None and self.__bytes > self.__max_bytes:
+            _, (_, encoded) = self.__cache.popitem(last=False)
+            self.__bytes -= len(encoded)
+            self.__evictions += 1
+
+
+class JsonFormat(StoreFormat):
+    """ Encodes serialized PCs as JSON array, i.e. [{"name": {"cpu": {"name": "i7-9700K"}}}]. """
+
+    name = 'json'
+    extension = '.json'
+
+    __WHITESPACE = compile_regex(r'[ \t\n\r]*')
+    __encode = JSONEncoder(default=dict).encode
+
+    def __init__(self, chunk_size: int = 1024 * 1024):
+        """
+        :param chunk_size: number of characters written to the file at once
+        """
+        self.__chunk_size: int = chunk_size
+
+    def write(self, serialized_pcs: Iterable[SerializedPC], binary_file: BinaryIO):
+        chunk: List[str] = []
+        chunk_size = 0
+
+        for piece in self.__encode_array(serialized_pcs):
+            chunk.append(piece)
+            chunk_size += len(piece)
+
+            if chunk_size >= self.__chunk_size:
+                binary_file.write(''.join(chunk).encode())
+                chunk.clear()
+                chunk_size = 0
+
+        binary_file.write(''.join(chunk).encode())
+
+    def write_pcs(self, pcs: Sequence[PC], binary_file: BinaryIO, cache: EncodedPCCache):
+        """
+        Encodes given PCs and writes them to given file, like write, reusing PCs encoded by previous writes.
+        :param pcs: PCs to be written
+        :param binary_file: file opened for writing in binary mode
+        :param cache: cache of encoded PCs, which is updated with PCs which weren't in it
+        """
+        chunk: List[bytes] = [b'[']
+        chunk_size = 0
+
+        for position, pc in enumerate(pcs):
+            encoded = cache.encode(pc)
+            chunk.append(b', ' + encoded if position else encoded)
+            chunk_size += len(encoded)
+
+            if chunk_size >= self.__chunk_size:
+                binary_file.write(b''.join(chunk))
+                chunk.clear()
+                chunk_size = 0
+
+        chunk.append(b']')
+        binary_file.write(b''.join(chunk))
+
+    @staticmethod
+    def encode_pc(pc: PC) -> str:
+        """
+        Encodes single PC in the form in which it is kept in the array.
+        :param pc: PC to be encoded
+        :return: JSON object {name: components}
+        """
+        return JsonFormat.__encode({pc.name: pc.components})
+
+    def read(self, binary_file: BinaryIO, chunk_size: int) -> Iterator[SerializedPC]:
+        json_file = TextIOWrapper(binary_file, encoding='utf-8')  # type: ignore
+
+        try:
+            yield from self.__read_values(json_file, chunk_size)
+        finally:
+            json_file.detach()
+
+    def __read_values(self, json_file: TextIOWrapper, chunk_size: int) -> Iterator[SerializedPC]:
+        decoder = JSONDecoder()
+        buffer, position, eof = '', 0, False
+        state = 'start'
+
+        while True:
+            position = self.__WHITESPACE.match(buffer, position).end()  # type: ignore
+
+            if position < len(buffer):
+                char = buffer[position]
+
+                if state == 'start' and char == '[':
+                    state, position = 'first', position + 1
+                    continue
+                if state in ('first', 'separator') and char == ']':
+                    state, position = 'end', position + 1
+                    continue
+                if state == 'separator' and char == ',':
+                    state, position = 'value', position + 1
+                    continue
+                if state not in ('first', 'value'):
+                    raise JSONDecodeError(f'Unexpected {char!r}', buffer, position)
+                if decoded := self.__decode_value(decoder, buffer, position, eof):
+                    value, position = decoded
+                    state = 'separator'
+                    yield value
+                    continue
+            elif eof:
+                break
+
+            chunk = json_file.read(max(chunk_size, len(buffer) - position))
+            buffer, position, eof = buffer[position:] + chunk, 0, not chunk
+
+        if state not in ('start', 'end'):
+            raise JSONDecodeError('Unexpected end of data', buffer, position)
+
+    @staticmethod
+    def __encode_array(serialized_pcs: Iterable[SerializedPC]) -> Iterator[str]:
+        encode = JsonFormat.__encode
+        separator = '['
+
+        for serialized_pc in serialized_pcs:
+            yield separator
+            yield encode(serialized_pc)
+            separator = ', '
+
+        yield ']' if separator != '[' else '[]'
+
+    @staticmethod
+    def __decode_value(decoder: JSONDecoder, buffer: str, position: int, eof: bool) -> Optional[Tuple[Any, int]]:
+        try:
+            value, end = decoder.raw_decode(buffer, position)
+        except JSONDecodeError:
+            if eof:
+                raise
+            return None
+        return (value, end) if end < len(buffer) or eof else None
+
+
+class BinaryFormat(StoreFormat):
+    """
+    Encodes serialized PCs in compact binary form.
+    All names, categories, parameters and values are kept once in string table and PCs refer to them by id.
+    Layout (all integers are unsigned little-endian, 32-bit unless stated otherwise):
+    magic, version, string count, string offsets, UTF-8 string blob, PC count,
+    PC records - each one is word count followed by words:
+    name id, component count, [category id, param count, [param id, value id] * param count] * component count,
+    index - PC count, 64-bit name hashes in ascending order, 64-bit file offsets of matching PC records,
+    footer - 64-bit file offset of the index, index magic.
+    Index lets readers find single PC by its name without decoding the rest of the file.
+    """
+
+    name = 'binary'
+    extension = '.pcsb'
+
+    MAGIC = b'PCSB'
+    INDEX_MAGIC = b'PCSI'
+    VERSION = 2
+    READABLE_VERSIONS = (1, 2)
+
+    __WORD = Struct('<I')
+    __LONG_WORD = Struct('<Q')
+
+    def write(self, serialized_pcs: Iterable[SerializedPC], binary_file: BinaryIO):
+        string_ids: Dict[str, int] = {}
+        records = array('I')
+        record_starts = [self.__encode_record(serialized_pc, string_ids, records) for serialized_pc in serialized_pcs]
+
+        strings = list(string_ids)
+        records_offset = len(self.MAGIC) + self.__WORD.size
+        binary_file.write(self.MAGIC + self.__WORD.pack(self.VERSION))
+        records_offset += self.__write_string_table(strings, binary_file)
+        binary_file.write(self.__WORD.pack(len(record_starts)))
+        records_offset += self.__WORD.size
+        binary_file.write(self.__to_bytes(records))
+
+        index_offset = records_offset + len(records) * records.itemsize
+        index = sorted((self.hash_name(strings[records[start + 1]]), records_offset + start * records.itemsize)
+                       for start in record_starts)
+        binary_file.write(self.__WORD.pack(len(index)))
+        binary_file.write(self.__to_bytes(array('Q', [name_hash for name_hash, _ in index])))
+        binary_file.write(self.__to_bytes(array('Q', [offset for _, offset in index])))
+        binary_file.write(self.__LONG_WORD.pack(index_offset) + self.INDEX_MAGIC)
+
+    def read(self, binary_file: BinaryIO, chunk_size: int) -> Iterator[SerializedPC]:
+        header = binary_file.read(len(self.MAGIC) + self.__WORD.size)
+
+        if not header:
+            return
+        if header[:len(self.MAGIC)] != self.MAGIC or \
+                self.__unpack_word(header[len(self.MAGIC):]) not in self.READABLE_VERSIONS:
+            raise ValueError('Not a binary store file or unsupported version')
+
+        strings = self.__read_string_table(binary_file)
+        words, position = array('I'), 0
+        chunk_words = max(chunk_size // words.itemsize, 1)
+
+        for _ in range(self.__read_word(binary_file)):
+            if position >= len(words):
+                words, position = self.__read_words(binary_file, 1, chunk_words), 0
+
+            record_end = position + 1 + words[position]
+
+            if record_end > len(words):
+                missing_words = record_end - len(words)
+                words = words[position:] + self.__read_words(binary_file, missing_words, chunk_words)
+                record_end, position = record_end - position, 0
+
+            yield self.decode_record(words[position + 1:record_end], strings)
+            position = record_end
+
+    @staticmethod
+    def hash_name(name: str) -> int:
+        """
+        Calculates hash of PC's name used by the index, which is stable between processes.
+        :param name: name of the PC
+        :return: 64-bit hash
+        """
+        return int.from_bytes(blake2b(name.encode(), digest_size=8).digest(), 'little')
+
+    @staticmethod
+    def decode_record(record: Sequence[int], strings: Sequence[str]) -> SerializedPC:
+        """
+        Decodes single PC record.
+        :param record: words of the record
+        :param strings: string table
+        :return: PC in form of {name: components} dict
+        :raises ValueError: if record is malformed
+        """
+        try:
+            components: Components = {}
+            position = 2
+
+            for _ in range(record[1]):
+                params_end = position + 2 + 2 * record[position + 1]
+                components[strings[record[position]]] = {strings[record[i]]: strings[record[i + 1]]
+                                                         for i in range(position + 2, params_end, 2)}
+                position = params_end
+
+            return {strings[record[0]]: components}
+        except IndexError:
+            raise ValueError('Malformed PC record')
+
+    @staticmethod
+    def __encode_record(serialized_pc: SerializedPC, string_ids: Dict[str, int], records: array) -> int:
+        get_string_id = string_ids.setdefault
+        record_start = len(records)
+        records.append(0)
+
+        for name, components in serialized_pc.items():
+            records.extend((get_string_id(name, len(string_ids)), len(components)))
+
+            for category, spec in components.items():
+                records.extend((get_string_id(category, len(string_ids)), len(spec)))
+
+                for param_name, param_value in spec.items():
+                    records.append(get_string_id(param_name, len(string_ids)))
+                    records.append(get_string_id(param_value, len(string_ids)))
+
+        records[record_start] = len(records) - record_start - 1
+        return record_start
+
+    def __write_string_table(self, strings: List[str], binary_file: BinaryIO) -> int:
+        encoded_strings = [string.encode() for string in strings]
+        offsets = array('I', [0])
+
+        for encoded_string in encoded_strings:
+            offsets.append(offsets[-1] + len(encoded_string))
+
+        binary_file.write(self.__WORD.pack(len(strings)))
+        binary_file.write(self.__to_bytes(offsets))
+        binary_file.write(b''.join(encoded_strings))
+        return self.__WORD.size + len(offsets) * offsets.itemsize + offsets[-1]
+
+    def __read_string_table(self, binary_file: BinaryIO) -> List[str]:
+        string_count = self.__read_word(binary_file) + 1
+        offsets = self.__read_words(binary_file, string_count, string_count)
+        blob = self.__read_exactly(binary_file, offsets[-1])
+        return [blob[offsets[i]:offsets[i + 1]].decode() for i in range(len(offsets) - 1)]
+
+    def __read_word(self, binary_file: BinaryIO) -> int:
+        return self.__unpack_word(self.__read_exactly(binary_file, self.__WORD.size))
+
+    def __unpack_word(self, data: bytes) -> int:
+        return self.__WORD.unpack(data)[0]
+
+    @staticmethod
+    def __read_words(binary_file: BinaryIO, count: int, preferred_count: int) -> array:
+        words = array('I')
+        words.frombytes(binary_file.read(max(count, preferred_count) * words.itemsize))
+
+        if len(words) < count:
+            raise ValueError('Unexpected end of binary store file')
+
+        if byteorder == 'big':
+            words.byteswap()
+        return words
+
+    @staticmethod
+    def __to_bytes(words: array) -> bytes:
+        if byteorder == 'big':
+            words = array(words.typecode, words)
+            words.byteswap()
+        return words.tobytes()
+
+    @staticmethod
+    def __read_exactly(binary_file: BinaryIO, size: int) -> bytes:
+        if len(data := binary_file.read(size)) != size:
+            raise ValueError('Unexpected end of binary store file')
+        return data
+
+
+class Compression:
+    """
+    Represents streaming codec of store files, which is chosen by suffix added after extension of store format,
+    i.e. 'store.json.gz'. Data is compressed and decompressed in chunks, as the format writes and reads it.
+    """
+
+    def __init__(self, name: str, suffix: str, wrap: Callable[..., Any], default_level: int,
+                 errors: Tuple[Type[Exception], ...]):
+        """
+        :param name: name of the compression, i.e. 'gzip'
+        :param suffix: suffix of compressed files, i.e. '.gz'
+        :param wrap: callable wrapping given file opened in given mode ('rb' or 'wb') with given compression level
+        :param default_level: compression level used when no level is requested
+        :param errors: exceptions raised by wrapped file when compressed data is malformed
+        """
+        self.name: str = name
+        self.suffix: str = suffix
+        self.default_level: int = default_level
+        self.errors: Tuple[Type[Exception], ...] = errors
+        self.__wrap: Callable[..., Any] = wrap
+
+    def open(self, binary_file: BinaryIO, mode: str, level: Optional[int] = None) -> BinaryIO:
+        """
+        Wraps given file, so data written to it is compressed or data read from it is decompressed.
+        Closing wrapping file doesn't close given one.
+        :param binary_file: file opened in binary mode
+        :param mode: 'rb' for decompression or 'wb' for compression
+        :param level: compression level, codec's default if not given
+        :return: wrapping file
+        """
+        return self.__wrap(binary_file, mode, self.default_level if level is None else level)
+
+
+FORMATS: Dict[str, StoreFormat] = {store_format.name: store_format for store_format in (JsonFormat(), BinaryFormat())}
+
+COMPRESSIONS: Dict[str, Compression] = {compression.name: compression for compression in (
+    Compression('gzip', '.gz',
+                lambda file, mode, level: GzipFile(fileobj=file, mode=mode, compresslevel=level, mtime=0),
+                6, (EOFError, BadGzipFile, ZlibError)),
+    Compression('bz2', '.bz2', lambda file, mode, level: BZ2File(file, mode, compresslevel=level),
+                9, (EOFError, OSError)),
+    Compression('lzma', '.xz', lambda file, mode, level: LZMAFile(file, mode, preset=level if mode == 'wb' else None),
+                6, (EOFError, LZMAError)))}
+
+
+def get_format(name: str) -> StoreFormat:
+    """
+    Gets store format registered under given name.
+    :param name: name of the format, i.e. 'json' or 'binary'
+    :return: store format
+    :raises ValueError: if format with given name isn't registered
+    """
+    if name not in FORMATS:
+        raise ValueError(f'Unknown store format: {name!r}')
+    return FORMATS[name]
+
+
+def get_format_by_path(file_path: Path) -> StoreFormat:
+    """
+    Gets store format matching extension of given file, which may be followed by suffix of compression.
+    :param file_path: path to store file, i.e. 'store.pcsb' or 'store.json.gz'
+    :return: store format
+    :raises ValueError: if no registered format uses extension of given file
+    """
+    if get_compression_by_path(file_path):
+        file_path = file_path.with_suffix('')
+
+    for store_format in FORMATS.values():
+        if file_path.suffix == store_format.extension:
+            return store_format
+    raise ValueError(f'Unknown store format of file: {file_path}')
+
+
+def get_compression(name: str) -> Compression:
+    """
+    Gets compression registered under given name.
+    :param name: name of the compression, i.e. 'gzip', 'bz2' or 'lzma'
+    :return: compression
+    :raises ValueError: if compression with given name isn't registered
+    """
+    if name not in COMPRESSIONS:
+        raise ValueError(f'Unknown compression: {name!r}')
+    return COMPRESSIONS[name]
+
+
+def get_compression_by_path(file_path: Path) -> Optional[Compression]:
+    """
+    Gets compression matching suffix of given file.
+    :param file_path: path to store file, i.e. 'store.json.gz'
+    :return: compression, None if file isn't compressed
+    """
+    for compression in COMPRESSIONS.values():
+        if file_path.suffix == compression.suffix:
+            return compression
+    return None
@@ -0,0 +1,92 @@
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from pc_spec.pc import PC, ComponentChange, Spec
+
+
+class ComponentIndex:
+    """ Inverted index from component categories and specification parameters to PCs. """
+
+    def __init__(self, pcs: Optional[Iterable[PC]] = None):
+        """
+        :param pcs: PCs to be indexed
+        """
+        self.__pcs: Dict[str, PC] = {}
+        self.__positions: Dict[str, int] = {}
+        self.__next_position: int = 0
+        self.__categories: Dict[str, Set[str]] = {}
+        self.__params: Dict[Tuple[str, str, str], Set[str]] = {}
+
+        for pc in pcs if pcs else []:
+            self.add(pc)
+
+    def add(self, pc: PC):
+        """
+        Adds all components of given PC to the index.
+        If PC with same name is already indexed then nothing will change.
+        :param pc: PC to be indexed
+        """
+        if pc.name not in self.__pcs:
+            self.__pcs[pc.name] = pc
+            self.__positions[pc.name] = self.__next_position
+            self.__next_position += 1
+
+            for category, spec in pc.components.items():
+                self.__index_spec(pc.name, category, spec)
+
+    def remove(self, pc: PC):
+        """
+        Removes all components of given PC from the index.
+        If given PC isn't indexed then nothing will change.
+        :param pc: PC to be removed from the index
+        """
+        if self.__pcs.get(pc.name) is pc:
+            for category, spec in pc.components.items():
+                self.__unindex_spec(pc.name, category, spec)
+
+            del self.__pcs[pc.name]
+            del self.__positions[pc.name]
+
+    def update(self, pc: PC, change: ComponentChange):
+        """
+        Applies change of single component of indexed PC.
+        :param pc: changed PC
+        :param change: description of the change
+        """
+        if self.__pcs.get(pc.name) is pc:
+            if change.old_spec is not None:
+                self.__unindex_spec(pc.name, change.category, change.old_spec)
+            if change.new_spec is not None:
+                self.__index_spec(pc.name, change.category, change.new_spec)
+
+    def find(self, category: str, spec_filters: Dict[str, str]) -> List[PC]:
+        """
+        Finds PCs which have component of given category matching all given specification parameters.
+        :param category: type of component, i.e. 'gpu'
+        :param spec_filters: specification parameters which component must have, i.e. {'name': 'RTX 3070'}
+        :return: matching PCs, in order in which they were indexed
+        """
+        candidates = [self.__categories.get(category, set())]
+        candidates.extend(self.__params.get((category, param_name, param_value), set())
+                          for param_name, param_value in spec_filters.items())
+        candidates.sort(key=len)
+        names = candidates[0].intersection(*candidates[1:])
+        return [self.__pcs[name] for name in sorted(names, key=self.__positions.__getitem__)]
+
+    def __index_spec(self, name: str, category: str, spec: Spec):
+        self.__categories.setdefault(category, set()).add(name)
+
+        for param_name, param_value in spec.items():
+            self.__params.setdefault((category, param_name, param_value), set()).add(name)
+
+    def __unindex_spec(self, name: str, category: str, spec: Spec):
+        self.__discard(self.__categories, category, name)
+
+        for param_name, param_value in spec.items():
+            self.__discard(self.__params, (category, param_name, param_value), name)
+
+    @staticmethod
+    def __discard(index: Dict, key, name: str):
+        if names := index.get(key):
+            names.discard(name)
+            if not names:
+                del index[key]
@@ -0,0 +1,114 @@
+from contextlib import contextmanager
+from threading import Condition, Lock, get_ident
+from typing import Dict, Iterator, Optional
+
+
+class ReadWriteLock:
+    """
+    Lock which lets in either any number of readers or single writer.
+    Waiting writer stops new readers from entering, so writers are never starved by readers.
+    Both locks are reentrant and writer can also enter as a reader, but reader can't become a writer.
+    """
+
+    def __init__(self):
+        self.__mutex: Lock = Lock()
+        self.__condition: Condition = Condition(self.__mutex)
+        self.__readers: int = 0
+        self.__reads: Dict[int, int] = {}
+        self.__waiting_writers: int = 0
+        self.__writer: Optional[int] = None
+        self.__writes: int = 0
+
+    @contextmanager
+    def read(self) -> Iterator[None]:
+        """
+        Holds the lock as a reader.
+        """
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write(self) -> Iterator[None]:
+        """
+        Holds the lock as the only writer.
+        :raises RuntimeError: if current thread holds the lock as a reader
+        """
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+    def acquire_read(self):
+        """
+        Acquires the lock as a reader, waiting for writers if necessary.
+        """
+        thread_id = get_ident()
+
+        with self.__mutex:
+            if thread_id in self.__reads:
+                self.__reads[thread_id] += 1
+                return
+
+            if self.__writer != thread_id:
+                while self.__writer is not None or self.__waiting_writers:
+                    self.__condition.wait()
+                self.__readers += 1
+
+            self.__reads[thread_id] = 1
+
+    def release_read(self):
+        """
+        Releases the lock acquired as a reader.
+        """
+        thread_id = get_ident()
+
+        with self.__mutex:
+            if self.__reads[thread_id] > 1:
+                self.__reads[thread_id] -= 1
+                return
+
+            del self.__reads[thread_id]
+
+            if self.__writer != thread_id:
+                self.__readers -= 1
+                if not self.__readers:
+                    self.__condition.notify_all()
+
+    def acquire_write(self):
+        """
+        Acquires the lock as the only writer, waiting for readers and other writer if necessary.
+        :raises RuntimeError: if current thread holds the lock as a reader
+        """
+        thread_id = get_ident()
+
+        with self.__mutex:
+            if self.__writer == thread_id:
+                self.__writes += 1
+                return
+            if thread_id in self.__reads:
+                raise RuntimeError('Reader cannot become a writer')
+
+            self.__waiting_writers += 1
+            try:
+                while self.__writer is not None or self.__readers:
+                    self.__condition.wait()
+            finally:
+                self.__waiting_writers -= 1
+
+            self.__writer = thread_id
+            self.__writes = 1
+
+    def release_write(self):
+        """
+        Releases the lock acquired as a writer.
+        """
+        with self.__mutex:
+            self.__writes -= 1
+
+            if not self.__writes:
+                self.__writer = None
+                self.__condition.notify_all()
@@ -0,0 +1,254 @@
+from array import array
+from bisect import bisect_left
+from mmap import mmap, ACCESS_READ
+from pathlib import Path
+from struct import Struct
+from sys import byteorder
+from typing import Callable, Dict, Iterator, MutableMapping, Optional, Set, Tuple, ValuesView
+
+from pc_spec.formats import BinaryFormat
+from pc_spec.pc import PC, Components, FrozenSpec
+
+
+class PackedIntegers:
+    """ Read-only sequence of little-endian integers packed in a buffer, decoded on access. """
+
+    def __init__(self, buffer, offset: int, count: int, item_format: str = '<Q'):
+        """
+        :param buffer: object supporting buffer protocol, i.e. mmap
+        :param offset: position of the first integer in the buffer
+        :param count: number of integers
+        :param item_format: struct format of single integer
+        """
+        self.__buffer = buffer
+        self.__offset: int = offset
+        self.__count: int = count
+        self.__item: Struct = Struct(item_format)
+
+    def __len__(self) -> int:
+        return self.__count
+
+    def __getitem__(self, position: int) -> int:
+        if not 0 <= position < self.__count:
+            raise IndexError(position)
+        return self.__item.unpack_from(self.__buffer, self.__offset + position * self.__item.size)[0]
+
+
+class MappedStrings:
+    """ String table of binary store file kept in a buffer, decoded on access and cached. """
+
+    def __init__(self, buffer, offset: int):
+        """
+        :param buffer: object supporting buffer protocol, i.e. mmap
+        :param offset: position of string table (its string count) in the buffer
+        """
+        count = PackedIntegers(buffer, offset, 1, '<I')[0]
+        self.__buffer = buffer
+        self.__offsets: PackedIntegers = PackedIntegers(buffer, offset + 4, count + 1, '<I')
+        self.__blob_offset: int = offset + 4 + 4 * (count + 1)
+        self.__strings: Dict[int, str] = {}
+
+    @property
+    def end(self) -> int:
+        """
+        Gets position in the buffer right after the string table.
+        :return: end of string table
+        """
+        return self.__blob_offset + self.__offsets[len(self.__offsets) - 1]
+
+    def __len__(self) -> int:
+        return len(self.__offsets) - 1
+
+    def __getitem__(self, string_id: int) -> str:
+        if (string := self.__strings.get(string_id)) is None:
+            start = self.__blob_offset + self.__offsets[string_id]
+            end = self.__blob_offset + self.__offsets[string_id + 1]
+            string = self.__strings[string_id] = str(self.__buffer[start:end], 'utf-8')
+        return string
+
+
+class MappedPCs(MutableMapping[str, PC]):
+    """
+    PCs kept in binary store file mapped into memory, which are decoded only on first access.
+    Opening doesn't depend on size of the file, as PCs are found through the index saved in it.
+    PCs added to the mapping are kept in memory and removed ones are only hidden - the file is never modified.
+    """
+
+    __WORD = Struct('<I')
+    __FOOTER = Struct('<Q4s')
+
+    def __init__(self, buffer, on_close: Optional[Callable[[], None]] = None, read_only: bool = False):
+        """
+        :param buffer: object supporting buffer protocol which contains binary store file, i.e. mmap
+        :param on_close: callable releasing given buffer when mapping is closed
+        :param read_only: whether specifications of components should be decoded as compact FrozenSpec objects
+        :raises ValueError: if buffer doesn't contain binary store file with index
+        """
+        self.__buffer = buffer
+        self.__on_close: Optional[Callable[[], None]] = on_close
+        self.__read_only: bool = read_only
+        self.on_load: Optional[Callable[[PC], None]] = None
+
+        if len(buffer) < 8 + self.__FOOTER.size or bytes(buffer[:4]) != BinaryFormat.MAGIC or \
+                self.__read_word(4) != BinaryFormat.VERSION:
+            raise ValueError('Not a binary store file or unsupported version')
+
+        index_offset, index_magic = self.__FOOTER.unpack_from(buffer, len(buffer) - self.__FOOTER.size)
+
+        if index_magic != BinaryFormat.INDEX_MAGIC:
+            raise ValueError('Binary store file has no index')
+
+        self.__strings: MappedStrings = MappedStrings(buffer, 8)
+        self.__count: int = self.__read_word(self.__strings.end)
+        self.__records_offset: int = self.__strings.end + 4
+        self.__hashes: PackedIntegers = PackedIntegers(buffer, index_offset + 4, self.__count)
+        self.__offsets: PackedIntegers = PackedIntegers(buffer, index_offset + 4 + 8 * self.__count, self.__count)
+
+        self.__loaded: Dict[str, PC] = {}
+        self.__added: Dict[str, PC] = {}
+        self.__removed: Set[str] = set()
+
+    @classmethod
+    def open(cls, file_path: Path, read_only: bool = False) -> 'MappedPCs':
+        """
+        Maps binary store file into memory.
+        :param file_path: path to binary store file
+        :param read_only: whether specifications of components should be decoded as compact FrozenSpec objects
+        :return: mapping of PCs from given file
+        :raises ValueError: if file isn't binary store file with index
+        """
+        with open(file_path, 'rb') as binary_file:
+            file_map = mmap(binary_file.fileno(), 0, access=ACCESS_READ)
+
+        try:
+            return cls(file_map, file_map.close, read_only)
+        except ValueError:
+            file_map.close()
+            raise
+
+    @property
+    def loaded(self) -> int:
+        """
+        Gets number of PCs which were decoded from the file so far.
+        :return: number of decoded PCs
+        """
+        return len(self.__loaded)
+
+    def close(self):
+        """
+        Releases the buffer. PCs which weren't decoded yet can't be accessed afterwards.
+        """
+        if self.__on_close:
+            self.__on_close()
+            self.__on_close = None
+
+    def __getitem__(self, name: str) -> PC:
+        if (pc := self.__added.get(name, self.__loaded.get(name))) is not None:
+            return pc
+        if name in self.__removed or (offset := self.__find_record(name)) is None:
+            raise KeyError(name)
+        return self.__load(name, offset)
+
+    def __setitem__(self, name: str, pc: PC):
+        if name not in self.__added and self.__is_in_file(name):
+            self.__loaded[name] = pc
+        else:
+            self.__added[name] = pc
+
+    def __delitem__(self, name: str):
+        if name in self.__added:
+            del self.__added[name]
+        elif self.__is_in_file(name):
+            self.__removed.add(name)
+            self.__loaded.pop(name, None)
+        else:
+            raise KeyError(name)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.__added or isinstance(name, str) and self.__is_in_file(name)
+
+    def __iter__(self) -> Iterator[str]:
+        for name, _ in self.__iter_records():
+            yield name
+        yield from list(self.__added)
+
+    def __len__(self) -> int:
+        return self.__count - len(self.__removed) + len(self.__added)
+
+    def values(self) -> ValuesView[PC]:
+        return MappedValues(self)
+
+    def iter_pcs(self) -> Iterator[PC]:
+        """
+        Iterates over all PCs in order, decoding them sequentially from the file if necessary.
+        :return: iterator over PCs
+        """
+        for name, offset in self.__iter_records():
+            if (pc := self.__loaded.get(name)) is None:
+                pc = self.__load(name, offset)
+            yield pc
+        yield from list(self.__added.values())
+
+    def __is_in_file(self, name: str) -> bool:
+        return name not in self.__removed and (name in self.__loaded or self.__find_record(name) is not None)
+
+    def __iter_records(self) -> Iterator[Tuple[str, int]]:
+        offset = self.__records_offset
+
+        for _ in range(self.__count):
+            name = self.__strings[self.__read_word(offset + 4)]
+
+            if name not in self.__removed:
+                yield name, offset
+            offset += 4 + 4 * self.__read_word(offset)
+
+    def __find_record(self, name: str) -> Optional[int]:
+        name_hash = BinaryFormat.hash_name(name)
+        position = bisect_left(self.__hashes, name_hash)  # type: ignore
+
+        while position < self.__count and self.__hashes[position] == name_hash:
+            offset = self.__offsets[position]
+            if self.__strings[self.__read_word(offset + 4)] == name:
+                return offset
+            position += 1
+        return None
+
+    def __load(self, name: str, offset: int) -> PC:
+        words = array('I')
+        words.frombytes(self.__buffer[offset + 4:offset + 4 + 4 * self.__read_word(offset)])
+
+        if byteorder == 'big':
+            words.byteswap()
+
+        name, components = self.__unpack(BinaryFormat.decode_record(words, self.__strings))  # type: ignore
+
+        if self.__read_only:
+            components = {category: FrozenSpec(spec) for category, spec in components.items()}  # type: ignore
+
+        pc = PC(name, components)
+        self.__loaded[name] = pc
+
+        if self.on_load:
+            self.on_load(pc)
+        return pc
+
+    def __read_word(self, offset: int) -> int:
+        return self.__WORD.unpack_from(self.__buffer, offset)[0]
+
+    @staticmethod
+    def __unpack(serialized_pc: Dict[str, Components]) -> Tuple[str, Components]:
+        return next(iter(serialized_pc.items()))
+
+
+class MappedValues(ValuesView):
+    """ View of PCs kept in MappedPCs, which decodes them sequentially instead of looking each one up. """
+
+    def __init__(self, mapping: MappedPCs):
+        """
+        :param mapping: viewed mapping
+        """
+        super().__init__(mapping)
+        self.__mapping: MappedPCs = mapping
+
+    def __iter__(self) -> Iterator[PC]:
+        return self.__mapping.iter_pcs()
@@ -0,0 +1,252 @@
+from functools import wraps
+from inspect import iscoroutinefunction, isgeneratorfunction
+from json import dumps
+from pathlib import Path
+from threading import Lock
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+BUCKETS = 28  # pragma: no mutate
+
+
+class OperationStats:
+    """
+    Statistics of single instrumented operation.
+    Latency histogram has buckets of doubling size - bucket i counts calls which took less than 2^i microseconds,
+    and the last one counts all longer calls.
+    """
+
+    __slots__ = ('calls', 'seconds', 'min_seconds', 'max_seconds', 'buckets', 'bytes_read', 'bytes_written')
+
+    def __init__(self):
+        self.calls: int = 0
+        self.seconds: float = 0.0
+        self.min_seconds: float = float('inf')
+        self.max_seconds: float = 0.0
+        self.buckets: List[int] = [0] * BUCKETS
+        self.bytes_read: int = 0
+        self.bytes_written: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Converts statistics to form which can be serialized to JSON.
+        :return: statistics, with histogram as list of [upper bound in seconds, calls] pairs of non-empty buckets
+        """
+        return {'calls': self.calls,
+                'seconds': self.seconds,
+                'mean_seconds': self.seconds / self.calls if self.calls else 0.0,
+                'min_seconds': self.min_seconds if self.calls else 0.0,
+                'max_seconds': self.max_seconds,
+                'histogram': [[2 ** bucket / 1e6 if bucket < BUCKETS - 1 else None, calls]
+                              for bucket, calls in enumerate(self.buckets) if calls],
+                'bytes_read': self.bytes_read,
+                'bytes_written': self.bytes_written}
+
+
+class MetricsRegistry:
+    """ Collects call counts, latency histograms and numbers of transferred bytes of operations. """
+
+    def __init__(self):
+        self.__lock: Lock = Lock()
+        self.__operations: Dict[str, OperationStats] = {}
+
+    @property
+    def operations(self) -> Dict[str, OperationStats]:
+        """
+        Gets statistics of all operations recorded so far.
+        :return: statistics by operation name, i.e. 'Store.add_pc'
+        """
+        with self.__lock:
+            return dict(self.__operations)
+
+    def record(self, operation: str, seconds: float, bytes_read: int = 0, bytes_written: int = 0):
+        """
+        Records single call of given operation.
+        :param operation: name of the operation, i.e. 'Store.add_pc'
+        :param seconds: duration of the call
+        :param bytes_read: number of bytes read by the call
+        :param bytes_written: number of bytes written by the call
+        """
+        bucket = min(int(seconds * 1e6).bit_length(), BUCKETS - 1)
+
+        with self.__lock:
+            if (stats := self.__operations.get(operation)) is None:
+                stats = self.__operations[operation] = OperationStats()
+
+            stats.calls += 1
+            stats.seconds += seconds
+            stats.min_seconds = min(stats.min_seconds, seconds)
+            stats.max_seconds = max(stats.max_seconds, seconds)
+            stats.buckets[bucket] += 1
+            stats.bytes_read += bytes_read
+            stats.bytes_written += bytes_written
+
+    def reset(self):
+        """
+        Forgets all recorded statistics.
+        """
+        with self.__lock:
+            self.__operations.clear()
+
+    def to_json(self) -> str:
+        """
+        Exports recorded statistics as JSON object keyed by operation name.
+        :return: statistics in JSON format
+        """
+        return dumps({operation: stats.to_dict() for operation, stats in sorted(self.operations.items())}, indent=2)
+
+    def dump(self, file_path: Path):
+        """
+        Exports recorded statistics to JSON file.
+        :param file_path: path to file which will be created or replaced
+        """
+        file_path.write_text(self.to_json())
+
+
+__registry: Optional[MetricsRegistry] = None
+__patches: List[Tuple[Any, str, Any]] = []
+
+
+def enable(registry: Optional[MetricsRegistry] = None) -> MetricsRegistry:
+    """
+    Starts recording calls of public operations of Store, PC and pc_spec.data, and of reads and writes of store files.
+    Methods are instrumented by replacing them on their classes with timing wrappers, which are removed by disable,
+    so there is no cost of their instrumentation while it is disabled. They are looked up through classes, so they
+    are instrumented however they were imported. Functions of pc_spec.data can be imported by name, so they are
+    wrapped once when they are defined, and their wrappers only check whether instrumentation is enabled.
+    If instrumentation is already enabled then it is restarted with given registry.
+    :param registry: registry which will collect statistics, new one by default
+    :return: registry which collects statistics
+    """
+    global __registry
+    from pc_spec.data import Journal
+    from pc_spec.formats import BinaryFormat, JsonFormat
+    from pc_spec.pc import PC
+    from pc_spec.store import Store
+
+    disable()
+    __registry = registry if registry is not None else MetricsRegistry()
+
+    for owner, prefix in ((Store, 'Store'), (PC, 'PC'), (Journal, 'Journal')):
+        for name, member in list(vars(owner).items()):
+            if not name.startswith('_') and isinstance(member, staticmethod):
+                __patch(owner, name, staticmethod(timed(f'{prefix}.{name}')(member.__func__)))
+            elif not name.startswith('_') and callable(member):
+                __patch(owner, name, timed(f'{prefix}.{name}')(member))
+
+    for store_format in (JsonFormat, BinaryFormat):
+        prefix = store_format.__name__
+        __patch(store_format, 'write', __counted_write(f'{prefix}.write', store_format.write))
+        __patch(store_format, 'read', __counted_read(f'{prefix}.read', store_format.read))
+    __patch(JsonFormat, 'write_pcs', __counted_write('JsonFormat.write_pcs', JsonFormat.write_pcs))
+
+    return __registry
+
+
+def disable():
+    """
+    Stops recording calls and restores original methods.
+    If instrumentation isn't enabled then nothing will change.
+    """
+    global __registry
+
+    while __patches:
+        owner, name, original = __patches.pop()
+        setattr(owner, name, original)
+
+    __registry = None
+
+
+def get_registry() -> Optional[MetricsRegistry]:
+    """
+    Gets registry which collects statistics.
+    :return: registry, None if instrumentation is disabled
+    """
+    return __registry
+
+
+def timed(operation: str) -> Callable[[Callable], Callable]:
+    """
+    Makes decorator which records duration of every call of the function, while instrumentation is enabled.
+    Generators are timed until they are exhausted and coroutines until they return.
+    :param operation: name of the operation, i.e. 'data.save_store'
+    :return: decorator
+    """
+    def decorate(function: Callable) -> Callable:
+        if isgeneratorfunction(function):
+            @wraps(function)
+            def timed_generator(*args: Any, **kwargs: Any) -> Iterator:
+                if (registry := __registry) is None:
+                    return function(*args, **kwargs)
+                return __time_generator(operation, function(*args, **kwargs), registry)
+            return timed_generator
+
+        if iscoroutinefunction(function):
+            @wraps(function)
+            async def timed_coroutine(*args: Any, **kwargs: Any) -> Any:
+                if (registry := __registry) is None:
+                    return await function(*args, **kwargs)
+
+                started = perf_counter()
+                try:
+                    return await function(*args, **kwargs)
+                finally:
+                    registry.record(operation, perf_counter() - started)
+            return timed_coroutine
+
+        @wraps(function)
+        def timed_function(*args: Any, **kwargs: Any) -> Any:
+            if (registry := __registry) is None:
+                return function(*args, **kwargs)
+
+            started = perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                registry.record(operation, perf_counter() - started)
+        return timed_function
+    return decorate
+
+
+def __patch(owner: Any, name: str, replacement: Any):
+    __patches.append((owner, name, vars(owner)[name]))
+    setattr(owner, name, replacement)
+
+
+def __counted_write(operation: str, write: Callable) -> Callable:
+    @wraps(write)
+    def counted_write(self: Any, pcs: Any, binary_file: Any, *args: Any, **kwargs: Any):
+        if (registry := __registry) is None:
+            return write(self, pcs, binary_file, *args, **kwargs)
+
+        started, start_position = perf_counter(), binary_file.tell()
+        try:
+            write(self, pcs, binary_file, *args, **kwargs)
+        finally:
+            registry.record(operation, perf_counter() - started, bytes_written=binary_file.tell() - start_position)
+    return counted_write
+
+
+def __counted_read(operation: str, read: Callable) -> Callable:
+    @wraps(read)
+    def counted_read(self: Any, binary_file: Any, chunk_size: int) -> Iterator:
+        if (registry := __registry) is None:
+            return read(self, binary_file, chunk_size)
+        return __count_read(operation, read(self, binary_file, chunk_size), binary_file, registry)
+    return counted_read
+
+
+def __time_generator(operation: str, generator: Iterator, registry: MetricsRegistry) -> Iterator:
+    started = perf_counter()
+    try:
+        yield from generator
+    finally:
+        registry.record(operation, perf_counter() - started)
+
+
+def __count_read(operation: str, generator: Iterator, binary_file: Any, registry: MetricsRegistry) -> Iterator:
+    started, start_position = perf_counter(), binary_file.tell()
+    try:
+        yield from generator
+    finally:
+        registry.record(operation, perf_counter() - started, bytes_read=binary_file.tell() - start_position)
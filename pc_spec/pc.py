@@ -1,11 +1,65 @@
-from typing import Dict, Optional
+from functools import partial
+from typing import Callable, Dict, Iterator, Mapping, NamedTuple, Optional, Tuple
 
 Spec = Dict[str, str]  # pragma: no mutate
 Components = Dict[str, Spec]  # pragma: no mutate
 
 
+class ComponentChange(NamedTuple):
+    """ Describes single change of PC's components. """
+
+    operation: str  # 'add', 'remove', 'swap' or 'update'
+    category: str
+    old_spec: Optional[Spec]
+    new_spec: Optional[Spec]
+
+
+ComponentListener = Callable[['PC', ComponentChange], None]  # pragma: no mutate
+ComponentApply = Callable[[], Optional[ComponentChange]]  # pragma: no mutate
+ComponentGuard = Callable[['PC', ComponentApply], Optional[ComponentChange]]  # pragma: no mutate
+
+
+class FrozenSpec(Mapping[str, str]):
+    """
+    Read-only specification of component kept in tuples, which takes much less memory than a dict.
+    It is meant for read-only stores - it can't be updated, so update_component of its PC raises TypeError.
+    """
+
+    __slots__ = ('__params', '__values')
+
+    def __init__(self, spec: Mapping[str, str], params: Optional[Tuple[str, ...]] = None):
+        """
+        :param spec: specification to be frozen, i.e. {'name': 'i7-9700K', 'freq': '4 GHz'}
+        :param params: names of parameters of given spec in its order, which can be shared between specs
+        """
+        self.__params: Tuple[str, ...] = params if params is not None else tuple(spec)
+        self.__values: Tuple[str, ...] = tuple(spec.values())
+
+    def __getitem__(self, param_name: str) -> str:
+        for position, name in enumerate(self.__params):
+            if name == param_name:
+                return self.__values[position]
+        raise KeyError(param_name)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.__params)
+
+    def __len__(self) -> int:
+        return len(self.__params)
+
+    def __repr__(self) -> str:
+        return f'FrozenSpec({dict(self)!r})'
+
+
 class PC:
-    """ Represents computer build. """
+    """
+    Represents computer build.
+    Components are changed by copying - every change replaces dict of components and changed specification
+    with new ones, so dicts got from the PC before the change keep its previous state and can be read
+    while the PC is changed. Components shouldn't be changed other than by methods of the PC.
+    """
+
+    __slots__ = ('__name', '__components', '__listeners', '__guards', '__version')
 
     def __init__(self, name: str, components: Optional[Components] = None):
         """
@@ -14,6 +68,9 @@ class PC:
         """
         self.__name: str = name
         self.__components: Components = components if components else {}
+        self.__listeners: Tuple[ComponentListener, ...] = ()
+        self.__guards: Tuple[ComponentGuard, ...] = ()
+        self.__version: int = 0
 
     @property
     def name(self) -> str:
@@ -27,10 +84,57 @@ class PC:
     def components(self) -> Components:
         """
         Gets component parts of the PC.
-        :return: PC's components
+        :return: PC's components, which are replaced by every change - they have to be got again after the change
         """
         return self.__components
 
+    @property
+    def version(self) -> int:
+        """
+        Gets number of changes of PC's components made so far.
+        :return: PC's version, which grows with every change
+        """
+        return self.__version
+
+    def subscribe(self, listener: ComponentListener):
+        """
+        Registers listener which will be called after every change of PC's components.
+        If given listener is already registered then nothing will change.
+        :param listener: callable which receives changed PC and description of the change
+        """
+        if listener not in self.__listeners:
+            self.__listeners += (listener,)
+
+    def unsubscribe(self, listener: ComponentListener):
+        """
+        Unregisters listener of PC's components changes.
+        If given listener isn't registered then nothing will change.
+        :param listener: previously registered listener
+        """
+        if listener in self.__listeners:
+            self.__listeners = tuple(registered for registered in self.__listeners if registered != listener)
+
+    def add_guard(self, guard: ComponentGuard):
+        """
+        Registers guard which will make every change of PC's components, i.e. to do something before the change
+        or to make it while holding a lock. Guard receives the PC and callable which makes the change,
+        and has to call it once and return its result - description of the change, None if nothing changed.
+        Guards are called before listeners are notified.
+        If given guard is already registered then nothing will change.
+        :param guard: callable which makes changes of the PC
+        """
+        if guard not in self.__guards:
+            self.__guards += (guard,)
+
+    def remove_guard(self, guard: ComponentGuard):
+        """
+        Unregisters guard of PC's components changes.
+        If given guard isn't registered then nothing will change.
+        :param guard: previously registered guard
+        """
+        if guard in self.__guards:
+            self.__guards = tuple(registered for registered in self.__guards if registered != guard)
+
     def add_component(self, category: str, spec: Optional[Spec] = None):
         """
         Adds new component to the PC.
@@ -39,8 +143,7 @@ class PC:
         :param spec: specification of component to be added, i.e. {'name': 'i7-9700K', 'freq': '4 GHz'};
                      defaults to None (empty specification, results in empty dict)
         """
-        if not self.__component_exists(category):
-            self.__components[category] = spec if spec else {}
+        self.__change('add', category, lambda _: spec if spec else {})
 
     def remove_component(self, category: str):
         """
@@ -48,8 +151,7 @@ class PC:
         If component with given category doesn't exist then nothing will change.
         :param category: type of component to be removed, i.e. 'cpu'
         """
-        if self.__component_exists(category):
-            del self.__components[category]
+        self.__change('remove', category, lambda _: None)
 
     def swap_component(self, category: str, spec: Optional[Spec] = None):
         """
@@ -59,8 +161,7 @@ class PC:
         :param spec: component's specification which will replace old one, i.e. {'name': 'i7-9700K', 'freq': '4 GHz'};
                      defaults to None (empty specification, results in empty dict)
         """
-        if self.__component_exists(category):
-            self.__components[category] = spec if spec else {}
+        self.__change('swap', category, lambda _: spec if spec else {})
 
     def update_component(self, category: str, param_name: str, param_value: str):
         """
@@ -71,9 +172,42 @@ class PC:
         :param category: type of component which specification will be updated, i.e. 'cpu'
         :param param_name: name of specification's parameter which will be updated, i.e. 'freq'
         :param param_value: value of specification's parameter which will replace old one, i.e. '4 GHz'
+        :raises TypeError: if specification of the component is FrozenSpec
         """
-        if self.__component_exists(category):
-            self.__components[category][param_name] = param_value
+        self.__change('update', category, partial(self.__update_spec, param_name=param_name, param_value=param_value))
+
+    def __change(self, operation: str, category: str, make_spec: Callable[[Spec], Optional[Spec]]):
+        apply = partial(self.__apply, operation, category, make_spec)
+
+        for guard in reversed(self.__guards):
+            apply = partial(guard, self, apply)
+
+        if (change := apply()) is not None:
+            for listener in self.__listeners:
+                listener(self, change)
+
+    def __apply(self, operation: str, category: str, make_spec: Callable[[Spec], Optional[Spec]]) \
+            -> Optional[ComponentChange]:
+        if ((old_spec := self.__components.get(category)) is None) != (operation == 'add'):
+            return None
+
+        new_spec = make_spec(old_spec)  # type: ignore
+        components = dict(self.__components)
+
+        if new_spec is None:
+            del components[category]
+        else:
+            components[category] = new_spec
+
+        self.__components = components
+        self.__version += 1
+        return ComponentChange(operation, category, old_spec, new_spec)
+
+    @staticmethod
+    def __update_spec(spec: Spec, param_name: str, param_value: str) -> Spec:
+        if isinstance(spec, FrozenSpec):
+            raise TypeError(f'FrozenSpec can not be updated, got parameter: {param_name}')
 
-    def __component_exists(self, category: str) -> bool:
-        return category in self.__components.keys()
+        updated_spec = dict(spec)
+        updated_spec[param_name] = param_value
+        return updated_spec
@@ -0,0 +1,218 @@
+from bisect import bisect_left
+from collections import Counter
+from heapq import nsmallest
+from math import ceil
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set
+
+from pc_spec.pc import PC, ComponentChange, Spec
+from pc_spec.store import StoreChange
+
+GRAM_SIZE = 3  # pragma: no mutate
+
+
+class Match(NamedTuple):
+    """ Term found by fuzzy search. """
+
+    term: str  # PC's name or value of specification's parameter, as it was first indexed
+    score: float  # similarity to the query, from 0 (nothing in common) to 1 (the same trigrams)
+
+
+class SearchIndex:
+    """
+    Index of names of PCs and values of their specifications, which supports prefix and fuzzy search.
+    Terms are matched case-insensitively. Prefix search bisects sorted terms, which work as a compact trie,
+    and fuzzy search ranks terms by trigrams they share with the query.
+    New terms are merged into sorted ones only before the next prefix search, so building the index sorts terms once.
+    Index is kept up to date incrementally when it is subscribed to the store, i.e. store.subscribe(index.apply).
+    """
+
+    def __init__(self, pcs: Optional[Iterable[PC]] = None):
+        """
+        :param pcs: PCs to be indexed
+        """
+        self.__pcs: Dict[str, PC] = {}
+        self.__positions: Dict[str, int] = {}
+        self.__next_position: int = 0
+        self.__terms: Dict[str, Dict[str, int]] = {}
+        self.__display_terms: Dict[str, str] = {}
+        self.__sorted_terms: List[str] = []
+        self.__new_terms: Set[str] = set()
+        self.__grams: Dict[str, Set[str]] = {}
+        self.__gram_counts: Dict[str, int] = {}
+
+        for pc in pcs if pcs else []:
+            self.add(pc)
+
+    def __len__(self) -> int:
+        return len(self.__terms)
+
+    def add(self, pc: PC):
+        """
+        Adds name of given PC and values of its specifications to the index.
+        If PC with same name is already indexed then nothing will change.
+        :param pc: PC to be indexed
+        """
+        if pc.name not in self.__pcs:
+            self.__pcs[pc.name] = pc
+            self.__positions[pc.name] = self.__next_position
+            self.__next_position += 1
+            self.__add_term(pc.name, pc.name)
+
+            for spec in pc.components.values():
+                self.__index_spec(pc.name, spec)
+
+    def remove(self, pc: PC):
+        """
+        Removes name of given PC and values of its specifications from the index.
+        If given PC isn't indexed then nothing will change.
+        :param pc: PC to be removed from the index
+        """
+        if self.__pcs.get(pc.name) is pc:
+            self.__remove_term(pc.name, pc.name)
+
+            for spec in pc.components.values():
+                self.__unindex_spec(pc.name, spec)
+
+            del self.__pcs[pc.name]
+            del self.__positions[pc.name]
+
+    def update(self, pc: PC, change: ComponentChange):
+        """
+        Applies change of single component of indexed PC.
+        :param pc: changed PC
+        :param change: description of the change
+        """
+        if self.__pcs.get(pc.name) is pc:
+            if change.old_spec is not None:
+                self.__unindex_spec(pc.name, change.old_spec)
+            if change.new_spec is not None:
+                self.__index_spec(pc.name, change.new_spec)
+
+    def apply(self, change: StoreChange):
+        """
+        Applies given change of the store, so the index can follow the store when subscribed to it.
+        :param change: description of the change
+        """
+        if change.operation == 'add_pc':
+            self.add(change.pc)
+        elif change.operation == 'remove_pc':
+            self.remove(change.pc)
+        elif change.component_change is not None:
+            self.update(change.pc, change.component_change)
+
+    def complete(self, prefix: str, limit: int = 10) -> List[str]:
+        """
+        Finds terms starting with given prefix, i.e. for autocompletion.
+        :param prefix: beginning of the term
+        :param limit: maximal number of found terms
+        :return: terms, as they were first indexed, in alphabetical order
+        """
+        key, sorted_terms = prefix.casefold(), self.__sort_terms()
+        position = bisect_left(sorted_terms, key)
+        found: List[str] = []
+
+        while position < len(sorted_terms) and len(found) < limit and sorted_terms[position].startswith(key):
+            found.append(self.__display_terms[sorted_terms[position]])
+            position += 1
+
+        return found
+
+    def search(self, query: str, limit: int = 10, min_score: float = 0.3) -> List[Match]:
+        """
+        Finds terms similar to given query, tolerating typos and different order of words.
+        Similarity is the Jaccard index of sets of trigrams of the query and of the term.
+        Term which is similar enough has to share some of the rarest trigrams of the query, so only terms having them
+        are considered, and trigrams shared by most of the terms (i.e. common prefix of names) don't slow search down.
+        :param query: searched text
+        :param limit: maximal number of found terms
+        :param min_score: minimal similarity of found terms, higher one makes search faster
+        :return: terms from the most similar one, alphabetically if equally similar
+        """
+        query_grams = self.__to_grams(query.casefold())
+        postings = sorted((self.__grams.get(gram, set()) for gram in query_grams), key=len)
+        candidate_count = len(postings) - max(ceil(min_score * len(postings)), 1) + 1
+        shared: Counter = Counter()
+
+        for terms in postings[:candidate_count]:
+            shared.update(terms)
+        candidates = set(shared)
+
+        for terms in postings[candidate_count:]:
+            shared.update(candidates & terms)
+
+        gram_counts = self.__gram_counts
+        scored = ((common / (len(query_grams) + gram_counts[term] - common), term) for term, common in shared.items())
+        best = nsmallest(limit, ((-score, term) for score, term in scored if score >= min_score))
+        return [Match(self.__display_terms[term], -score) for score, term in best]
+
+    def find(self, term: str) -> List[PC]:
+        """
+        Finds PCs which have given name or value of specification.
+        :param term: searched term, i.e. one found by complete or search
+        :return: matching PCs, in order in which they were indexed
+        """
+        names = self.__terms.get(term.casefold(), {})
+        return [self.__pcs[name] for name in sorted(names, key=self.__positions.__getitem__)]
+
+    def __index_spec(self, name: str, spec: Spec):
+        for value in spec.values():
+            self.__add_term(value, name)
+
+    def __unindex_spec(self, name: str, spec: Spec):
+        for value in spec.values():
+            self.__remove_term(value, name)
+
+    def __add_term(self, term: str, name: str):
+        key = term.casefold()
+
+        if (names := self.__terms.get(key)) is None:
+            names = self.__terms[key] = {}
+            self.__display_terms[key] = term
+            self.__new_terms.add(key)
+            grams = self.__to_grams(key)
+            self.__gram_counts[key] = len(grams)
+
+            for gram in grams:
+                self.__grams.setdefault(gram, set()).add(key)
+
+        names[name] = names.get(name, 0) + 1
+
+    def __remove_term(self, term: str, name: str):
+        key = term.casefold()
+
+        if not (names := self.__terms.get(key)) or name not in names:
+            return
+        if names[name] > 1:
+            names[name] -= 1
+            return
+
+        del names[name]
+
+        if not names:
+            del self.__terms[key]
+            del self.__display_terms[key]
+            del self.__gram_counts[key]
+
+            if key in self.__new_terms:
+                self.__new_terms.remove(key)
+            else:
+                del self.__sorted_terms[bisect_left(self.__sorted_terms, key)]
+
+            for gram in self.__to_grams(key):
+                terms = self.__grams[gram]
+                terms.discard(key)
+                if not terms:
+                    del self.__grams[gram]
+
+    def __sort_terms(self) -> List[str]:
+        if self.__new_terms:
+            # sorting appended terms merges them with already sorted run in linear time
+            self.__sorted_terms.extend(sorted(self.__new_terms))
+            self.__sorted_terms.sort()
+            self.__new_terms.clear()
+        return self.__sorted_terms
+
+    @staticmethod
+    def __to_grams(key: str) -> Set[str]:
+        padded = f'  {key} '
+        return {padded[start:start + GRAM_SIZE] for start in range(len(padded) - GRAM_SIZE + 1)}
@@ -0,0 +1,133 @@
+from concurrent.futures import ProcessPoolExecutor
+from json import dumps, loads
+from os import fsync, replace
+from pathlib import Path
+from shutil import rmtree
+from typing import Dict, List, Optional
+
+from pc_spec.data import iter_store, save_store
+from pc_spec.formats import BinaryFormat, SerializedPC
+from pc_spec.pc import PC
+from pc_spec.store import Store
+
+MANIFEST_FILE_NAME = 'shards.json'  # pragma: no mutate
+
+
+def save_sharded_store(store: Store, target_dir: Path, shards: int = 8, workers: Optional[int] = None,
+                       format: str = 'json', force: bool = False) -> List[int]:
+    """
+    Saves given store to several shard directories created in given directory, i.e. 'shard-3-of-8/store.json'.
+    PCs are partitioned between shards by hash of their names and shards are saved in parallel by worker processes.
+    If the store was last saved to or loaded from given directory then only shards which contain PCs changed
+    since then are rewritten, unless given directory doesn't contain the same number of shards yet.
+    Shards are listed in manifest file which is replaced only after all shards were saved,
+    so crash during saving leaves previous shards readable.
+    :param store: collection of PCs to be saved
+    :param target_dir: path to directory where shard directories will be created
+    :param shards: number of shards
+    :param workers: maximal number of worker processes, defaults to number of processors
+    :param format: name of format of shard files, 'json' or 'binary'
+    :param force: whether all shards should be written even if they weren't changed
+    :return: numbers of rewritten shards
+    :raises ValueError: if number of shards isn't positive or format is unknown
+    """
+    if shards < 1:
+        raise ValueError(f'Number of shards must be positive, got: {shards}')
+
+    previous_shards = __read_manifest(target_dir)
+    target = __get_target(target_dir)
+
+    if force or previous_shards != shards or store.clean_target != target:
+        dirty_shards = set(range(shards))
+    else:
+        changes = store.changes
+        dirty_shards = {get_shard(name, shards) for name in [pc.name for pc in changes.changed] + changes.removed}
+
+    partitions: Dict[int, List[SerializedPC]] = {shard: [] for shard in sorted(dirty_shards)}
+
+    for pc in store.pcs:
+        if (partition := partitions.get(get_shard(pc.name, shards))) is not None:
+            partition.append({pc.name: pc.components})
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for future in [executor.submit(__save_shard, partition, __get_shard_path(target_dir, shard, shards), format)
+                       for shard, partition in partitions.items()]:
+            future.result()
+
+    __write_manifest(target_dir, shards)
+
+    if previous_shards and previous_shards != shards:
+        for shard in range(previous_shards):
+            rmtree(__get_shard_path(target_dir, shard, previous_shards), ignore_errors=True)
+
+    store.mark_clean(target=target)
+    return list(partitions)
+
+
+def load_sharded_store(source_dir: Path, workers: Optional[int] = None, read_only: bool = False) -> Store:
+    """
+    Loads store from shard directories saved in given directory.
+    Shards are parsed in parallel by worker processes.
+    PCs are ordered by shards, PCs from the same shard are kept in order in which they were added.
+    If given directory doesn't contain manifest of shards then empty store is loaded.
+    :param source_dir: path to directory which contains shard directories
+    :param workers: maximal number of worker processes, defaults to number of processors
+    :param read_only: whether specifications of components should be loaded as compact FrozenSpec objects
+    :return: loaded store
+    :raises ValueError: if any shard file is malformed (JSONDecodeError for JSON files)
+    """
+    store = Store()
+
+    if shards := __read_manifest(source_dir):
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for future in [executor.submit(__load_shard, __get_shard_path(source_dir, shard, shards), read_only)
+                           for shard in range(shards)]:
+                store.add_pcs(future.result())
+
+    store.mark_clean(target=__get_target(source_dir))
+    return store
+
+
+def get_shard(name: str, shards: int) -> int:
+    """
+    Gets shard which PC with given name belongs to, which is stable between processes.
+    :param name: name of the PC
+    :param shards: number of shards
+    :return: number of the shard, from 0 to shards - 1
+    """
+    return BinaryFormat.hash_name(name) % shards
+
+
+def __save_shard(serialized_pcs: List[SerializedPC], shard_path: Path, format: str):
+    pcs = [PC(name, components) for serialized_pc in serialized_pcs for name, components in serialized_pc.items()]
+    save_store(Store(pcs), shard_path, format=format, force=True)
+
+
+def __load_shard(shard_path: Path, read_only: bool) -> List[PC]:
+    return list(iter_store(shard_path, read_only=read_only))
+
+
+def __get_shard_path(dir_path: Path, shard: int, shards: int) -> Path:
+    return Path(dir_path, f'shard-{shard}-of-{shards}')
+
+
+def __get_target(dir_path: Path) -> str:
+    return str(Path(dir_path, MANIFEST_FILE_NAME).resolve())
+
+
+def __read_manifest(dir_path: Path) -> int:
+    if (manifest_path := Path(dir_path, MANIFEST_FILE_NAME)).is_file():
+        return loads(manifest_path.read_text())['shards']
+    return 0
+
+
+def __write_manifest(dir_path: Path, shards: int):
+    manifest_path = Path(dir_path, MANIFEST_FILE_NAME)
+    temp_manifest_path = manifest_path.with_name(f'.{MANIFEST_FILE_NAME}.tmp')
+
+    with open(temp_manifest_path, 'w') as manifest_file:
+        manifest_file.write(dumps({'shards': shards}))
+        manifest_file.flush()
+        fsync(manifest_file.fileno())
+
+    replace(temp_manifest_path, manifest_path)
@@ -0,0 +1,85 @@
+from io import BytesIO
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from os import name as os_name
+from struct import Struct
+from sys import version_info
+from typing import Optional, Union, cast
+
+from pc_spec.formats import get_format
+from pc_spec.mapped import MappedPCs
+from pc_spec.store import Store, StoreSnapshot
+
+__HEADER = Struct('<Q')
+
+
+def save_shared_store(store: Union[Store, StoreSnapshot], name: Optional[str] = None) -> SharedMemory:
+    """
+    Copies given store to new shared memory segment, so other processes can attach it with load_shared_store
+    instead of parsing store file.
+    Segment contains size of the data followed by binary store file, including the index of PCs.
+    Segment exists until it is unlinked - call segment.close() and segment.unlink() when no process attaches it anymore.
+    :param store: collection of PCs to be shared
+    :param name: name of created segment, random by default
+    :return: created segment, its name has to be passed to other processes
+    :raises FileExistsError: if segment with given name already exists
+    """
+    binary_file = BytesIO()
+    get_format('binary').write([{pc.name: pc.components} for pc in store.pcs], binary_file)
+
+    with binary_file.getbuffer() as data:
+        segment = SharedMemory(name=name, create=True, size=__HEADER.size + len(data))
+        buffer = cast(memoryview, segment.buf)
+        __HEADER.pack_into(buffer, 0, len(data))
+        buffer[__HEADER.size:__HEADER.size + len(data)] = data
+
+    return segment
+
+
+def load_shared_store(name: str) -> Store:
+    """
+    Attaches store saved in shared memory segment by save_shared_store, in this or another process.
+    Nothing is copied or parsed while attaching, so it takes the same time regardless of store size,
+    and memory of the segment is shared by all attached processes.
+    Each PC is decoded from the segment only on first access, with specifications as compact FrozenSpec objects.
+    PCs added to the store are kept only in this process and removed ones are only hidden,
+    the segment is never modified.
+    Call store.close() to detach from the segment, PCs which weren't decoded yet can't be accessed afterwards.
+    :param name: name of the segment
+    :return: attached store
+    :raises FileNotFoundError: if segment with given name doesn't exist
+    :raises ValueError: if segment doesn't contain store saved by save_shared_store
+    """
+    segment = __attach_segment(name)
+    buffer = cast(memoryview, segment.buf)
+
+    if len(buffer) < __HEADER.size:
+        segment.close()
+        raise ValueError(f'Shared memory segment does not contain store: {name}')
+
+    data = buffer[__HEADER.size:__HEADER.size + __HEADER.unpack_from(buffer)[0]]
+
+    def detach():
+        data.release()
+        segment.close()
+
+    try:
+        return Store(mapping=MappedPCs(data, detach, read_only=True))
+    except ValueError:
+        detach()
+        raise
+
+
+def __attach_segment(name: str) -> SharedMemory:
+    if version_info >= (3, 13):
+        return SharedMemory(name=name, track=False)  # type: ignore
+
+    # Before Python 3.13 attaching registers segment in resource tracker, which unlinks it when processes using
+    # the tracker exit. Processes started by creator of the segment share its tracker, so registering again is harmless,
+    # but unrelated process would start its own tracker, which would unlink segment still used by others
+    has_tracker = getattr(resource_tracker._resource_tracker, '_fd', None) is not None
+    segment = SharedMemory(name=name)
+
+    if os_name == 'posix' and not has_tracker:
+        resource_tracker.unregister(segment._name, 'shared_memory')  # type: ignore
+    return segment
@@ -0,0 +1,283 @@
+from pathlib import Path
+from sqlite3 import Connection, connect
+from typing import Iterator, List, Optional, Sequence, Tuple, Union
+
+from pc_spec.pc import PC, Components, Spec
+from pc_spec.store import Store, StoreChange, StoreChanges, StoreSnapshot
+
+DATABASE_FILE_NAME = 'store.sqlite'  # pragma: no mutate
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS pcs (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS components (
+    id INTEGER PRIMARY KEY,
+    pc_id INTEGER NOT NULL REFERENCES pcs (id) ON DELETE CASCADE,
+    category TEXT NOT NULL,
+    UNIQUE (pc_id, category)
+);
+CREATE INDEX IF NOT EXISTS components_category ON components (category);
+CREATE TABLE IF NOT EXISTS params (
+    component_id INTEGER NOT NULL REFERENCES components (id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    value TEXT NOT NULL,
+    UNIQUE (component_id, name)
+);
+'''  # pragma: no mutate
+
+
+class SqliteDatabase:
+    """
+    SQLite database of PCs, which can read and write single PC or component without loading whole store.
+    PCs, their components and specification parameters are kept in separate tables, indexed by name and category.
+    Database runs in WAL mode, so readers don't wait for writers.
+    Writes are batched in transactions, which are committed after given number of writes or on commit.
+    """
+
+    def __init__(self, file_path: Path, batch_size: Optional[int] = 1000):
+        """
+        :param file_path: path to database file, which is created if it doesn't exist
+        :param batch_size: number of writes after which transaction is committed, None to commit only on commit
+        """
+        self.__connection: Connection = connect(str(file_path), check_same_thread=False)
+        self.__batch_size: Optional[int] = batch_size
+        self.__writes: int = 0
+
+        self.__connection.execute('PRAGMA journal_mode = WAL')
+        self.__connection.execute('PRAGMA synchronous = NORMAL')
+        self.__connection.execute('PRAGMA foreign_keys = ON')
+        self.__connection.executescript(SCHEMA)
+
+    def __enter__(self) -> 'SqliteDatabase':
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    @property
+    def names(self) -> List[str]:
+        """
+        Gets names of all PCs from the database.
+        :return: names of PCs, in order in which they were added
+        """
+        return [name for name, in self.__connection.execute('SELECT name FROM pcs ORDER BY id')]
+
+    def get_pc(self, name: str) -> Optional[PC]:
+        """
+        Reads single PC from the database.
+        :param name: name of PC to be read
+        :return: PC with given name, None if not found
+        """
+        rows = self.__connection.execute(
+            'SELECT pcs.name, components.category, params.name, params.value FROM pcs '
+            'LEFT JOIN components ON components.pc_id = pcs.id LEFT JOIN params ON params.component_id = components.id '
+            'WHERE pcs.name = ? ORDER BY components.id, params.rowid', (name,))
+        return next(self.__to_pcs(rows), None)
+
+    def iter_pcs(self) -> Iterator[PC]:
+        """
+        Reads all PCs from the database one by one.
+        :return: iterator over PCs, in order in which they were added
+        """
+        rows = self.__connection.execute(
+            'SELECT pcs.name, components.category, params.name, params.value FROM pcs '
+            'LEFT JOIN components ON components.pc_id = pcs.id LEFT JOIN params ON params.component_id = components.id '
+            'ORDER BY pcs.id, components.id, params.rowid')
+        return self.__to_pcs(rows)
+
+    def find_names(self, category: str) -> List[str]:
+        """
+        Finds PCs which have component of given category, using index of categories.
+        :param category: type of component, i.e. 'gpu'
+        :return: names of matching PCs, in order in which they were added
+        """
+        return [name for name, in self.__connection.execute(
+            'SELECT pcs.name FROM components JOIN pcs ON pcs.id = components.pc_id '
+            'WHERE components.category = ? ORDER BY pcs.id', (category,))]
+
+    def put_pc(self, pc: PC):
+        """
+        Writes PC to the database, replacing components of PC with same name if it already exists.
+        :param pc: PC to be written
+        """
+        self.__execute('INSERT INTO pcs (name) VALUES (?) ON CONFLICT (name) DO NOTHING', (pc.name,))
+        self.__execute('DELETE FROM components WHERE pc_id = (SELECT id FROM pcs WHERE name = ?)', (pc.name,))
+
+        for category, spec in pc.components.items():
+            self.put_component(pc.name, category, spec)
+
+    def delete_pc(self, name: str):
+        """
+        Deletes PC from the database.
+        If PC with given name doesn't exist then nothing will change.
+        :param name: name of PC to be deleted
+        """
+        self.__execute('DELETE FROM pcs WHERE name = ?', (name,))
+
+    def clear(self):
+        """
+        Deletes all PCs from the database, together with their components.
+        """
+        self.__execute('DELETE FROM pcs', ())
+
+    def put_component(self, name: str, category: str, spec: Spec):
+        """
+        Writes component of PC to the database, replacing specification of component of same category if it exists.
+        If PC with given name doesn't exist then nothing will change.
+        :param name: name of the PC
+        :param category: type of component, i.e. 'cpu'
+        :param spec: specification of component, i.e. {'name': 'i7-9700K', 'freq': '4 GHz'}
+        """
+        self.__execute('INSERT INTO components (pc_id, category) SELECT id, ? FROM pcs WHERE name = ? '
+                       'ON CONFLICT (pc_id, category) DO NOTHING', (category, name))
+        component_id = self.__find_component(name, category)
+
+        if component_id is not None:
+            self.__execute('DELETE FROM params WHERE component_id = ?', (component_id,))
+            self.__executemany('INSERT INTO params (component_id, name, value) VALUES (?, ?, ?)',
+                               [(component_id, param_name, param_value) for param_name, param_value in spec.items()])
+
+    def delete_component(self, name: str, category: str):
+        """
+        Deletes component of PC from the database.
+        If PC or its component doesn't exist then nothing will change.
+        :param name: name of the PC
+        :param category: type of component, i.e. 'cpu'
+        """
+        self.__execute('DELETE FROM components WHERE pc_id = (SELECT id FROM pcs WHERE name = ?) AND category = ?',
+                       (name, category))
+
+    def update_component(self, name: str, category: str, param_name: str, param_value: str):
+        """
+        Writes single parameter of component's specification to the database.
+        If PC or its component doesn't exist then nothing will change.
+        :param name: name of the PC
+        :param category: type of component, i.e. 'cpu'
+        :param param_name: name of specification's parameter, i.e. 'freq'
+        :param param_value: value of specification's parameter, i.e. '4 GHz'
+        """
+        if (component_id := self.__find_component(name, category)) is not None:
+            self.__execute('INSERT INTO params (component_id, name, value) VALUES (?, ?, ?) '
+                           'ON CONFLICT (component_id, name) DO UPDATE SET value = excluded.value',
+                           (component_id, param_name, param_value))
+
+    def apply(self, change: StoreChange):
+        """
+        Writes given change of the store to the database, so it can mirror the store when subscribed to it.
+        :param change: description of the change
+        """
+        if change.operation == 'add_pc':
+            self.put_pc(change.pc)
+        elif change.operation == 'remove_pc':
+            self.delete_pc(change.pc.name)
+        elif component_change := change.component_change:
+            if component_change.new_spec is None:
+                self.delete_component(change.pc.name, component_change.category)
+            else:
+                self.put_component(change.pc.name, component_change.category, component_change.new_spec)
+
+    def commit(self):
+        """
+        Commits pending writes.
+        """
+        self.__connection.commit()
+        self.__writes = 0
+
+    def close(self):
+        """
+        Commits pending writes and closes the database.
+        """
+        self.commit()
+        self.__connection.close()
+
+    def __find_component(self, name: str, category: str) -> Optional[int]:
+        row = self.__connection.execute('SELECT components.id FROM components JOIN pcs ON pcs.id = components.pc_id '
+                                        'WHERE pcs.name = ? AND components.category = ?', (name, category)).fetchone()
+        return row[0] if row else None
+
+    def __execute(self, statement: str, params: Tuple):
+        self.__connection.execute(statement, params)
+        self.__count_write()
+
+    def __executemany(self, statement: str, params: List[Tuple]):
+        self.__connection.executemany(statement, params)
+        self.__count_write()
+
+    def __count_write(self):
+        self.__writes += 1
+
+        if self.__batch_size is not None and self.__writes >= self.__batch_size:
+            self.commit()
+
+    @staticmethod
+    def __to_pcs(rows: Iterator[Tuple[str, Optional[str], Optional[str], Optional[str]]]) -> Iterator[PC]:
+        name: Optional[str] = None
+        components: Components = {}
+
+        for pc_name, category, param_name, param_value in rows:
+            if pc_name != name:
+                if name is not None:
+                    yield PC(name, components)
+                name, components = pc_name, {}
+            if category is not None:
+                spec = components.setdefault(category, {})
+                if param_name is not None:
+                    spec[param_name] = param_value  # type: ignore
+
+        if name is not None:
+            yield PC(name, components)
+
+
+def save_sqlite_store(store: Union[Store, StoreSnapshot], target_dir: Path, force: bool = False) -> StoreChanges:
+    """
+    Saves given store to SQLite database created in given directory ('store.sqlite') in single transaction.
+    If the store was last saved to or loaded from the same database then only PCs changed since then are written,
+    unless saving is forced.
+    Otherwise database is cleared and all PCs are written again, so they are kept in order of the store.
+    If given directory doesn't exist then it is created (together with all missing parent directories).
+    :param store: collection of PCs to be saved, or its snapshot
+    :param target_dir: path to directory where database will be created
+    :param force: whether all PCs should be written even if the store was saved to or loaded from the same database
+    :return: PCs changed since the store was last saved or loaded
+    """
+    file_path = Path(target_dir, DATABASE_FILE_NAME)
+    target = str(file_path.resolve())
+    changes = store.changes
+    incremental = file_path.is_file() and not force and store.clean_target == target
+    target_dir.mkdir(parents=True, exist_ok=True)
+
+    with SqliteDatabase(file_path, batch_size=None) as database:
+        changed_pcs: Sequence[PC]
+
+        if incremental:
+            changed_pcs = changes.changed
+            for name in changes.removed:
+                database.delete_pc(name)
+        else:
+            changed_pcs = store.pcs
+            database.clear()
+
+        for pc in changed_pcs:
+            database.put_pc(pc)
+
+    store.mark_clean(target=target)
+    return changes
+
+
+def load_sqlite_store(source_dir: Path) -> Store:
+    """
+    Loads store from SQLite database saved in given directory.
+    If database doesn't exist then empty store is loaded.
+    :param source_dir: path to directory which contains database
+    :return: loaded store
+    """
+    store = Store()
+
+    if (file_path := Path(source_dir, DATABASE_FILE_NAME)).is_file():
+        with SqliteDatabase(file_path) as database:
+            store.add_pcs(database.iter_pcs())
+
+    store.mark_clean(target=str(file_path.resolve()))
+    return store
@@ -1,24 +1,316 @@
-from typing import List, Optional
+from functools import wraps
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, MutableMapping, NamedTuple, Optional, \
+    Sequence, Union, overload
+from weakref import ReferenceType, ref
 
-from pc_spec.pc import PC
+from pc_spec.cached import CacheStats
+from pc_spec.index import ComponentIndex
+from pc_spec.locks import ReadWriteLock
+from pc_spec.pc import PC, ComponentApply, ComponentChange
+
+
+class StoreChange(NamedTuple):
+    """ Describes single change of store's content. """
+
+    operation: str  # 'add_pc', 'remove_pc' or 'change_component'
+    pc: PC
+    component_change: Optional[ComponentChange] = None
+
+
+StoreListener = Callable[[StoreChange], None]  # pragma: no mutate
+
+
+class AddResult(NamedTuple):
+    """ Outcome of adding many PCs to the store at once. """
+
+    added: List[str]
+    duplicates: List[str]
+
+
+class RemoveResult(NamedTuple):
+    """ Outcome of removing many PCs from the store at once. """
+
+    removed: List[str]
+    not_found: List[str]
+
+
+class StoreChanges(NamedTuple):
+    """ PCs changed since the store was last marked as clean. """
+
+    changed: List[PC]
+    removed: List[str]
+
+
+class SnapshotPCs(Sequence[PC]):
+    """ PCs of the snapshot, which are resolved one by one when they are got, i.e. while they are iterated. """
+
+    def __init__(self, pcs: List[PC], resolve: Callable[[PC], PC]):
+        """
+        :param pcs: PCs of the store at the moment the snapshot was taken
+        :param resolve: callable getting PC's state from the moment the snapshot was taken
+        """
+        self.__pcs: List[PC] = pcs
+        self.__resolve: Callable[[PC], PC] = resolve
+
+    @overload
+    def __getitem__(self, position: int) -> PC: ...
+
+    @overload
+    def __getitem__(self, position: slice) -> List[PC]: ...
+
+    def __getitem__(self, position: Union[int, slice]) -> Union[PC, List[PC]]:
+        if isinstance(position, slice):
+            return list(map(self.__resolve, self.__pcs[position]))
+        return self.__resolve(self.__pcs[position])
+
+    def __iter__(self) -> Iterator[PC]:
+        return map(self.__resolve, self.__pcs)
+
+    def __len__(self) -> int:
+        return len(self.__pcs)
+
+
+class StoreSnapshot:
+    """
+    Immutable view of the store's content at the moment it was taken.
+    Snapshot shares components with the store's PCs, which are never changed in place, and keeps previous components
+    of PCs which are changed or removed from the store afterwards, right before they are changed.
+    PCs got from the snapshot are its own objects, which keep the state from the moment the snapshot was taken
+    and can be read while the store is changed, i.e. by another thread. They shouldn't be changed.
+    """
+
+    def __init__(self, pcs: Mapping[str, PC], version: int, changes: StoreChanges, clean_target: Optional[str],
+                 mark_clean: Callable[[int, Optional[str]], None]):
+        """
+        :param pcs: PCs of the store by their names, which won't be changed anymore
+        :param version: version of the store
+        :param changes: changes of the store since it was last marked as clean
+        :param clean_target: target which the store was last saved to or loaded from
+        :param mark_clean: callable marking the store as clean with given target if it is still in given version
+        """
+        self.__pcs: Mapping[str, PC] = pcs
+        self.__version: int = version
+        self.__changes: StoreChanges = changes
+        self.__clean_target: Optional[str] = clean_target
+        self.__mark_clean: Callable[[int, Optional[str]], None] = mark_clean
+        self.__originals: Dict[str, PC] = {}
+
+    @property
+    def pcs(self) -> SnapshotPCs:
+        """
+        Gets all PCs from the snapshot.
+        :return: PCs, in order in which they were added to the store, resolved when they are got
+        """
+        return SnapshotPCs(list(self.__pcs.values()), self.__resolve)
+
+    @property
+    def version(self) -> int:
+        """
+        Gets version of the store at the moment the snapshot was taken.
+        :return: store's version
+        """
+        return self.__version
+
+    @property
+    def is_dirty(self) -> bool:
+        """
+        Checks whether the store had unsaved changes at the moment the snapshot was taken.
+        :return: True if there were unsaved changes, False otherwise
+        """
+        return bool(self.__changes.changed or self.__changes.removed)
+
+    @property
+    def changes(self) -> StoreChanges:
+        """
+        Gets PCs changed since the store was last marked as clean, until the snapshot was taken.
+        :return: added or changed PCs and names of removed PCs
+        """
+        return self.__changes
+
+    @property
+    def clean_target(self) -> Optional[str]:
+        """
+        Gets target which the store was last saved to or loaded from, until the snapshot was taken.
+        :return: target which has no changes reported by the snapshot, i.e. resolved path of store file
+        """
+        return self.__clean_target
+
+    def get_pc(self, name: str) -> Optional[PC]:
+        """
+        Gets PC from the snapshot.
+        :param name: name of PC to be searched
+        :return: PC with given name, None if not found
+        """
+        return self.__resolve(pc) if (pc := self.__pcs.get(name)) is not None else None
+
+    def mark_clean(self, target: Optional[str] = None):
+        """
+        Marks the store as clean, i.e. after the snapshot was saved, unless the store was changed in the meantime.
+        :param target: target which the snapshot was saved to, i.e. resolved path of store file
+        """
+        self.__mark_clean(self.__version, target)
+
+    def preserve(self, pc: PC):
+        """
+        Keeps PC's current components, so the snapshot doesn't see its later changes.
+        It is called by the store right before PC is changed or removed.
+        Nothing is copied, as components are replaced rather than changed in place.
+        :param pc: PC which is going to be changed or removed
+        """
+        if pc.name not in self.__originals and self.__pcs.get(pc.name) is pc:
+            self.__originals[pc.name] = PC(pc.name, pc.components)
+
+    def __resolve(self, pc: PC) -> PC:
+        # Components are read before preserved ones are checked - PC is always preserved before it is changed,
+        # so if it isn't preserved yet then components weren't changed since the snapshot was taken
+        components = pc.components
+        return original if (original := self.__originals.get(pc.name)) is not None else PC(pc.name, components)
 
 
 class Store:
     """ Represents collection of PCs. """
 
-    def __init__(self, pcs: Optional[List[PC]] = None):
+    def __init__(self, pcs: Optional[Iterable[PC]] = None, mapping: Optional[MutableMapping[str, PC]] = None,
+                 concurrent: bool = False):
         """
-        :param pcs: collection of PCs which will be stored
+        :param pcs: collection of PCs which will be stored;
+                    if several PCs share the same name then only the first one is stored
+        :param mapping: container keeping PCs by their names in insertion order, defaults to dict;
+                        if it loads PCs lazily then it should call its 'on_load' attribute with every loaded PC,
+                        if it has 'mark_clean' method then it's called with every target the store is marked clean with
+                        and with whether the store still has unsaved changes, if it has 'stats' and 'resident'
+                        attributes then they are reported by the store as counters of its cache
+        :param concurrent: whether the store can be used by many threads at once - readers don't block each other,
+                           while changes of the store and of its PCs are made one at a time;
+                           if given mapping loads PCs lazily then reads are made one at a time too
         """
-        self.__pcs: List[PC] = pcs if pcs else []
+        self.__pcs: MutableMapping[str, PC] = mapping if mapping is not None else {}
+        self.__index: Optional[ComponentIndex] = None
+        self.__listeners: List[StoreListener] = []
+        self.__version: int = 0
+        self.__changed: Dict[str, None] = {}
+        self.__removed: Dict[str, None] = {}
+        self.__clean_target: Optional[str] = None
+        self.__snapshots: List[ReferenceType] = []
+        self.__is_shared: bool = False
+
+        if hasattr(self.__pcs, 'on_load'):
+            self.__pcs.on_load = self.__attach  # type: ignore
+
+        if concurrent:
+            self.__lock_methods(ReadWriteLock())
+
+        self.add_pcs(pcs if pcs else [])
 
     @property
     def pcs(self) -> List[PC]:
         """
         Gets all PCs from the store.
-        :return: store's PCs
+        :return: store's PCs, in order in which they were added
+        """
+        return self.__list_pcs()
+
+    @property
+    def version(self) -> int:
+        """
+        Gets number of changes of the store made so far, including changes of components of stored PCs.
+        :return: store's version, which grows with every change
+        """
+        return self.__version
+
+    @property
+    def cache_stats(self) -> Optional[CacheStats]:
+        """
+        Gets counters of the store's mapping, if it keeps only recently used PCs in memory, i.e. of cached store.
+        :return: numbers of hits, misses, evictions and write backs, None if mapping doesn't count them
+        """
+        return self.__pcs.stats if hasattr(self.__pcs, 'stats') else None  # type: ignore
+
+    @property
+    def resident_pcs(self) -> Optional[int]:
+        """
+        Gets number of PCs kept in memory by the store's mapping, if it keeps only recently used PCs in memory.
+        :return: number of PCs kept in memory, None if mapping doesn't count them
+        """
+        return self.__pcs.resident if hasattr(self.__pcs, 'resident') else None  # type: ignore
+
+    @property
+    def is_dirty(self) -> bool:
+        """
+        Checks whether the store was changed since it was last marked as clean.
+        :return: True if there are unsaved changes, False otherwise
+        """
+        return bool(self.__changed or self.__removed)
+
+    @property
+    def changes(self) -> StoreChanges:
         """
-        return self.__pcs
+        Gets PCs changed since the store was last marked as clean.
+        :return: added or changed PCs which are still in the store and names of removed PCs,
+                 in order in which they were first changed
+        """
+        return self.__list_changes()
+
+    @property
+    def clean_target(self) -> Optional[str]:
+        """
+        Gets target which the store was last saved to or loaded from, so changes reported by the store are relative
+        to it only - saving the store anywhere else requires writing all PCs.
+        :return: target given when the store was last marked as clean, i.e. resolved path of store file
+        """
+        return self.__clean_target
+
+    def mark_clean(self, version: Optional[int] = None, target: Optional[str] = None):
+        """
+        Forgets changes made so far, i.e. after they were saved.
+        :param version: version of the store which was saved; if the store was changed since then nothing will change
+        :param target: target which the store was saved to or loaded from, i.e. resolved path of store file;
+                       None if it isn't known; the store's mapping is told about it even if the store was changed
+        """
+        if version is None or version == self.__version:
+            self.__changed.clear()
+            self.__removed.clear()
+            self.__clean_target = target
+
+        if hasattr(self.__pcs, 'mark_clean'):
+            self.__pcs.mark_clean(target, bool(self.__changed or self.__removed))  # type: ignore
+
+    def snapshot(self) -> StoreSnapshot:
+        """
+        Takes immutable view of the store's current content, i.e. to save or report it while the store is changed.
+        Taking snapshot doesn't copy anything, PCs are copied only when they are changed afterwards.
+        If mapping of the store loads PCs lazily then they are all loaded.
+        :return: snapshot of the store
+        """
+        if type(self.__pcs) is dict:
+            pcs: Mapping[str, PC] = self.__pcs
+            self.__is_shared = True
+        else:
+            pcs = dict(self.__pcs.items())
+
+        snapshot = StoreSnapshot(pcs, self.__version, self.__collect_changes(pcs), self.__clean_target, self.mark_clean)
+        self.__snapshots = [snapshot_ref for snapshot_ref in self.__snapshots if snapshot_ref() is not None]
+        self.__snapshots.append(ref(snapshot))
+        return snapshot
+
+    def subscribe(self, listener: StoreListener):
+        """
+        Registers listener which will be called after every change of the store,
+        including changes of components of stored PCs.
+        If given listener is already registered then nothing will change.
+        :param listener: callable which receives description of the change
+        """
+        if listener not in self.__listeners:
+            self.__listeners.append(listener)
+
+    def unsubscribe(self, listener: StoreListener):
+        """
+        Unregisters listener of store's changes.
+        If given listener isn't registered then nothing will change.
+        :param listener: previously registered listener
+        """
+        if listener in self.__listeners:
+            self.__listeners.remove(listener)
 
     def add_pc(self, pc: PC):
         """
@@ -26,8 +318,21 @@ class Store:
         If PC with same name already exists then nothing will change.
         :param pc: PC to be added
         """
-        if not self.__search_pc(pc.name):
-            self.__pcs.append(pc)
+        self.__add(pc)
+
+    def add_pcs(self, pcs: Iterable[PC]) -> AddResult:
+        """
+        Adds many new PCs to the store in single pass.
+        PCs with names which already exist in the store (or earlier in given PCs) are skipped.
+        :param pcs: PCs to be added
+        :return: names of added PCs and names of skipped duplicates
+        """
+        result = AddResult([], [])
+
+        for pc in pcs:
+            (result.added if self.__add(pc) else result.duplicates).append(pc.name)
+
+        return result
 
     def get_pc(self, name: str) -> Optional[PC]:
         """
@@ -36,7 +341,16 @@ class Store:
         :param name: name of PC to be searched
         :return: PC with given name, None if not found
         """
-        return self.__search_pc(name)
+        return self.__pcs.get(name)
+
+    def get_pcs(self, names: Iterable[str]) -> List[Optional[PC]]:
+        """
+        Gets many PCs from the store at once.
+        :param names: names of PCs to be searched
+        :return: PCs in order of given names, None for each name which wasn't found
+        """
+        get = self.__pcs.get
+        return [get(name) for name in names]
 
     def remove_pc(self, name: str):
         """
@@ -44,11 +358,167 @@ class Store:
         If PC with given name doesn't exist then nothing will change.
         :param name: name of PC to be removed
         """
-        if pc := self.__search_pc(name):
-            self.__pcs.remove(pc)
+        if name in self.__pcs:
+            self.__unshare()
+            self.__detach(self.__pcs.pop(name))
+
+    def remove_pcs(self, names: Iterable[str]) -> RemoveResult:
+        """
+        Removes many PCs from the store at once.
+        When large part of the store is removed, the store is rebuilt once instead of removing PCs one by one.
+        :param names: names of PCs to be removed
+        :return: names of removed PCs and names which weren't found (or were given more than once)
+        """
+        result = RemoveResult([], [])
+        removed_pcs = {}
+
+        for name in names:
+            if name not in removed_pcs and (pc := self.__pcs.get(name)) is not None:
+                removed_pcs[name] = pc
+                result.removed.append(name)
+            else:
+                result.not_found.append(name)
+
+        if type(self.__pcs) is dict and len(removed_pcs) > len(self.__pcs) // 4:
+            self.__pcs = {name: pc for name, pc in self.__pcs.items() if name not in removed_pcs}
+            self.__is_shared = False
+        elif removed_pcs:
+            self.__unshare()
+            for name in removed_pcs:
+                del self.__pcs[name]
+
+        for pc in removed_pcs.values():
+            self.__detach(pc)
+
+        return result
+
+    def close(self):
+        """
+        Releases resources held by the store's mapping, if it has any,
+        i.e. writes changed PCs back to cache database or unmaps binary store file.
+        """
+        if hasattr(self.__pcs, 'close'):
+            self.__pcs.close()  # type: ignore
+
+    def find_by_component(self, category: str, /, **spec_filters: str) -> List[PC]:
+        """
+        Finds PCs which have component of given category with all given specification parameters.
+        Index used for searching is built on first call and kept up to date afterwards.
+        :param category: type of component, i.e. 'gpu'
+        :param spec_filters: specification parameters which component must have, i.e. name='Nvidia RTX 3070'
+        :return: matching PCs, in order in which they were added
+        """
+        if self.__index is None:
+            self.__index = ComponentIndex(self.__pcs.values())
+        return self.__index.find(category, spec_filters)
+
+    def __add(self, pc: PC) -> bool:
+        if pc.name in self.__pcs:
+            return False
+
+        self.__unshare()
+        self.__pcs[pc.name] = pc
+        self.__attach(pc)
+        self.__mark_changed(pc)
+        self.__notify(StoreChange('add_pc', pc))
+        return True
+
+    def __attach(self, pc: PC):
+        pc.add_guard(self.__guard_component_change)
+
+        if self.__index is not None:
+            self.__index.add(pc)
+
+    def __detach(self, pc: PC):
+        pc.remove_guard(self.__guard_component_change)
+
+        if self.__snapshots:
+            self.__preserve(pc)
+
+        if self.__index is not None:
+            self.__index.remove(pc)
+
+        self.__version += 1
+        self.__changed.pop(pc.name, None)
+        self.__removed[pc.name] = None
+        self.__notify(StoreChange('remove_pc', pc))
+
+    def __guard_component_change(self, pc: PC, apply: ComponentApply) -> Optional[ComponentChange]:
+        if self.__snapshots:
+            self.__preserve(pc)
+
+        if (change := apply()) is not None:
+            if self.__index is not None:
+                self.__index.update(pc, change)
+
+            self.__mark_changed(pc)
+            self.__notify(StoreChange('change_component', pc, change))
+        return change
+
+    def __list_pcs(self) -> List[PC]:
+        return list(self.__pcs.values())
+
+    def __list_changes(self) -> StoreChanges:
+        return self.__collect_changes(self.__pcs)
+
+    def __collect_changes(self, pcs: Mapping[str, PC]) -> StoreChanges:
+        # only names of changed PCs are kept, so PCs which mapping evicted from memory aren't held until next save
+        return StoreChanges([pcs[name] for name in self.__changed], list(self.__removed))
+
+    def __preserve(self, pc: PC):
+        alive_snapshot_refs = []
+
+        for snapshot_ref in self.__snapshots:
+            if (snapshot := snapshot_ref()) is not None:
+                snapshot.preserve(pc)
+                alive_snapshot_refs.append(snapshot_ref)
+
+        self.__snapshots = alive_snapshot_refs
+
+    def __unshare(self):
+        if self.__is_shared:
+            self.__pcs = dict(self.__pcs)
+            self.__is_shared = False
+
+    def __lock_methods(self, lock: ReadWriteLock):
+        read = (lock.acquire_write, lock.release_write) if hasattr(self.__pcs, 'on_load') else \
+            (lock.acquire_read, lock.release_read)
+        write = (lock.acquire_write, lock.release_write)
+        self.__list_pcs = self.__locked(self.__list_pcs, *read)  # type: ignore
+        self.__list_changes = self.__locked(self.__list_changes, *read)  # type: ignore
+        self.__guard_component_change = self.__locked(self.__guard_component_change, *write)  # type: ignore
+
+        for method_name in ('get_pc', 'get_pcs', 'find_by_component'):
+            setattr(self, method_name, self.__locked(self.__get_class_method(method_name), *read))
+        for method_name in ('add_pc', 'add_pcs', 'remove_pc', 'remove_pcs', 'subscribe', 'unsubscribe',
+                            'mark_clean', 'snapshot'):
+            setattr(self, method_name, self.__locked(self.__get_class_method(method_name), *write))
+
+    def __get_class_method(self, name: str) -> Callable:
+        # method is looked up through the class on every call, so it can be replaced later, i.e. by instrumentation
+        owner = type(self)
+
+        @wraps(getattr(owner, name))
+        def method(*args: Any, **kwargs: Any) -> Any:
+            return getattr(owner, name)(self, *args, **kwargs)
+        return method
+
+    @staticmethod
+    def __locked(method: Callable, acquire: Callable[[], None], release: Callable[[], None]) -> Callable:
+        @wraps(method)
+        def locked(*args: Any, **kwargs: Any) -> Any:
+            acquire()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                release()
+        return locked
+
+    def __mark_changed(self, pc: PC):
+        self.__version += 1
+        self.__removed.pop(pc.name, None)
+        self.__changed[pc.name] = None
 
-    def __search_pc(self, name: str) -> Optional[PC]:
-        for pc in self.__pcs:
-            if pc.name == name:
-                return pc
-        return None
+    def __notify(self, change: StoreChange):
+        for listener in list(self.__listeners):
+            listener(change)
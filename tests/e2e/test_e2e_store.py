@@ -138,3 +138,23 @@ def test_saving_and_loading_store(test_dir_path, remove_test_dir):
     for pc_id, loaded_pc in enumerate(loaded_store.pcs):
         assert loaded_pc.name == store.pcs[pc_id].name
         assert loaded_pc.components == store.pcs[pc_id].components
+
+
+def test_saving_and_loading_store_in_binary_format(test_dir_path, remove_test_dir):
+    store = Store(pcs=[PC(name='gaming rig',
+                          components={'cpu': {'name': 'i7-9700K'},
+                                      'gpu': {'name': 'RTX 3070'}}),
+                       PC(name='workstation',
+                          components={'cpu': {'name': 'i7-9700K'},
+                                      'mobo': {'name': 'ASRock Z390 EXTREME4',
+                                               'format': 'ATX'}})])
+
+    save_store(store=store, target_dir=test_dir_path, format='binary')
+    loaded_store = load_store(source_dir=test_dir_path)
+
+    assert [(pc.name, pc.components) for pc in loaded_store.pcs] == [(pc.name, pc.components) for pc in store.pcs]
+
+    save_store(store=loaded_store, target_dir=test_dir_path)
+    loaded_store = load_store(source_dir=test_dir_path, format='json')
+
+    assert [(pc.name, pc.components) for pc in loaded_store.pcs] == [(pc.name, pc.components) for pc in store.pcs]
@@ -0,0 +1,127 @@
+from json import loads
+
+from pytest import fixture, raises
+
+from pc_spec.cached import CachedPCs, CacheStats
+from pc_spec.pc import PC
+from pc_spec.store import Store
+
+
+@fixture
+def storage():
+    return {f'pc_{pc_id}': CachedPCs.encode_pc(pc_id, {'cpu': {'id': str(pc_id)}}) for pc_id in reversed(range(10))}
+
+
+@fixture
+def cached_pcs(storage):
+    return CachedPCs(storage, capacity=3)
+
+
+def test_new_cached_pcs_has_nothing_in_memory_and_keeps_order(cached_pcs):
+    assert list(cached_pcs) == [f'pc_{pc_id}' for pc_id in range(10)]
+    assert cached_pcs.resident == 0
+    assert cached_pcs.stats == CacheStats(hits=0, misses=0, evictions=0, write_backs=0)
+
+
+def test_new_cached_pcs_when_capacity_is_not_positive_then_error_is_raised(storage):
+    with raises(ValueError):
+        CachedPCs(storage, capacity=0)
+
+
+def test_getitem_when_pc_is_accessed_twice_then_it_is_hit(cached_pcs):
+    pc = cached_pcs['pc_4']
+    assert cached_pcs['pc_4'] is pc
+    assert pc.components == {'cpu': {'id': '4'}}
+    assert cached_pcs.stats == CacheStats(hits=1, misses=1, evictions=0, write_backs=0)
+
+
+def test_getitem_when_pc_is_not_there_then_error_is_raised(cached_pcs):
+    with raises(KeyError):
+        cached_pcs['pc_10']
+
+
+def test_getitem_when_capacity_is_exceeded_then_least_recently_used_pc_is_evicted(cached_pcs):
+    pc_0 = cached_pcs['pc_0']
+    cached_pcs['pc_1']
+    cached_pcs['pc_2']
+    cached_pcs['pc_0']
+    cached_pcs['pc_3']
+
+    assert cached_pcs.resident == 3
+    assert cached_pcs['pc_0'] is pc_0
+    assert cached_pcs.stats == CacheStats(hits=2, misses=4, evictions=1, write_backs=0)
+
+
+def test_getitem_when_changed_pc_is_evicted_then_it_is_written_back(cached_pcs, storage):
+    cached_pcs['pc_0'].add_component(category='gpu')
+
+    for pc_id in range(1, 4):
+        cached_pcs[f'pc_{pc_id}']
+
+    assert loads(storage['pc_0']) == [0, {'cpu': {'id': '0'}, 'gpu': {}}]
+    assert cached_pcs['pc_0'].components == {'cpu': {'id': '0'}, 'gpu': {}}
+    assert cached_pcs.stats.write_backs == 1
+
+
+def test_getitem_when_byte_budget_is_exceeded_then_pcs_are_evicted(storage):
+    cached_pcs = CachedPCs(storage, max_bytes=2 * len(storage['pc_0']))
+
+    for pc_id in range(5):
+        cached_pcs[f'pc_{pc_id}']
+
+    assert cached_pcs.resident == 2
+    assert cached_pcs.stats.evictions == 3
+
+
+def test_setitem_when_pc_is_added_then_it_is_written_on_flush(cached_pcs, storage):
+    cached_pcs['pc_10'] = PC('pc_10', {'ram': {}})
+    assert 'pc_10' not in storage
+
+    cached_pcs.flush()
+    assert loads(storage['pc_10']) == [10, {'ram': {}}]
+    assert list(cached_pcs)[-1] == 'pc_10'
+
+
+def test_delitem_when_pc_is_removed_then_it_is_removed_from_storage(cached_pcs, storage):
+    cached_pcs['pc_5']
+    del cached_pcs['pc_5']
+
+    assert 'pc_5' not in cached_pcs
+    assert 'pc_5' not in storage
+    assert len(cached_pcs) == 9
+
+
+def test_store_when_backed_by_cached_pcs_then_loaded_pcs_are_tracked(storage):
+    cached_pcs = CachedPCs(storage, capacity=2)
+    store = Store(mapping=cached_pcs)
+
+    store.get_pc('pc_7').update_component(category='cpu', param_name='freq', param_value='4 GHz')
+    assert [pc.name for pc in store.changes.changed] == ['pc_7']
+    assert [pc.name for pc in store.find_by_component('cpu', freq='4 GHz')] == ['pc_7']
+    assert cached_pcs.resident == 2
+
+    store.remove_pc('pc_8')
+    store.close()
+    assert 'pc_8' not in storage
+    assert len(CachedPCs(storage)) == 9
+    assert loads(storage['pc_7'])[1] == {'cpu': {'id': '7', 'freq': '4 GHz'}}
+
+
+def test_new_cached_pcs_when_storage_is_filled_then_pcs_are_not_decoded_to_get_their_order():
+    storage = {}
+    CachedPCs.fill(storage, [PC('pc_1', {'cpu': {}}), PC('pc_0'), PC('pc_1')])
+    storage['pc_1'] = 'malformed'
+
+    assert list(CachedPCs(storage)) == ['pc_1', 'pc_0']
+    assert CachedPCs(storage)['pc_0'].components == {}
+
+
+def test_flush_when_pcs_are_added_and_removed_then_their_order_is_written_again(cached_pcs, storage):
+    cached_pcs.flush()
+    cached_pcs['pc_10'] = PC('pc_10')
+    del cached_pcs['pc_0']
+    assert CachedPCs(storage)['pc_9']
+
+    cached_pcs.flush()
+    storage['pc_9'] = 'malformed'
+    assert list(CachedPCs(storage)) == [f'pc_{pc_id}' for pc_id in range(1, 11)]
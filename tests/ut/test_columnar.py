@@ -0,0 +1,78 @@
+from array import array
+from sys import modules
+
+from pytest import fixture, importorskip
+
+from pc_spec.columnar import MISSING, to_columns
+from pc_spec.pc import PC
+from pc_spec.store import Store
+
+
+@fixture
+def store():
+    return Store(pcs=[PC(name='gaming', components={'cpu': {'name': 'i7-9700K', 'freq': '3.6 GHz'},
+                                                    'gpu': {'name': 'RTX 3070'}}),
+                      PC(name='office', components={'cpu': {'name': 'i3-10100'}, 'ram': {}}),
+                      PC(name='server', components={'cpu': {'name': 'i7-9700K'}}),
+                      PC(name='empty')])
+
+
+@fixture
+def columns(store):
+    return to_columns(store.pcs)
+
+
+def test_to_columns_when_pcs_are_exported_then_columns_are_dictionary_coded(columns):
+    assert columns.names == ['gaming', 'office', 'server', 'empty']
+    assert columns.categories == ['cpu', 'gpu', 'ram']
+    assert columns.params == ['name', 'freq']
+    assert columns.values == ['i7-9700K', '3.6 GHz', 'RTX 3070', 'i3-10100']
+    assert columns.name_codes == array('i', [0, 0, 0, 1, 1, 2, 3])
+    assert columns.category_codes == array('i', [0, 0, 1, 0, 2, 0, MISSING])
+    assert columns.param_codes == array('i', [0, 1, 0, 0, MISSING, 0, MISSING])
+    assert columns.value_codes == array('i', [0, 1, 2, 3, MISSING, 0, MISSING])
+
+
+def test_to_columns_when_there_are_no_pcs_then_columns_are_empty():
+    columns = to_columns([])
+    assert columns.names == []
+    assert len(columns.name_codes) == 0
+
+
+def test_count_pcs_by_category_when_called_then_pcs_are_counted(columns):
+    assert columns.count_pcs_by_category() == {'cpu': 3, 'gpu': 1, 'ram': 1}
+
+
+def test_count_pcs_by_value_when_called_then_pcs_are_counted_from_most_common(columns):
+    assert columns.count_pcs_by_value('cpu', 'name') == {'i7-9700K': 2, 'i3-10100': 1}
+    assert columns.count_pcs_by_value('gpu', 'freq') == {}
+    assert columns.count_pcs_by_value('hdd', 'name') == {}
+
+
+def test_count_pcs_when_numpy_is_not_installed_then_pcs_are_counted_the_same(columns, monkeypatch):
+    monkeypatch.setitem(modules, 'numpy', None)
+
+    assert columns.count_pcs_by_category() == {'cpu': 3, 'gpu': 1, 'ram': 1}
+    assert columns.count_pcs_by_value('cpu', 'name') == {'i7-9700K': 2, 'i3-10100': 1}
+    assert columns.count_pcs_by_value('gpu', 'freq') == {}
+
+
+def test_count_pcs_by_value_when_values_are_equally_common_then_they_are_in_order_they_were_first_found(
+        monkeypatch):
+    columns = to_columns([PC(name='office', components={'gpu': {'name': 'RTX 3070'}, 'cpu': {'name': 'i3-10100'}}),
+                          PC(name='gaming', components={'cpu': {'name': 'i7-9700K'}, 'gpu': {'name': 'i3-10100'}}),
+                          PC(name='server', components={'cpu': {'name': 'RTX 3070'}})])
+    expected = {'RTX 3070': 1, 'i3-10100': 1, 'i7-9700K': 1}
+    assert list(columns.count_pcs_by_value('cpu', 'name').items()) == list(expected.items())
+
+    monkeypatch.setitem(modules, 'numpy', None)
+    assert list(columns.count_pcs_by_value('cpu', 'name').items()) == list(expected.items())
+
+
+def test_to_numpy_when_numpy_is_installed_then_arrays_share_memory_with_columns(columns):
+    importorskip('numpy')
+    arrays = columns.to_numpy()
+
+    assert arrays['value'].tolist() == [0, 1, 2, 3, MISSING, 0, MISSING]
+    columns.value_codes[0] = 3
+    assert arrays['value'][0] == 3
@@ -1,11 +1,19 @@
-from json import load, dump
+from asyncio import gather, run, sleep
+from json import load, dump, dumps, JSONDecodeError
+from os import umask
 from pathlib import Path
 from shutil import rmtree
+from stat import S_IMODE
 from unittest.mock import Mock
 
-from pytest import fixture
+from pytest import fixture, mark, raises
 
-from pc_spec.data import save_store, load_store
+from pc_spec.cached import CacheStats
+from pc_spec.data import save_store, load_store, iter_store, convert_store_file, Journal, InvalidPC, \
+    async_save_store, async_load_store, async_load_stores, open_cached_store
+from pc_spec.formats import EncodedPCCache
+from pc_spec.pc import PC, FrozenSpec
+from pc_spec.store import Store, StoreChanges
 
 
 @fixture
@@ -118,6 +126,291 @@ def test_save_store_when_saving_to_same_file_then_file_is_overridden(
     __assert_json_file_contains(content=empty_store.pcs, file_path=test_file_path)
 
 
+def test_save_store_when_saved_then_no_temp_files_are_left(
+        store, test_dir_path, test_file_path, create_test_dir, remove_test_dir):
+    save_store(store=store, target_dir=test_dir_path)
+    assert list(test_dir_path.iterdir()) == [test_file_path]
+
+
+def test_save_store_when_store_file_is_replaced_then_its_permissions_are_kept(
+        store, test_dir_path, test_file_path, create_test_file, remove_test_dir):
+    test_file_path.chmod(0o640)
+    save_store(store=store, target_dir=test_dir_path, force=True)
+    assert S_IMODE(test_file_path.stat().st_mode) == 0o640
+
+
+def test_save_store_when_store_file_is_created_then_it_has_permissions_allowed_by_umask(
+        store, test_dir_path, test_file_path, create_test_dir, remove_test_dir):
+    mask = umask(0o027)
+
+    try:
+        save_store(store=store, target_dir=test_dir_path)
+    finally:
+        umask(mask)
+
+    assert S_IMODE(test_file_path.stat().st_mode) == 0o640
+
+
+def test_save_store_when_saving_fails_then_previous_file_is_kept(
+        store, test_dir_path, test_file_path, create_test_file, remove_test_dir):
+    content = test_file_path.read_text()
+    store.pcs[0].components = {'cpu': object()}
+
+    with raises(TypeError):
+        save_store(store=store, target_dir=test_dir_path)
+
+    assert test_file_path.read_text() == content
+    assert list(test_dir_path.iterdir()) == [test_file_path]
+
+
+def test_save_store_when_backups_requested_then_previous_generations_are_kept(
+        empty_store, store, test_dir_path, test_file_path, remove_test_dir):
+    save_store(store=store, target_dir=test_dir_path, backups=2)
+    save_store(store=empty_store, target_dir=test_dir_path, backups=2)
+    save_store(store=store, target_dir=test_dir_path, backups=2)
+    save_store(store=empty_store, target_dir=test_dir_path, backups=2)
+
+    content = [{store.pcs[0].name: store.pcs[0].components},
+               {store.pcs[1].name: store.pcs[1].components}]
+    __assert_json_file_contains(content=[], file_path=test_file_path)
+    __assert_json_file_contains(content=content, file_path=Path(test_dir_path, 'store.json.1'))
+    __assert_json_file_contains(content=[], file_path=Path(test_dir_path, 'store.json.2'))
+    assert not Path(test_dir_path, 'store.json.3').exists()
+
+
+def test_save_store_when_binary_format_requested_then_binary_file_is_saved(
+        store, test_dir_path, remove_test_dir):
+    save_store(store=store, target_dir=test_dir_path, format='binary')
+    assert Path(test_dir_path, 'store.pcsb').read_bytes().startswith(b'PCSB')
+
+
+def test_save_store_when_saved_in_other_format_then_previous_store_file_is_removed(
+        store, test_dir_path, test_file_path, create_test_file, remove_test_dir):
+    save_store(store=store, target_dir=test_dir_path, format='binary')
+    assert not test_file_path.exists()
+
+
+def test_save_store_when_store_not_changed_then_file_is_not_rewritten(
+        test_dir_path, test_file_path, pc_1_name, pc_1_components, remove_test_dir):
+    pc = PC(name=pc_1_name, components=pc_1_components)
+    store = Store(pcs=[pc])
+    assert save_store(store=store, target_dir=test_dir_path) == StoreChanges(changed=[pc], removed=[])
+
+    test_file_path.write_text('[]')
+    assert save_store(store=store, target_dir=test_dir_path) == StoreChanges(changed=[], removed=[])
+    assert test_file_path.read_text() == '[]'
+
+    save_store(store=store, target_dir=test_dir_path, force=True)
+    __assert_json_file_contains(content=[{pc_1_name: pc_1_components}], file_path=test_file_path)
+
+
+def test_save_store_when_clean_store_comes_from_other_place_then_file_is_overridden(
+        test_dir_path, test_file_path, pc_1_name, pc_1_components, pc_2_name, remove_test_dir):
+    save_store(store=Store(pcs=[PC(name=pc_1_name, components=pc_1_components)]), target_dir=test_dir_path)
+    save_store(store=Store(), target_dir=test_dir_path)
+    __assert_json_file_contains(content=[], file_path=test_file_path)
+
+    other_dir_path = Path(test_dir_path, 'other')
+    save_store(store=Store(pcs=[PC(name=pc_2_name)]), target_dir=other_dir_path)
+    loaded_store = load_store(source_dir=other_dir_path)
+    assert not loaded_store.is_dirty
+    save_store(store=loaded_store, target_dir=test_dir_path)
+    __assert_json_file_contains(content=[{pc_2_name: {}}], file_path=test_file_path)
+
+
+def test_save_store_when_pc_changed_then_it_is_reported_and_saved(
+        test_dir_path, test_file_path, pc_1_name, pc_1_components, pc_2_name, remove_test_dir):
+    save_store(store=Store(pcs=[PC(name=pc_1_name, components=pc_1_components), PC(name=pc_2_name)]),
+               target_dir=test_dir_path)
+    store = load_store(source_dir=test_dir_path)
+    assert not store.is_dirty
+
+    store.get_pc(pc_1_name).remove_component(category='gpu')
+    store.remove_pc(pc_2_name)
+    assert save_store(store=store, target_dir=test_dir_path) == StoreChanges(changed=[store.get_pc(pc_1_name)],
+                                                                             removed=[pc_2_name])
+    __assert_json_file_contains(content=[{pc_1_name: {'cpu': {'name': 'i7-9700K'}}}], file_path=test_file_path)
+
+
+def test_save_store_when_cache_is_given_then_only_changed_pcs_are_encoded(
+        test_dir_path, test_file_path, pc_1_name, pc_1_components, pc_2_name, remove_test_dir):
+    cache = EncodedPCCache()
+    store = Store(pcs=[PC(name=pc_1_name, components=pc_1_components), PC(name=pc_2_name)])
+    save_store(store=store, target_dir=test_dir_path, cache=cache)
+
+    store.get_pc(pc_2_name).add_component(category='ram')
+    save_store(store=store, target_dir=test_dir_path, cache=cache)
+
+    assert cache.stats.hits == 1
+    __assert_json_file_contains(content=[{pc_1_name: pc_1_components}, {pc_2_name: {'ram': {}}}],
+                                file_path=test_file_path)
+
+
+def test_save_store_when_cache_is_given_for_binary_format_then_error_is_raised(empty_store, test_dir_path):
+    with raises(ValueError):
+        save_store(store=empty_store, target_dir=test_dir_path, format='binary', cache=EncodedPCCache())
+
+
+def test_save_store_when_store_file_is_not_there_then_clean_store_is_saved(
+        test_dir_path, test_file_path, pc_1_name, remove_test_dir):
+    store = Store(pcs=[PC(name=pc_1_name)])
+    store.mark_clean()
+    save_store(store=store, target_dir=test_dir_path)
+    __assert_json_file_contains(content=[{pc_1_name: {}}], file_path=test_file_path)
+
+
+def test_save_store_when_format_is_unknown_then_error_is_raised(store, test_dir_path):
+    with raises(ValueError):
+        save_store(store=store, target_dir=test_dir_path, format='xml')
+
+
+def test_load_store_when_binary_file_is_there_then_store_is_loaded(
+        store, test_dir_path, pc_1_name, pc_1_components, pc_2_name, pc_2_components, remove_test_dir):
+    save_store(store=store, target_dir=test_dir_path, format='binary')
+
+    for format in (None, 'binary'):
+        loaded_store = load_store(source_dir=test_dir_path, format=format)
+        assert [(pc.name, pc.components) for pc in loaded_store.pcs] == [
+            (pc_1_name, pc_1_components), (pc_2_name, pc_2_components)]
+
+
+def test_load_store_when_lazy_then_pcs_are_loaded_on_access(
+        store, test_dir_path, pc_1_name, pc_1_components, pc_2_name, pc_2_components, remove_test_dir):
+    save_store(store=store, target_dir=test_dir_path, format='binary')
+    loaded_store = load_store(source_dir=test_dir_path, lazy=True)
+    assert loaded_store.get_pc(pc_2_name).components == pc_2_components
+    assert [(pc.name, pc.components) for pc in loaded_store.pcs] == [
+        (pc_1_name, pc_1_components), (pc_2_name, pc_2_components)]
+
+
+def test_load_store_when_lazy_and_journal_is_there_then_it_is_replayed(
+        store, test_dir_path, pc_1_name, pc_2_name, remove_test_dir):
+    save_store(store=store, target_dir=test_dir_path, format='binary')
+    loaded_store = load_store(source_dir=test_dir_path, lazy=True)
+
+    with Journal(store=loaded_store, target_dir=test_dir_path, format='binary'):
+        loaded_store.remove_pc(pc_1_name)
+
+    assert [pc.name for pc in load_store(source_dir=test_dir_path, lazy=True).pcs] == [pc_2_name]
+
+
+def test_load_store_when_lazy_and_file_is_not_there_then_empty_store_is_loaded(test_dir_path):
+    assert load_store(source_dir=test_dir_path, lazy=True).pcs == []
+
+
+def test_load_store_when_lazy_and_file_is_json_then_error_is_raised(test_dir_path, create_test_file, remove_test_dir):
+    with raises(ValueError):
+        load_store(source_dir=test_dir_path, lazy=True)
+
+
+def test_load_store_when_strings_repeat_then_they_are_shared(test_dir_path, remove_test_dir):
+    save_store(store=Store(pcs=[PC(name='pc_1', components={'cpu': {'name': 'i7-9700K'}}),
+                                PC(name='pc_2', components={'cpu': {'name': 'i7-9700K'}})]),
+               target_dir=test_dir_path)
+    pc_1, pc_2 = load_store(source_dir=test_dir_path).pcs
+    (category_1, spec_1), = pc_1.components.items()
+    (category_2, spec_2), = pc_2.components.items()
+    assert category_1 is category_2
+    assert spec_1['name'] is spec_2['name']
+
+
+def test_load_store_when_read_only_then_specs_are_frozen(
+        store, test_dir_path, pc_1_name, pc_1_components, pc_2_name, pc_2_components, remove_test_dir):
+    for format in ('json', 'binary'):
+        save_store(store=store, target_dir=test_dir_path, format=format)
+
+        for lazy in (False, True) if format == 'binary' else (False,):
+            loaded_store = load_store(source_dir=test_dir_path, lazy=lazy, read_only=True)
+            assert [(pc.name, pc.components) for pc in loaded_store.pcs] == [
+                (pc_1_name, pc_1_components), (pc_2_name, pc_2_components)]
+            assert all(isinstance(spec, FrozenSpec) for pc in loaded_store.pcs for spec in pc.components.values())
+
+
+def test_save_store_when_read_only_store_is_saved_then_it_is_loaded(
+        store, test_dir_path, pc_1_name, pc_1_components, pc_2_name, pc_2_components, remove_test_dir):
+    save_store(store=store, target_dir=test_dir_path)
+    loaded_store = load_store(source_dir=test_dir_path, read_only=True)
+
+    with Journal(store=loaded_store, target_dir=test_dir_path):
+        loaded_store.get_pc(pc_1_name).add_component(category='ram', spec=FrozenSpec({'size': '16 GB'}))
+
+    for format in ('json', 'binary'):
+        save_store(store=load_store(source_dir=test_dir_path, read_only=True), target_dir=test_dir_path, format=format)
+        assert [(pc.name, pc.components) for pc in load_store(source_dir=test_dir_path).pcs] == [
+            (pc_1_name, {**pc_1_components, 'ram': {'size': '16 GB'}}), (pc_2_name, pc_2_components)]
+
+
+def test_load_store_when_file_of_requested_format_is_not_there_then_empty_store_is_loaded(
+        test_dir_path, create_test_file, remove_test_dir):
+    assert load_store(source_dir=test_dir_path, format='binary').pcs == []
+
+
+def test_convert_store_file_when_converted_both_ways_then_content_is_kept(
+        test_dir_path, test_file_path, create_test_file, pc_1_name, pc_1_components, pc_2_name, pc_2_components,
+        remove_test_dir):
+    content = [{pc_1_name: pc_1_components}, {pc_2_name: pc_2_components}]
+    binary_file_path = Path(test_dir_path, 'store.pcsb')
+    converted_file_path = Path(test_dir_path, 'converted.json')
+
+    convert_store_file(source_path=test_file_path, target_path=binary_file_path)
+    convert_store_file(source_path=binary_file_path, target_path=converted_file_path)
+
+    assert binary_file_path.read_bytes().startswith(b'PCSB')
+    __assert_json_file_contains(content=content, file_path=converted_file_path)
+
+
+def test_convert_store_file_when_source_file_is_malformed_then_error_is_raised_and_target_is_not_created(
+        test_dir_path, test_file_path, create_empty_test_file, remove_test_dir):
+    test_file_path.write_text('[{"pc": {}} {"pc_2": {}}]')
+
+    with raises(ValueError):
+        convert_store_file(source_path=test_file_path, target_path=Path(test_dir_path, 'store.pcsb'))
+    assert list(test_dir_path.iterdir()) == [test_file_path]
+
+
+@mark.parametrize('compression, suffix', [('gzip', '.gz'), ('bz2', '.bz2'), ('lzma', '.xz')])
+def test_save_store_when_compression_requested_then_compressed_file_is_saved_and_loaded(
+        compression, suffix, store, test_dir_path, test_file_path, create_test_file, pc_1_name, pc_1_components,
+        pc_2_name, pc_2_components, remove_test_dir):
+    save_store(store=store, target_dir=test_dir_path, format='binary', compression=compression, compresslevel=1)
+    compressed_file_path = Path(test_dir_path, f'store.pcsb{suffix}')
+
+    assert compressed_file_path.is_file()
+    assert not test_file_path.exists()
+    assert [(pc.name, pc.components) for pc in load_store(source_dir=test_dir_path).pcs] == [
+        (pc_1_name, pc_1_components), (pc_2_name, pc_2_components)]
+
+    save_store(store=store, target_dir=test_dir_path)
+    assert not compressed_file_path.exists()
+
+
+def test_load_store_when_compressed_file_is_malformed_then_error_is_raised(test_dir_path, remove_test_dir):
+    test_dir_path.mkdir(parents=True)
+    Path(test_dir_path, 'store.json.gz').write_bytes(b'not gzip')
+
+    with raises(ValueError):
+        load_store(source_dir=test_dir_path)
+
+
+def test_load_store_when_lazy_and_file_is_compressed_then_error_is_raised(store, test_dir_path, remove_test_dir):
+    save_store(store=store, target_dir=test_dir_path, format='binary', compression='gzip')
+
+    with raises(ValueError):
+        load_store(source_dir=test_dir_path, lazy=True)
+
+
+def test_convert_store_file_when_target_is_compressed_then_it_is_compressed(
+        test_dir_path, test_file_path, create_test_file, pc_1_name, pc_1_components, pc_2_name, pc_2_components,
+        remove_test_dir):
+    compressed_file_path = Path(test_dir_path, 'store.json.xz')
+    convert_store_file(source_path=test_file_path, target_path=compressed_file_path)
+    test_file_path.unlink()
+
+    assert compressed_file_path.read_bytes().startswith(b'\xfd7zXZ')
+    assert [(pc.name, pc.components) for pc in iter_store(source_dir=test_dir_path)] == [
+        (pc_1_name, pc_1_components), (pc_2_name, pc_2_components)]
+
+
 def test_load_store_when_file_is_not_there_then_empty_store_is_loaded(test_dir_path):
     store = load_store(source_dir=test_dir_path)
     assert store.pcs == []
@@ -140,8 +433,328 @@ def test_load_store_when_file_is_there_then_store_is_loaded(
     assert pc_2.components == pc_2_components
 
 
+@fixture
+def create_malformed_test_file(test_file_path, create_empty_test_file, pc_1_name, pc_1_components):
+    with open(test_file_path, 'w') as test_file:
+        test_file.write(f'[{{"{pc_1_name}": {{}}}}, {{"pc_2": ')
+
+
+def test_load_store_when_file_is_malformed_then_error_is_raised(
+        test_dir_path, create_malformed_test_file, remove_test_dir):
+    with raises(JSONDecodeError):
+        load_store(source_dir=test_dir_path)
+
+
+@fixture
+def create_invalid_test_file(test_file_path, create_empty_test_file, pc_1_name, pc_1_components, pc_2_name):
+    test_file_path.write_text(dumps([{pc_1_name: pc_1_components}, [], {pc_2_name: {}, 'pc_3': {}},
+                                     {pc_1_name: {}}, {pc_2_name: {'cpu': 'i7'}}, {pc_2_name: {'cpu': {'cores': 8}}},
+                                     {pc_2_name: None}, {pc_2_name: {'ram': {}}}]))
+
+
+def test_load_store_when_validation_reports_then_invalid_pcs_are_skipped_and_reported(
+        test_dir_path, create_invalid_test_file, pc_1_name, pc_1_components, pc_2_name, remove_test_dir):
+    invalid_pcs = []
+    store = load_store(source_dir=test_dir_path, validation='report', invalid_pcs=invalid_pcs)
+
+    assert [(pc.name, pc.components) for pc in store.pcs] == [(pc_1_name, pc_1_components), (pc_2_name, {'ram': {}})]
+    assert invalid_pcs == [InvalidPC(1, 'PC is not an object'),
+                           InvalidPC(2, 'PC has 2 names instead of one'),
+                           InvalidPC(3, "PC 'pc_1' is duplicated"),
+                           InvalidPC(4, "component 'cpu' of PC 'pc_2' is not an object"),
+                           InvalidPC(5, "parameter 'cores' of component 'cpu' of PC 'pc_2' is not a string"),
+                           InvalidPC(6, "components of PC 'pc_2' are not an object")]
+
+
+def test_load_store_when_validation_is_strict_then_first_invalid_pc_stops_loading(
+        test_dir_path, create_invalid_test_file, remove_test_dir):
+    with raises(ValueError, match='index 1'):
+        load_store(source_dir=test_dir_path, validation='strict')
+
+
+def test_load_store_when_validation_is_trusted_then_nothing_is_checked(
+        test_dir_path, test_file_path, create_empty_test_file, pc_1_name, pc_2_name, remove_test_dir):
+    test_file_path.write_text(dumps([{pc_1_name: {}, pc_2_name: {}}]))
+    assert [pc.name for pc in load_store(source_dir=test_dir_path).pcs] == [pc_1_name]
+
+
+def test_iter_store_when_validation_mode_is_unknown_then_error_is_raised(test_dir_path):
+    with raises(ValueError):
+        list(iter_store(source_dir=test_dir_path, validation='lenient'))
+
+
+def test_iter_store_when_file_is_not_there_then_nothing_is_yielded(test_dir_path):
+    assert list(iter_store(source_dir=test_dir_path)) == []
+
+
+def test_iter_store_when_empty_file_is_there_then_nothing_is_yielded(
+        test_dir_path, create_empty_test_file, remove_test_dir):
+    assert list(iter_store(source_dir=test_dir_path)) == []
+
+
+def test_iter_store_when_file_is_there_then_pcs_are_yielded(
+        test_dir_path, create_test_file, pc_1_name, pc_1_components, pc_2_name, pc_2_components, remove_test_dir):
+    pcs = iter_store(source_dir=test_dir_path)
+    pc_1 = next(pcs)
+    assert pc_1.name == pc_1_name
+    assert pc_1.components == pc_1_components
+    pc_2 = next(pcs)
+    assert pc_2.name == pc_2_name
+    assert pc_2.components == pc_2_components
+    assert next(pcs, None) is None
+
+
+def test_iter_store_when_chunks_split_pcs_then_pcs_are_yielded(
+        test_dir_path, create_test_file, pc_1_name, pc_1_components, pc_2_name, pc_2_components, remove_test_dir):
+    pcs = list(iter_store(source_dir=test_dir_path, chunk_size=1))
+    assert [(pc.name, pc.components) for pc in pcs] == [(pc_1_name, pc_1_components),
+                                                        (pc_2_name, pc_2_components)]
+
+
+def test_iter_store_when_file_is_malformed_then_error_is_raised(
+        test_dir_path, create_malformed_test_file, pc_1_name, remove_test_dir):
+    pcs = iter_store(source_dir=test_dir_path, chunk_size=4)
+    assert next(pcs).name == pc_1_name
+
+    with raises(JSONDecodeError):
+        next(pcs)
+
+
+@fixture
+def journal_file_path(test_dir_path):
+    return Path(test_dir_path, 'store.journal')
+
+
+@fixture
+def journaled_store(test_dir_path, pc_1_name, pc_1_components):
+    store = Store(pcs=[PC(name=pc_1_name, components=pc_1_components)])
+    save_store(store=store, target_dir=test_dir_path)
+    return store
+
+
+def test_journal_when_changes_are_flushed_then_they_are_loaded(
+        journaled_store, test_dir_path, pc_1_name, pc_2_name, pc_2_components, remove_test_dir):
+    with Journal(store=journaled_store, target_dir=test_dir_path) as journal:
+        journaled_store.add_pc(PC(name=pc_2_name, components=pc_2_components))
+        journaled_store.get_pc(pc_1_name).update_component(category='cpu', param_name='freq', param_value='4 GHz')
+        journaled_store.get_pc(pc_1_name).remove_component(category='gpu')
+        journaled_store.get_pc(pc_2_name).swap_component(category='mobo', spec={'name': 'MSI B450'})
+        journaled_store.get_pc(pc_2_name).add_component(category='ram')
+        assert journal.pending == 5
+
+    loaded_store = load_store(source_dir=test_dir_path)
+    assert [(pc.name, pc.components) for pc in loaded_store.pcs] == [
+        (pc_1_name, {'cpu': {'name': 'i7-9700K', 'freq': '4 GHz'}}),
+        (pc_2_name, {'mobo': {'name': 'MSI B450'}, 'ram': {}})]
+
+
+def test_journal_when_pc_is_removed_then_it_is_not_loaded(
+        journaled_store, test_dir_path, pc_1_name, remove_test_dir):
+    with Journal(store=journaled_store, target_dir=test_dir_path):
+        journaled_store.remove_pc(pc_1_name)
+
+    assert load_store(source_dir=test_dir_path).pcs == []
+
+
+def test_journal_when_changes_are_flushed_then_json_file_is_not_rewritten(
+        journaled_store, test_dir_path, test_file_path, journal_file_path, pc_1_name, remove_test_dir):
+    json_content = test_file_path.read_text()
+
+    journal = Journal(store=journaled_store, target_dir=test_dir_path)
+    journaled_store.remove_pc(pc_1_name)
+    journal.flush()
+
+    assert journal.pending == 0
+    assert test_file_path.read_text() == json_content
+    assert len(journal_file_path.read_text().splitlines()) == 1
+
+
+def test_journal_when_compacted_then_changes_are_folded_into_json_file(
+        journaled_store, test_dir_path, test_file_path, journal_file_path, pc_1_name, remove_test_dir):
+    journal = Journal(store=journaled_store, target_dir=test_dir_path)
+    journaled_store.remove_pc(pc_1_name)
+    journal.flush()
+    journal.compact()
+
+    assert not journal_file_path.exists()
+    __assert_json_file_contains(content=[], file_path=test_file_path)
+
+
+def test_journal_when_compaction_size_is_exceeded_then_it_is_compacted_on_flush(
+        journaled_store, test_dir_path, test_file_path, journal_file_path, pc_1_name, remove_test_dir):
+    with Journal(store=journaled_store, target_dir=test_dir_path, compaction_size=0):
+        journaled_store.remove_pc(pc_1_name)
+
+    assert not journal_file_path.exists()
+    __assert_json_file_contains(content=[], file_path=test_file_path)
+
+
+def test_journal_when_closed_then_changes_are_not_recorded(
+        journaled_store, test_dir_path, journal_file_path, pc_1_name, remove_test_dir):
+    Journal(store=journaled_store, target_dir=test_dir_path).close()
+    journaled_store.remove_pc(pc_1_name)
+    assert not journal_file_path.exists()
+
+
+def test_journal_when_last_record_is_torn_then_it_is_ignored(
+        journaled_store, test_dir_path, journal_file_path, pc_1_name, pc_2_name, remove_test_dir):
+    with Journal(store=journaled_store, target_dir=test_dir_path):
+        journaled_store.add_pc(PC(name=pc_2_name))
+    with open(journal_file_path, 'a') as journal_file:
+        journal_file.write('{"op": "remove_pc", "na')
+
+    assert [pc.name for pc in load_store(source_dir=test_dir_path).pcs] == [pc_1_name, pc_2_name]
+
+    with Journal(store=journaled_store, target_dir=test_dir_path):
+        journaled_store.remove_pc(pc_1_name)
+
+    assert [pc.name for pc in load_store(source_dir=test_dir_path).pcs] == [pc_2_name]
+
+
+def test_journal_when_middle_record_is_malformed_then_error_is_raised(
+        journaled_store, test_dir_path, journal_file_path, remove_test_dir):
+    journal_file_path.write_text('{"op": \n{"op": "remove_pc", "name": "pc_1"}\n')
+
+    with raises(JSONDecodeError):
+        load_store(source_dir=test_dir_path)
+
+
 def __assert_json_file_contains(content, file_path):
     assert file_path.is_file()
 
     with open(file_path, 'r') as json_file:
         assert load(json_file) == content
+
+
+def test_async_save_store_when_saved_then_it_is_loaded_asynchronously(
+        test_dir_path, pc_1_name, pc_1_components, remove_test_dir):
+    pc = PC(name=pc_1_name, components=pc_1_components)
+    store = Store(pcs=[pc])
+
+    async def save_and_load():
+        changes = await async_save_store(store=store, target_dir=test_dir_path, format='binary')
+        return changes, await async_load_store(source_dir=test_dir_path, lazy=True)
+
+    changes, loaded_store = run(save_and_load())
+    assert changes == StoreChanges(changed=[pc], removed=[])
+    assert not store.is_dirty
+    assert [(pc.name, pc.components) for pc in loaded_store.pcs] == [(pc_1_name, pc_1_components)]
+
+
+def test_async_save_store_when_store_was_not_changed_since_it_was_saved_then_file_is_not_rewritten(
+        test_dir_path, test_file_path, pc_1_name, remove_test_dir):
+    store = Store(pcs=[PC(name=pc_1_name)])
+    run(async_save_store(store=store, target_dir=test_dir_path))
+    modified = test_file_path.stat().st_mtime_ns
+
+    assert run(async_save_store(store=store, target_dir=test_dir_path)) == StoreChanges([], [])
+    assert test_file_path.stat().st_mtime_ns == modified
+
+
+def test_async_save_store_when_store_is_changed_while_saving_then_change_is_not_lost(
+        test_dir_path, test_file_path, pc_1_name, pc_1_components, remove_test_dir):
+    content = [{pc_1_name: dict(pc_1_components)}]
+    store = Store(pcs=[PC(name=pc_1_name, components=pc_1_components)])
+
+    async def change():
+        await sleep(0)
+        store.get_pc(pc_1_name).remove_component(category='gpu')
+
+    async def save_while_changing():
+        await gather(async_save_store(store=store, target_dir=test_dir_path), change())
+
+    run(save_while_changing())
+    __assert_json_file_contains(content=content, file_path=test_file_path)
+    assert store.changes == StoreChanges(changed=[store.get_pc(pc_1_name)], removed=[])
+
+
+def test_async_load_stores_when_dirs_are_given_then_stores_are_loaded_in_order(
+        test_dir_path, pc_1_name, pc_2_name, remove_test_dir):
+    dir_paths = [Path(test_dir_path, str(dir_id)) for dir_id in range(5)]
+
+    for dir_id, dir_path in enumerate(dir_paths):
+        save_store(store=Store(pcs=[PC(name=f'pc_{dir_id}')]), target_dir=dir_path)
+
+    stores = run(async_load_stores(source_dirs=dir_paths, concurrency=2))
+    assert [[pc.name for pc in store.pcs] for store in stores] == [[f'pc_{dir_id}'] for dir_id in range(5)]
+
+
+def test_open_cached_store_when_opened_then_pcs_are_loaded_on_access(
+        test_dir_path, create_test_file, pc_1_name, pc_1_components, pc_2_name, pc_2_components, remove_test_dir):
+    store = open_cached_store(source_dir=test_dir_path, capacity=1)
+    assert [pc.name for pc in store.pcs] == [pc_1_name, pc_2_name]
+    assert store.get_pc(pc_1_name).components == pc_1_components
+    store.get_pc(pc_2_name).remove_component(category='mobo')
+    store.add_pc(PC(name='pc_3'))
+    store.get_pc(pc_1_name)
+    store.close()
+
+    reopened_store = open_cached_store(source_dir=test_dir_path)
+    assert [(pc.name, pc.components) for pc in reopened_store.pcs] == [
+        (pc_1_name, pc_1_components), (pc_2_name, {}), ('pc_3', {})]
+    reopened_store.close()
+
+
+def test_open_cached_store_when_store_file_was_replaced_by_other_store_then_cache_is_built_again(
+        test_dir_path, create_test_file, pc_1_name, pc_2_name, remove_test_dir):
+    store = open_cached_store(source_dir=test_dir_path)
+    store.remove_pc(pc_1_name)
+    store.close()
+
+    save_store(store=Store(pcs=[PC(name='pc_3')]), target_dir=test_dir_path)
+
+    reopened_store = open_cached_store(source_dir=test_dir_path)
+    assert [pc.name for pc in reopened_store.pcs] == ['pc_3']
+    assert not reopened_store.is_dirty
+    reopened_store.close()
+
+
+def test_open_cached_store_when_cache_was_not_changed_since_save_then_store_is_not_written_again(
+        test_dir_path, test_file_path, create_test_file, pc_1_name, remove_test_dir):
+    store = open_cached_store(source_dir=test_dir_path)
+    store.remove_pc(pc_1_name)
+    save_store(store=store, target_dir=test_dir_path)
+    store.close()
+    modification_time = test_file_path.stat().st_mtime_ns
+
+    reopened_store = open_cached_store(source_dir=test_dir_path)
+    assert not reopened_store.is_dirty
+    assert reopened_store.clean_target == str(test_file_path.resolve())
+    assert save_store(store=reopened_store, target_dir=test_dir_path) == StoreChanges(changed=[], removed=[])
+    assert test_file_path.stat().st_mtime_ns == modification_time
+    reopened_store.close()
+
+
+def test_open_cached_store_when_cache_was_changed_since_save_then_store_is_not_clean(
+        test_dir_path, test_file_path, create_test_file, pc_1_name, remove_test_dir):
+    store = open_cached_store(source_dir=test_dir_path)
+    store.remove_pc(pc_1_name)
+    store.close()
+
+    reopened_store = open_cached_store(source_dir=test_dir_path)
+    assert reopened_store.clean_target is None
+    reopened_store.close()
+
+
+def test_open_cached_store_when_opened_then_counters_of_its_cache_are_reported(
+        test_dir_path, create_test_file, pc_1_name, pc_2_name, remove_test_dir):
+    store = open_cached_store(source_dir=test_dir_path, capacity=1)
+    store.get_pc(pc_1_name)
+    store.get_pc(pc_2_name)
+    store.get_pc(pc_2_name)
+    assert store.cache_stats == CacheStats(hits=1, misses=2, evictions=1, write_backs=0)
+    assert store.resident_pcs == 1
+    store.close()
+
+
+def test_open_cached_store_when_cached_store_was_saved_then_its_later_changes_are_kept(
+        test_dir_path, create_test_file, pc_1_name, pc_2_name, remove_test_dir):
+    store = open_cached_store(source_dir=test_dir_path)
+    store.remove_pc(pc_1_name)
+    save_store(store=store, target_dir=test_dir_path)
+    store.add_pc(PC(name='pc_3'))
+    store.close()
+
+    reopened_store = open_cached_store(source_dir=test_dir_path)
+    assert [pc.name for pc in reopened_store.pcs] == [pc_2_name, 'pc_3']
+    reopened_store.close()
@@ -0,0 +1,123 @@
+from unittest.mock import patch
+
+from pytest import fixture
+
+import pc_spec.diff
+from pc_spec.diff import (Conflict, ContentHashes, ParamChange, PCDiff, StoreDiff, apply_diff, content_hash,
+                          diff_pcs, diff_stores, merge_stores)
+from pc_spec.pc import PC, FrozenSpec
+from pc_spec.store import Store
+
+
+def __gaming_pc():
+    return PC(name='gaming', components={'cpu': {'name': 'i7-9700K', 'freq': '3.6 GHz'}, 'gpu': {'name': 'RTX 3070'}})
+
+
+def __office_pc():
+    return PC(name='office', components={'cpu': {'name': 'i3-10100'}})
+
+
+@fixture
+def base():
+    return Store(pcs=[__gaming_pc(), __office_pc()])
+
+
+@fixture
+def changed():
+    return Store(pcs=[__gaming_pc(), __office_pc()])
+
+
+def test_content_hash_when_order_differs_then_hashes_are_equal():
+    assert content_hash({'cpu': {'name': 'i7', 'freq': '4 GHz'}, 'gpu': {}}) == \
+        content_hash({'gpu': {}, 'cpu': FrozenSpec({'freq': '4 GHz', 'name': 'i7'})})
+    assert content_hash({'cpu': {'name': 'i7'}}) != content_hash({'cpu': {'name': 'i9'}})
+
+
+def test_diff_pcs_when_pcs_differ_then_components_and_params_are_reported():
+    old_pc = PC(name='gaming', components={'cpu': {'name': 'i7', 'freq': '3.6 GHz'}, 'gpu': {}, 'ram': {'size': '8'}})
+    new_pc = PC(name='gaming', components={'cpu': {'name': 'i9', 'cores': '8'}, 'ram': {'size': '8'}, 'hdd': {}})
+
+    assert diff_pcs(old_pc, new_pc) == PCDiff(name='gaming', added={'hdd': {}}, removed={'gpu': {}}, changed=[
+        ParamChange('cpu', 'name', 'i7', 'i9'), ParamChange('cpu', 'freq', '3.6 GHz', None),
+        ParamChange('cpu', 'cores', None, '8')])
+
+
+def test_diff_stores_when_stores_are_equal_then_diff_is_empty(base, changed):
+    assert diff_stores(base, changed).is_empty()
+
+
+def test_diff_stores_when_stores_differ_then_pcs_are_reported(base, changed):
+    changed.remove_pc('office')
+    changed.add_pc(PC(name='server'))
+    changed.get_pc('gaming').remove_component('gpu')
+
+    diff = diff_stores(base, changed)
+    assert diff.added == [changed.get_pc('server')]
+    assert diff.removed == [base.get_pc('office')]
+    assert diff.changed == [PCDiff(name='gaming', added={}, removed={'gpu': {'name': 'RTX 3070'}}, changed=[])]
+
+
+def test_diff_stores_when_hashes_are_reused_then_only_changed_pcs_are_hashed(base, changed):
+    old_hashes, new_hashes = ContentHashes(), ContentHashes()
+    diff_stores(base, changed, old_hashes, new_hashes)
+    changed.get_pc('office').update_component(category='cpu', param_name='freq', param_value='4 GHz')
+
+    with patch.object(pc_spec.diff, 'content_hash', wraps=content_hash) as hashed:
+        diff = diff_stores(base, changed, old_hashes, new_hashes)
+
+    assert hashed.call_count == 1
+    assert diff.changed == [PCDiff(name='office', added={}, removed={}, changed=[
+        ParamChange('cpu', 'freq', None, '4 GHz')])]
+
+
+def test_apply_diff_when_store_is_the_same_as_old_one_then_it_becomes_new_one(base, changed):
+    changed.remove_pc('office')
+    changed.add_pc(PC(name='server', components={'cpu': {}}))
+    changed.get_pc('gaming').update_component(category='cpu', param_name='freq', param_value='4 GHz')
+    changed.get_pc('gaming').swap_component(category='gpu', spec={})
+    changed.get_pc('gaming').add_component(category='ram')
+
+    assert apply_diff(base, diff_stores(base.snapshot(), changed)) == []
+    assert diff_stores(base, changed).is_empty()
+    assert base.get_pc('server') is not changed.get_pc('server')
+
+
+def test_merge_stores_when_changes_conflict_then_they_are_reported_and_ours_win(base, changed):
+    snapshot = base.snapshot()
+    base.get_pc('gaming').update_component(category='cpu', param_name='name', param_value='i9-9900K')
+    base.get_pc('gaming').update_component(category='cpu', param_name='freq', param_value='4 GHz')
+    base.get_pc('office').add_component(category='ram')
+    base.add_pc(PC(name='server', components={'cpu': {}}))
+
+    changed.get_pc('gaming').update_component(category='cpu', param_name='name', param_value='i7-9700KF')
+    changed.get_pc('gaming').update_component(category='cpu', param_name='freq', param_value='4 GHz')
+    changed.get_pc('gaming').update_component(category='gpu', param_name='vram', param_value='8 GB')
+    changed.remove_pc('office')
+    changed.add_pc(PC(name='server', components={'gpu': {}}))
+
+    assert merge_stores(snapshot, base, changed) == [Conflict('server', None, None, 'pc_exists'),
+                                                     Conflict('office', None, None, 'pc_changed'),
+                                                     Conflict('gaming', 'cpu', 'name', 'param_changed')]
+    assert base.get_pc('gaming').components == {'cpu': {'name': 'i9-9900K', 'freq': '4 GHz'},
+                                                'gpu': {'name': 'RTX 3070', 'vram': '8 GB'}}
+
+
+def test_apply_diff_when_params_of_same_component_are_updated_and_removed_then_all_changes_are_kept(base):
+    diff = StoreDiff(added=[], removed=[], changed=[
+        PCDiff('gaming', added={}, removed={}, changed=[ParamChange('cpu', 'freq', '3.6 GHz', '4 GHz'),
+                                                        ParamChange('cpu', 'name', 'i7-9700K', None),
+                                                        ParamChange('cpu', 'cores', None, '8')])])
+
+    assert apply_diff(base, diff) == []
+    assert base.get_pc('gaming').components['cpu'] == {'freq': '4 GHz', 'cores': '8'}
+
+
+def test_apply_diff_when_components_are_missing_or_changed_then_conflicts_are_reported(base):
+    diff = StoreDiff(added=[], removed=[], changed=[
+        PCDiff('gaming', added={'gpu': {}}, removed={'cpu': {}}, changed=[ParamChange('ram', 'size', None, '8')]),
+        PCDiff('server', added={}, removed={}, changed=[])])
+
+    assert apply_diff(base, diff) == [Conflict('gaming', 'gpu', None, 'component_exists'),
+                                      Conflict('gaming', 'cpu', None, 'component_changed'),
+                                      Conflict('gaming', 'ram', 'size', 'component_missing'),
+                                      Conflict('server', None, None, 'pc_missing')]
@@ -0,0 +1,167 @@
+from queue import Queue
+from unittest.mock import Mock
+
+from pytest import fixture
+
+from pc_spec.events import Event, EventStream, coalesce
+from pc_spec.pc import PC
+from pc_spec.store import Store
+
+
+@fixture
+def pc():
+    return PC(name='gaming', components={'cpu': {'name': 'i7-9700K'}, 'gpu': {'name': 'RTX 3070'}})
+
+
+@fixture
+def store(pc):
+    return Store(pcs=[pc])
+
+
+@fixture
+def listener():
+    return Mock()
+
+
+@fixture
+def stream(store, listener):
+    stream = EventStream(store)
+    stream.subscribe(listener)
+    return stream
+
+
+def __types(events):
+    return [(event.type, event.pc.name, event.category) for event in events]
+
+
+def test_stream_when_store_is_changed_outside_of_batch_then_every_event_is_delivered_at_once(
+        store, pc, stream, listener):
+    office_pc = PC(name='office')
+    store.add_pc(office_pc)
+    pc.update_component(category='cpu', param_name='freq', param_value='4 GHz')
+    pc.swap_component(category='gpu', spec={'name': 'RTX 3080'})
+    office_pc.add_component(category='ram')
+    pc.remove_component(category='cpu')
+    store.remove_pc('office')
+
+    assert [__types(call.args[0]) for call in listener.call_args_list] == [
+        [('pc_added', 'office', None)], [('component_updated', 'gaming', 'cpu')],
+        [('component_swapped', 'gaming', 'gpu')], [('component_added', 'office', 'ram')],
+        [('component_removed', 'gaming', 'cpu')], [('pc_removed', 'office', None)]]
+    assert listener.call_args_list[1].args[0][0].old_spec == {'name': 'i7-9700K'}
+
+
+def test_stream_when_store_is_changed_in_batch_then_coalesced_events_are_delivered_once(
+        store, pc, stream, listener):
+    with stream.batch():
+        with stream.batch():
+            pc.update_component(category='cpu', param_name='freq', param_value='4 GHz')
+            store.add_pc(PC(name='office'))
+        pc.update_component(category='cpu', param_name='cores', param_value='8')
+        pc.add_component(category='ram')
+        store.get_pc('office').add_component(category='hdd')
+        pc.swap_component(category='gpu', spec={'name': 'RTX 3080'})
+        pc.swap_component(category='gpu', spec={'name': 'RTX 3070'})
+        assert not listener.called
+
+    listener.assert_called_once()
+    events = listener.call_args.args[0]
+    assert __types(events) == [('component_updated', 'gaming', 'cpu'), ('component_added', 'gaming', 'ram'),
+                               ('pc_added', 'office', None)]
+    assert events[0].old_spec == {'name': 'i7-9700K'}
+    assert events[0].new_spec == {'name': 'i7-9700K', 'freq': '4 GHz', 'cores': '8'}
+
+
+def test_stream_when_component_is_changed_many_times_in_batch_then_event_has_its_first_and_last_spec(
+        store, pc, stream, listener):
+    with stream.batch():
+        pc.update_component(category='cpu', param_name='freq', param_value='4 GHz')
+        pc.swap_component(category='cpu', spec={'freq': pc.components['cpu']['freq']})
+        pc.update_component(category='cpu', param_name='cores', param_value='8')
+
+    assert listener.call_args.args[0] == [Event('component_swapped', pc, 'cpu', {'name': 'i7-9700K'},
+                                                {'freq': '4 GHz', 'cores': '8'})]
+
+
+def test_stream_when_coalescing_is_disabled_then_all_events_of_batch_are_delivered(store, pc, listener):
+    stream = EventStream(store, coalesce=False)
+    stream.subscribe(listener)
+
+    with stream.batch():
+        pc.remove_component(category='gpu')
+        pc.add_component(category='gpu')
+
+    assert __types(listener.call_args.args[0]) == [('component_removed', 'gaming', 'gpu'),
+                                                   ('component_added', 'gaming', 'gpu')]
+
+
+def test_stream_when_queue_is_given_then_batches_are_put_to_it(store, pc):
+    queue = Queue()
+    EventStream(store, queue=queue)
+    store.remove_pc('gaming')
+
+    assert queue.get_nowait() == [Event('pc_removed', pc)]
+    assert queue.empty()
+
+
+def test_stream_when_specs_are_changed_after_events_are_queued_then_events_keep_them(store, pc):
+    queue = Queue()
+    stream = EventStream(store, queue=queue)
+    spec = {'name': 'RTX 3080'}
+    pc.swap_component(category='gpu', spec=spec)
+    spec['name'] = 'RTX 3090'
+
+    with stream.batch():
+        pc.update_component(category='cpu', param_name='freq', param_value='1 GHz')
+        pc.add_component(category='ram', spec=spec)
+        spec['size'] = '32 GB'
+
+    assert queue.get_nowait()[0].new_spec == {'name': 'RTX 3080'}
+    assert [event.new_spec for event in queue.get_nowait()] == [{'name': 'i7-9700K', 'freq': '1 GHz'},
+                                                                {'name': 'RTX 3090'}]
+
+
+def test_stream_when_source_is_pc_then_its_changes_are_streamed(pc, listener):
+    stream = EventStream(pc)
+    stream.subscribe(listener)
+    pc.add_component(category='ram', spec={'size': '32 GB'})
+
+    listener.assert_called_once_with([Event('component_added', pc, 'ram', None, {'size': '32 GB'})])
+
+
+def test_close_when_stream_is_closed_then_changes_are_not_delivered(store, pc, stream, listener):
+    stream.unsubscribe(Mock())
+    stream.close()
+    pc.add_component(category='ram')
+    assert not listener.called
+
+
+def test_coalesce_when_pc_is_added_and_removed_then_nothing_is_left(pc):
+    events = [Event('pc_added', pc), Event('component_added', pc, 'ram', None, {}), Event('pc_removed', pc)]
+    assert coalesce(events) == []
+
+
+def test_coalesce_when_pc_is_replaced_then_it_is_removed_and_added(pc):
+    new_pc = PC(name='gaming')
+    events = [Event('component_removed', pc, 'cpu', {}, None), Event('pc_removed', pc), Event('pc_added', new_pc),
+              Event('component_added', new_pc, 'ram', None, {})]
+    assert coalesce(events) == [Event('pc_removed', pc), Event('pc_added', new_pc)]
+
+
+def test_stream_when_pc_is_changed_while_removed_and_added_again_then_it_is_removed_and_added(
+        store, pc, stream, listener):
+    with stream.batch():
+        store.remove_pc('gaming')
+        pc.remove_component(category='gpu')
+        pc.swap_component(category='cpu', spec={'n': '2'})
+        store.add_pc(pc)
+
+    assert __types(listener.call_args.args[0]) == [('pc_removed', 'gaming', None), ('pc_added', 'gaming', None)]
+    assert pc.components == {'cpu': {'n': '2'}}
+
+
+def test_coalesce_when_component_is_removed_and_added_then_it_is_swapped(pc):
+    events = [Event('component_removed', pc, 'cpu', {'name': 'i7'}, None),
+              Event('component_added', pc, 'cpu', None, {'name': 'i9'}),
+              Event('component_added', pc, 'ram', None, {}), Event('component_removed', pc, 'ram', {}, None)]
+    assert coalesce(events) == [Event('component_swapped', pc, 'cpu', {'name': 'i7'}, {'name': 'i9'})]
@@ -0,0 +1,195 @@
+from io import BytesIO
+from json import JSONDecodeError
+from pathlib import Path
+
+from pytest import fixture, mark, raises
+
+from pc_spec.cached import CacheStats
+from pc_spec.formats import BinaryFormat, EncodedPCCache, JsonFormat, get_compression, get_compression_by_path, \
+    get_format, get_format_by_path
+from pc_spec.pc import PC
+
+
+@fixture
+def serialized_pcs():
+    return [{'gaming rig': {'cpu': {'name': 'Intel i7 9700K', 'freq': '4 GHz'},
+                            'gpu': {'name': 'Nvidia RTX 3070'},
+                            'mobo': {}}},
+            {'workstation': {'cpu': {'name': 'Intel i7 9700K'}}},
+            {'empty pc': {}}]
+
+
+@fixture
+def json_format():
+    return JsonFormat()
+
+
+@fixture
+def binary_format():
+    return BinaryFormat()
+
+
+def test_json_format_when_pcs_written_then_they_are_read(json_format, serialized_pcs):
+    assert __write_and_read(json_format, serialized_pcs) == serialized_pcs
+
+
+def test_json_format_when_written_in_small_chunks_then_pcs_are_read(serialized_pcs):
+    assert __write_and_read(JsonFormat(chunk_size=1), serialized_pcs) == serialized_pcs
+
+
+def test_json_format_when_no_pcs_written_then_nothing_is_read(json_format):
+    assert __write_and_read(json_format, []) == []
+
+
+def test_json_format_when_file_is_empty_then_nothing_is_read(json_format):
+    assert list(json_format.read(BytesIO(), 1024)) == []
+
+
+def test_json_format_when_file_is_malformed_then_error_is_raised(json_format):
+    with raises(JSONDecodeError):
+        list(json_format.read(BytesIO(b'[{"pc": {}} {"pc_2": {}}]'), 1024))
+
+
+@mark.parametrize('store_format', [JsonFormat(), BinaryFormat()])
+def test_write_when_pcs_are_given_by_iterator_then_they_are_read(store_format, serialized_pcs):
+    assert __write_and_read(store_format, iter(serialized_pcs)) == serialized_pcs
+    assert __write_and_read(store_format, iter([])) == []
+
+
+def test_binary_format_when_pcs_written_then_they_are_read(binary_format, serialized_pcs):
+    assert __write_and_read(binary_format, serialized_pcs) == serialized_pcs
+
+
+def test_binary_format_when_no_pcs_written_then_nothing_is_read(binary_format):
+    assert __write_and_read(binary_format, []) == []
+
+
+def test_binary_format_when_file_is_empty_then_nothing_is_read(binary_format):
+    assert list(binary_format.read(BytesIO(), 1024)) == []
+
+
+def test_binary_format_when_strings_repeat_then_they_are_written_once(binary_format, serialized_pcs):
+    binary_file = BytesIO()
+    binary_format.write(serialized_pcs, binary_file)
+    assert binary_file.getvalue().count(b'Intel i7 9700K') == 1
+    assert binary_file.getvalue().count(b'name') == 1
+
+
+def test_binary_format_when_strings_repeat_then_read_strings_are_shared(binary_format, serialized_pcs):
+    gaming_pc, workstation, _ = __write_and_read(binary_format, serialized_pcs)
+    assert gaming_pc['gaming rig']['cpu']['name'] is workstation['workstation']['cpu']['name']
+
+
+def test_binary_format_when_magic_is_wrong_then_error_is_raised(binary_format):
+    with raises(ValueError):
+        list(binary_format.read(BytesIO(b'[{"pc": {}}]'), 1024))
+
+
+def test_binary_format_when_file_is_truncated_then_error_is_raised(binary_format, serialized_pcs):
+    binary_file = BytesIO()
+    binary_format.write(serialized_pcs, binary_file)
+
+    with raises(ValueError):
+        list(binary_format.read(BytesIO(binary_file.getvalue()[:-1]), 1024))
+
+
+def test_get_format_when_name_is_known_then_format_is_returned():
+    assert isinstance(get_format('json'), JsonFormat)
+    assert isinstance(get_format('binary'), BinaryFormat)
+
+
+def test_get_format_when_name_is_unknown_then_error_is_raised():
+    with raises(ValueError):
+        get_format('xml')
+
+
+def test_get_format_by_path_when_extension_is_known_then_format_is_returned():
+    assert isinstance(get_format_by_path(Path('store.json')), JsonFormat)
+    assert isinstance(get_format_by_path(Path('store.pcsb')), BinaryFormat)
+
+
+def test_get_format_by_path_when_extension_is_unknown_then_error_is_raised():
+    with raises(ValueError):
+        get_format_by_path(Path('store.xml'))
+
+
+def test_get_format_by_path_when_file_is_compressed_then_format_is_returned():
+    assert isinstance(get_format_by_path(Path('store.json.gz')), JsonFormat)
+    assert isinstance(get_format_by_path(Path('store.pcsb.xz')), BinaryFormat)
+
+
+def test_get_compression_by_path_when_suffix_is_known_then_compression_is_returned():
+    assert get_compression_by_path(Path('store.json.bz2')) is get_compression('bz2')
+    assert get_compression_by_path(Path('store.json')) is None
+
+
+def test_get_compression_when_name_is_unknown_then_error_is_raised():
+    with raises(ValueError):
+        get_compression('zip')
+
+
+@mark.parametrize('name', ['gzip', 'bz2', 'lzma'])
+def test_compression_when_pcs_written_compressed_then_they_are_read(name, json_format, serialized_pcs):
+    compression, binary_file = get_compression(name), BytesIO()
+
+    with compression.open(binary_file, 'wb', level=1) as compressed_file:
+        json_format.write(serialized_pcs, compressed_file)
+    assert not binary_file.closed
+    assert b'gaming rig' not in binary_file.getvalue()
+
+    binary_file.seek(0)
+    with compression.open(binary_file, 'rb') as decompressed_file:
+        assert list(json_format.read(decompressed_file, 2)) == serialized_pcs
+
+
+def test_json_format_when_pcs_written_with_cache_then_output_is_the_same(serialized_pcs):
+    pcs = [PC(*serialized_pc.popitem()) for serialized_pc in serialized_pcs]
+    expected_file, binary_file = BytesIO(), BytesIO()
+    JsonFormat(chunk_size=16).write([{pc.name: pc.components} for pc in pcs], expected_file)
+    JsonFormat(chunk_size=16).write_pcs(pcs, binary_file, EncodedPCCache())
+
+    assert binary_file.getvalue() == expected_file.getvalue()
+
+
+def test_encoded_pc_cache_when_pc_is_not_changed_then_it_is_encoded_once():
+    cache = EncodedPCCache()
+    pc = PC(name='gaming', components={'cpu': {'name': 'i7-9700K'}})
+
+    assert cache.encode(pc) == b'{"gaming": {"cpu": {"name": "i7-9700K"}}}'
+    assert cache.encode(pc) is cache.encode(pc)
+    pc.add_component(category='gpu')
+    assert cache.encode(pc) == b'{"gaming": {"cpu": {"name": "i7-9700K"}, "gpu": {}}}'
+    assert cache.encode(PC(name='gaming')) == b'{"gaming": {}}'
+
+    assert cache.stats == CacheStats(hits=2, misses=3, evictions=0, write_backs=0)
+    assert cache.size == len(b'{"gaming": {}}')
+
+
+def test_encoded_pc_cache_when_size_is_exceeded_then_least_recently_used_pcs_are_evicted():
+    cache = EncodedPCCache(capacity=2, max_bytes=30)
+    pcs = [PC(name=f'pc_{pc_id}') for pc_id in range(3)]
+    cache.encode(pcs[0])
+    cache.encode(pcs[1])
+    cache.encode(pcs[0])
+    cache.encode(pcs[2])
+    cache.encode(pcs[0])
+    assert cache.stats == CacheStats(hits=2, misses=3, evictions=1, write_backs=0)
+
+    cache.encode(PC(name='pc with very long name'))
+    assert cache.stats.evictions == 3
+    assert cache.size == len(b'{"pc with very long name": {}}')
+
+    cache.clear()
+    assert cache.size == 0
+
+
+def test_encoded_pc_cache_when_size_is_not_positive_then_error_is_raised():
+    with raises(ValueError):
+        EncodedPCCache(max_bytes=0)
+
+
+def __write_and_read(store_format, serialized_pcs):
+    binary_file = BytesIO()
+    store_format.write(serialized_pcs, binary_file)
+    binary_file.seek(0)
+    return list(store_format.read(binary_file, 2))
@@ -0,0 +1,79 @@
+from pytest import fixture
+
+from pc_spec.index import ComponentIndex
+from pc_spec.pc import PC
+
+
+@fixture
+def gaming_pc():
+    return PC(name='gaming rig', components={'cpu': {'name': 'Intel i7 9700K'},
+                                             'gpu': {'name': 'Nvidia RTX 3070', 'memory': '8 GB'}})
+
+
+@fixture
+def workstation():
+    return PC(name='workstation', components={'cpu': {'name': 'AMD Ryzen 5 5900X'},
+                                              'gpu': {'name': 'Nvidia RTX 3070', 'memory': '8 GB'}})
+
+
+@fixture
+def office_pc():
+    return PC(name='office pc', components={'cpu': {'name': 'Intel i7 9700K'}})
+
+
+@fixture
+def index(gaming_pc, workstation, office_pc):
+    index = ComponentIndex(pcs=[gaming_pc, workstation, office_pc])
+    for pc in (gaming_pc, workstation, office_pc):
+        pc.subscribe(index.update)
+    return index
+
+
+def test_new_default_index_finds_nothing():
+    assert ComponentIndex().find('cpu', {}) == []
+
+
+def test_find_when_only_category_given_then_pcs_with_category_are_found(index, gaming_pc, workstation):
+    assert index.find('gpu', {}) == [gaming_pc, workstation]
+
+
+def test_find_when_spec_filters_given_then_pcs_matching_all_filters_are_found(index, gaming_pc, workstation):
+    assert index.find('gpu', {'name': 'Nvidia RTX 3070', 'memory': '8 GB'}) == [gaming_pc, workstation]
+    assert index.find('cpu', {'name': 'AMD Ryzen 5 5900X'}) == [workstation]
+
+
+def test_find_when_nothing_matches_then_nothing_is_found(index):
+    assert index.find('gpu', {'name': 'Nvidia RTX 3070', 'memory': '12 GB'}) == []
+    assert index.find('ram', {}) == []
+
+
+def test_find_when_pcs_indexed_then_they_are_found_in_indexing_order(index, gaming_pc, office_pc):
+    assert index.find('cpu', {'name': 'Intel i7 9700K'}) == [gaming_pc, office_pc]
+
+
+def test_add_when_pc_with_same_name_is_there_then_nothing_is_added(index, gaming_pc):
+    index.add(PC(name=gaming_pc.name, components={'ram': {}}))
+    assert index.find('ram', {}) == []
+
+
+def test_remove_when_pc_is_removed_then_it_is_not_found(index, gaming_pc, workstation):
+    index.remove(gaming_pc)
+    assert index.find('gpu', {'name': 'Nvidia RTX 3070'}) == [workstation]
+
+
+def test_update_when_component_is_swapped_then_old_spec_is_not_found(index, gaming_pc, workstation):
+    gaming_pc.swap_component(category='gpu', spec={'name': 'AMD RX 6800'})
+    assert index.find('gpu', {'name': 'Nvidia RTX 3070'}) == [workstation]
+    assert index.find('gpu', {'name': 'AMD RX 6800'}) == [gaming_pc]
+
+
+def test_update_when_component_is_updated_then_new_param_is_found(index, office_pc):
+    office_pc.update_component(category='cpu', param_name='name', param_value='Intel i9 9900K')
+    assert index.find('cpu', {'name': 'Intel i9 9900K'}) == [office_pc]
+
+
+def test_update_when_pc_not_indexed_then_nothing_changes(index):
+    pc = PC(name='not indexed')
+    pc.subscribe(index.update)
+    pc.add_component(category='ram')
+    assert index.find('ram', {}) == []
@@ -0,0 +1,96 @@
+from threading import Event, Thread
+
+from pytest import raises
+
+from pc_spec.locks import ReadWriteLock
+
+
+def __start(target) -> Thread:
+    thread = Thread(target=target, daemon=True)
+    thread.start()
+    return thread
+
+
+def test_read_when_other_reader_holds_lock_then_it_is_not_blocked():
+    lock = ReadWriteLock()
+    reading, done = Event(), Event()
+
+    def read():
+        with lock.read():
+            reading.set()
+            done.wait(5)
+
+    thread = __start(read)
+    assert reading.wait(5)
+
+    with lock.read():
+        done.set()
+
+    thread.join(5)
+    assert not thread.is_alive()
+
+
+def test_write_when_reader_holds_lock_then_it_waits_for_reader():
+    lock = ReadWriteLock()
+    events = []
+    writing = Event()
+
+    def write():
+        writing.set()
+        with lock.write():
+            events.append('write')
+
+    with lock.read():
+        thread = __start(write)
+        assert writing.wait(5)
+        thread.join(0.1)
+        events.append('read')
+
+    thread.join(5)
+    assert events == ['read', 'write']
+
+
+def test_read_when_writer_holds_lock_then_it_waits_for_writer():
+    lock = ReadWriteLock()
+    events = []
+    reading = Event()
+
+    def read():
+        reading.set()
+        with lock.read():
+            events.append('read')
+
+    with lock.write():
+        thread = __start(read)
+        assert reading.wait(5)
+        thread.join(0.1)
+        events.append('write')
+
+    thread.join(5)
+    assert events == ['write', 'read']
+
+
+def test_write_when_lock_is_reentered_then_it_is_not_blocked():
+    lock = ReadWriteLock()
+
+    with lock.write():
+        with lock.write():
+            with lock.read():
+                with lock.read():
+                    pass
+
+    with lock.read():
+        with lock.read():
+            pass
+
+
+def test_write_when_reader_tries_to_become_writer_then_error_is_raised():
+    lock = ReadWriteLock()
+
+    with lock.read():
+        with raises(RuntimeError):
+            with lock.write():
+                pass
+
+    with lock.write():
+        pass
@@ -0,0 +1,119 @@
+from io import BytesIO
+from unittest.mock import Mock
+
+from pytest import fixture, raises
+
+from pc_spec.formats import BinaryFormat
+from pc_spec.mapped import MappedPCs
+from pc_spec.pc import PC
+from pc_spec.store import Store
+
+
+@fixture
+def serialized_pcs():
+    return [{f'pc_{pc_id}': {'cpu': {'name': 'Intel i7 9700K', 'id': str(pc_id)}}} for pc_id in range(100)]
+
+
+@fixture
+def buffer(serialized_pcs):
+    binary_file = BytesIO()
+    BinaryFormat().write(serialized_pcs, binary_file)
+    return binary_file.getvalue()
+
+
+@fixture
+def mapped_pcs(buffer):
+    return MappedPCs(buffer)
+
+
+def test_new_mapped_pcs_has_nothing_loaded(mapped_pcs, serialized_pcs):
+    assert len(mapped_pcs) == len(serialized_pcs)
+    assert mapped_pcs.loaded == 0
+
+
+def test_new_mapped_pcs_when_buffer_is_not_binary_store_then_error_is_raised():
+    with raises(ValueError):
+        MappedPCs(b'[{"pc": {}}]' * 10)
+
+
+def test_getitem_when_pc_is_there_then_only_it_is_loaded(mapped_pcs):
+    pc = mapped_pcs['pc_42']
+    assert pc.name == 'pc_42'
+    assert pc.components == {'cpu': {'name': 'Intel i7 9700K', 'id': '42'}}
+    assert mapped_pcs.loaded == 1
+    assert mapped_pcs['pc_42'] is pc
+
+
+def test_getitem_when_pc_not_there_then_error_is_raised(mapped_pcs):
+    with raises(KeyError):
+        mapped_pcs['not existing pc']
+
+
+def test_getitem_when_pc_is_loaded_then_on_load_is_called(mapped_pcs):
+    mapped_pcs.on_load = Mock()
+    pc = mapped_pcs['pc_1']
+    mapped_pcs['pc_1']
+    mapped_pcs.on_load.assert_called_once_with(pc)
+
+
+def test_contains_when_pc_is_there_then_it_is_not_loaded(mapped_pcs):
+    assert 'pc_7' in mapped_pcs
+    assert 'not existing pc' not in mapped_pcs
+    assert mapped_pcs.loaded == 0
+
+
+def test_setitem_when_pc_is_added_then_it_is_iterated_last(mapped_pcs, serialized_pcs):
+    pc = PC(name='new pc')
+    mapped_pcs[pc.name] = pc
+    assert mapped_pcs[pc.name] is pc
+    assert len(mapped_pcs) == len(serialized_pcs) + 1
+    assert list(mapped_pcs)[-1] == pc.name
+
+
+def test_setitem_when_pc_from_file_is_replaced_then_its_position_is_kept(mapped_pcs):
+    pc = PC(name='pc_0')
+    mapped_pcs[pc.name] = pc
+    assert mapped_pcs['pc_0'] is pc
+    assert list(mapped_pcs)[0] == pc.name
+
+
+def test_delitem_when_pc_from_file_is_removed_then_it_is_hidden(mapped_pcs, serialized_pcs):
+    del mapped_pcs['pc_3']
+    assert 'pc_3' not in mapped_pcs
+    assert 'pc_3' not in list(mapped_pcs)
+    assert len(mapped_pcs) == len(serialized_pcs) - 1
+
+    with raises(KeyError):
+        mapped_pcs['pc_3']
+
+
+def test_delitem_when_removed_pc_is_added_again_then_new_one_is_kept(mapped_pcs, serialized_pcs):
+    del mapped_pcs['pc_3']
+    pc = PC(name='pc_3')
+    mapped_pcs[pc.name] = pc
+    assert mapped_pcs['pc_3'] is pc
+    assert list(mapped_pcs)[-1] == pc.name
+    assert len(mapped_pcs) == len(serialized_pcs)
+
+
+def test_delitem_when_pc_not_there_then_error_is_raised(mapped_pcs):
+    with raises(KeyError):
+        del mapped_pcs['not existing pc']
+
+
+def test_values_when_iterated_then_all_pcs_are_loaded_in_order(mapped_pcs, serialized_pcs):
+    assert [{pc.name: pc.components} for pc in mapped_pcs.values()] == serialized_pcs
+    assert mapped_pcs.loaded == len(serialized_pcs)
+
+
+def test_store_when_backed_by_mapped_pcs_then_loaded_pcs_are_tracked(mapped_pcs):
+    store = Store(mapping=mapped_pcs)
+    listener = Mock()
+    store.subscribe(listener)
+
+    pc = store.get_pc('pc_5')
+    pc.update_component(category='cpu', param_name='name', param_value='AMD Ryzen 5 5900X')
+    listener.assert_called_once()
+
+    assert store.find_by_component('cpu', name='AMD Ryzen 5 5900X') == [pc]
+    assert len(store.find_by_component('cpu', name='Intel i7 9700K')) == 99
@@ -0,0 +1,118 @@
+from asyncio import run
+from json import loads
+from pathlib import Path
+from shutil import rmtree
+
+from pytest import fixture
+
+import pc_spec.data
+from pc_spec import metrics
+from pc_spec.data import iter_store, save_store
+from pc_spec.metrics import MetricsRegistry
+from pc_spec.pc import PC
+from pc_spec.store import Store
+
+
+@fixture
+def test_dir_path():
+    return Path('test_data', 'test_metrics')
+
+
+@fixture
+def remove_test_dir(test_dir_path, request):
+    def teardown():
+        if test_dir_path.is_dir():
+            rmtree(test_dir_path.parent)
+    request.addfinalizer(teardown)
+
+
+@fixture
+def registry(request):
+    request.addfinalizer(metrics.disable)
+    return metrics.enable()
+
+
+def test_enable_when_store_and_pc_are_used_then_calls_are_recorded(registry):
+    store = Store()
+    pc = PC(name='gaming')
+    store.add_pc(pc)
+    store.get_pc('gaming')
+    store.get_pc('office')
+    pc.add_component('cpu')
+
+    operations = registry.operations
+    assert operations['Store.get_pc'].calls == 2
+    assert operations['Store.add_pc'].calls == 1
+    assert operations['PC.add_component'].calls == 1
+    assert sum(operations['Store.get_pc'].buckets) == 2
+    assert 'Store.remove_pc' not in operations
+
+
+def test_enable_when_store_is_saved_and_loaded_then_bytes_are_recorded(registry, test_dir_path, remove_test_dir):
+    pc_spec.data.save_store(Store([PC(name='gaming', components={'cpu': {}})]), test_dir_path)
+    file_size = Path(test_dir_path, 'store.json').stat().st_size
+    pc_spec.data.load_store(test_dir_path)
+    run(pc_spec.data.async_load_store(test_dir_path, format='json'))
+
+    operations = registry.operations
+    assert operations['data.save_store'].calls == 1
+    assert operations['data.load_store'].calls == 2
+    assert operations['data.async_load_store'].calls == 1
+    assert operations['data.iter_store'].calls == 2
+    assert operations['JsonFormat.write'].bytes_written == file_size
+    assert operations['JsonFormat.read'].bytes_read == 2 * file_size
+    assert operations['Journal.replay'].calls == 2
+
+
+def test_disable_when_called_then_nothing_is_recorded_and_methods_are_restored(
+        registry, test_dir_path, remove_test_dir):
+    original_add_pc = vars(Store)['add_pc'].__wrapped__
+    metrics.disable()
+    Store().add_pc(PC(name='gaming'))
+    save_store(Store(), test_dir_path, force=True)
+
+    assert list(iter_store(test_dir_path)) == []
+    assert registry.operations == {}
+    assert vars(Store)['add_pc'] is original_add_pc
+    assert metrics.get_registry() is None
+
+
+def test_enable_when_operations_were_imported_and_store_was_created_before_then_calls_are_recorded(
+        request, test_dir_path, remove_test_dir):
+    store = Store(concurrent=True)
+    request.addfinalizer(metrics.disable)
+    registry = metrics.enable()
+
+    store.add_pc(PC(name='gaming'))
+    save_store(store, test_dir_path)
+
+    operations = registry.operations
+    assert operations['Store.add_pc'].calls == 1
+    assert operations['data.save_store'].calls == 1
+
+
+def test_enable_when_given_registry_then_it_is_used(request):
+    request.addfinalizer(metrics.disable)
+    registry = MetricsRegistry()
+    assert metrics.enable(registry) is registry
+    assert metrics.enable(registry) is registry
+    Store().add_pc(PC(name='gaming'))
+    assert registry.operations['Store.add_pc'].calls == 1
+
+
+def test_to_json_when_calls_are_recorded_then_they_are_exported():
+    registry = MetricsRegistry()
+    registry.record('Store.add_pc', 0.000003)
+    registry.record('Store.add_pc', 0.000005, bytes_read=10)
+    registry.record('data.save_store', 100.0, bytes_written=20)
+
+    exported = loads(registry.to_json())
+    assert list(exported) == ['Store.add_pc', 'data.save_store']
+    assert exported['Store.add_pc']['calls'] == 2
+    assert exported['Store.add_pc']['histogram'] == [[0.000004, 1], [0.000008, 1]]
+    assert exported['Store.add_pc']['bytes_read'] == 10
+    assert exported['data.save_store']['histogram'] == [[None, 1]]
+    assert exported['data.save_store']['bytes_written'] == 20
+
+    registry.reset()
+    assert loads(registry.to_json()) == {}
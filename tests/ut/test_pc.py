@@ -1,6 +1,8 @@
-from pytest import fixture
+from unittest.mock import Mock
 
-from pc_spec.pc import PC
+from pytest import fixture, raises
+
+from pc_spec.pc import PC, ComponentChange, FrozenSpec
 
 
 @fixture
@@ -134,3 +136,132 @@ def test_update_component_when_param_is_there_then_it_is_updated(pc_with_cpu, cp
     freq_value = '5.0 GHz'
     pc_with_cpu.update_component(category=cpu, param_name=freq_name, param_value=freq_value)
     assert pc_with_cpu.components == {cpu: {'name': 'Intel i7 9700K', freq_name: freq_value}}
+
+
+def test_subscribe_when_component_is_added_then_listener_is_notified(pc, cpu, cpu_intel_spec):
+    listener = Mock()
+    pc.subscribe(listener)
+    pc.add_component(category=cpu, spec=cpu_intel_spec)
+    listener.assert_called_once_with(pc, ComponentChange('add', cpu, None, cpu_intel_spec))
+
+
+def test_subscribe_when_component_is_removed_then_listener_is_notified(pc_with_cpu, cpu, cpu_intel_spec):
+    listener = Mock()
+    pc_with_cpu.subscribe(listener)
+    pc_with_cpu.remove_component(category=cpu)
+    listener.assert_called_once_with(pc_with_cpu, ComponentChange('remove', cpu, cpu_intel_spec, None))
+
+
+def test_subscribe_when_component_is_swapped_then_listener_is_notified(pc_with_cpu, cpu, cpu_intel_spec, cpu_amd_spec):
+    listener = Mock()
+    pc_with_cpu.subscribe(listener)
+    pc_with_cpu.swap_component(category=cpu, spec=cpu_amd_spec)
+    listener.assert_called_once_with(pc_with_cpu, ComponentChange('swap', cpu, cpu_intel_spec, cpu_amd_spec))
+
+
+def test_subscribe_when_component_is_updated_then_listener_is_notified(pc_with_cpu, cpu, cpu_intel_spec, cpu_freq):
+    freq_name, freq_value = cpu_freq
+    old_spec = dict(cpu_intel_spec)
+    listener = Mock()
+    pc_with_cpu.subscribe(listener)
+    pc_with_cpu.update_component(category=cpu, param_name=freq_name, param_value=freq_value)
+    listener.assert_called_once_with(
+        pc_with_cpu, ComponentChange('update', cpu, old_spec, {**old_spec, freq_name: freq_value}))
+
+
+def test_subscribe_when_nothing_changes_then_listener_is_not_notified(pc_with_cpu, cpu, cpu_amd_spec, ram):
+    listener = Mock()
+    pc_with_cpu.subscribe(listener)
+    pc_with_cpu.add_component(category=cpu, spec=cpu_amd_spec)
+    pc_with_cpu.remove_component(category=ram)
+    pc_with_cpu.swap_component(category=ram)
+    pc_with_cpu.update_component(category=ram, param_name='frequency', param_value='3200 MHz')
+    listener.assert_not_called()
+
+
+def test_subscribe_when_listener_is_subscribed_twice_then_it_is_notified_once(pc, cpu):
+    listener = Mock()
+    pc.subscribe(listener)
+    pc.subscribe(listener)
+    pc.add_component(category=cpu)
+    listener.assert_called_once()
+
+
+def test_unsubscribe_when_listener_is_unsubscribed_then_it_is_not_notified(pc, cpu):
+    listener = Mock()
+    pc.subscribe(listener)
+    pc.unsubscribe(listener)
+    pc.add_component(category=cpu)
+    listener.assert_not_called()
+
+
+def test_add_guard_when_component_is_changed_then_guard_makes_the_change(pc_with_cpu, cpu, cpu_freq):
+    freq_name, freq_value = cpu_freq
+    calls = []
+
+    def guard(guarded_pc, apply):
+        calls.append(('before', guarded_pc.components[cpu].get(freq_name)))
+        change = apply()
+        calls.append(('after', guarded_pc.components[cpu].get(freq_name)))
+        return change
+
+    listener = Mock(side_effect=lambda *_: calls.append(('listener', None)))
+    pc_with_cpu.subscribe(listener)
+    pc_with_cpu.add_guard(guard)
+    pc_with_cpu.update_component(category=cpu, param_name=freq_name, param_value=freq_value)
+    pc_with_cpu.remove_guard(guard)
+    pc_with_cpu.remove_component(category=cpu)
+
+    assert calls == [('before', None), ('after', freq_value), ('listener', None), ('listener', None)]
+
+
+def test_update_component_when_changed_then_components_got_before_are_not_changed(pc_with_cpu, cpu, cpu_freq):
+    freq_name, freq_value = cpu_freq
+    components = pc_with_cpu.components
+    pc_with_cpu.update_component(category=cpu, param_name=freq_name, param_value=freq_value)
+    pc_with_cpu.add_component(category='gpu')
+
+    assert components == {cpu: {'name': 'Intel i7 9700K'}}
+    assert pc_with_cpu.components == {cpu: {'name': 'Intel i7 9700K', freq_name: freq_value}, 'gpu': {}}
+
+
+def test_version_when_components_are_changed_then_it_grows(pc, cpu, cpu_intel_spec, cpu_freq):
+    freq_name, freq_value = cpu_freq
+    assert pc.version == 0
+    pc.add_component(category=cpu)
+    pc.add_component(category=cpu)
+    pc.swap_component(category=cpu, spec=cpu_intel_spec)
+    pc.update_component(category=cpu, param_name=freq_name, param_value=freq_value)
+    assert pc.components[cpu][freq_name] == freq_value
+    pc.remove_component(category=cpu)
+    pc.remove_component(category=cpu)
+    assert pc.version == 4
+
+
+def test_pc_has_no_instance_dict(pc):
+    assert not hasattr(pc, '__dict__')
+
+
+def test_frozen_spec_when_created_then_it_equals_spec(cpu_intel_spec_with_freq):
+    frozen_spec = FrozenSpec(cpu_intel_spec_with_freq)
+    assert frozen_spec == cpu_intel_spec_with_freq
+    assert cpu_intel_spec_with_freq == frozen_spec
+    assert dict(frozen_spec) == cpu_intel_spec_with_freq
+    assert list(frozen_spec) == list(cpu_intel_spec_with_freq)
+    assert len(frozen_spec) == len(cpu_intel_spec_with_freq)
+
+
+def test_frozen_spec_when_param_not_there_then_error_is_raised(cpu_intel_spec):
+    frozen_spec = FrozenSpec(cpu_intel_spec)
+    assert frozen_spec.get('frequency') is None
+
+    with raises(KeyError):
+        frozen_spec['frequency']
+
+
+def test_frozen_spec_when_updated_then_error_is_raised(pc, cpu, cpu_intel_spec, cpu_freq):
+    freq_name, freq_value = cpu_freq
+    pc.add_component(category=cpu, spec=FrozenSpec(cpu_intel_spec))
+
+    with raises(TypeError):
+        pc.update_component(category=cpu, param_name=freq_name, param_value=freq_value)
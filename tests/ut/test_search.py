@@ -0,0 +1,84 @@
+from pytest import fixture
+
+from pc_spec.pc import PC
+from pc_spec.search import Match, SearchIndex
+from pc_spec.store import Store
+
+
+@fixture
+def store():
+    return Store(pcs=[PC(name='Gaming', components={'cpu': {'name': 'i7-9700K', 'freq': '3.6 GHz'},
+                                                    'gpu': {'name': 'RTX 3070'}}),
+                      PC(name='office', components={'cpu': {'name': 'i3-10100'}}),
+                      PC(name='server', components={'cpu': {'name': 'i7-9700K'}, 'hdd': {'name': 'i7-9700K'}})])
+
+
+@fixture
+def index(store):
+    index = SearchIndex(store.pcs)
+    store.subscribe(index.apply)
+    return index
+
+
+def test_complete_when_terms_start_with_prefix_then_they_are_found_alphabetically(index):
+    assert index.complete('i') == ['i3-10100', 'i7-9700K']
+    assert index.complete('I7-') == ['i7-9700K']
+    assert index.complete('g') == ['Gaming']
+    assert index.complete('i', limit=1) == ['i3-10100']
+    assert index.complete('x') == []
+
+
+def test_search_when_query_has_typo_then_similar_terms_are_ranked(index):
+    assert index.search('i7-9700k') == [Match('i7-9700K', 1.0)]
+    assert index.search('servr') == [Match('server', 4 / 9)]
+    assert [match.term for match in index.search('i7-10100', min_score=0.1)] == ['i3-10100', 'i7-9700K']
+    assert index.search('laptop') == []
+
+
+def test_find_when_term_is_indexed_then_pcs_having_it_are_found(index, store):
+    assert index.find('I7-9700K') == [store.get_pc('Gaming'), store.get_pc('server')]
+    assert index.find('office') == [store.get_pc('office')]
+    assert index.find('laptop') == []
+
+
+def test_apply_when_store_changes_then_index_follows_it(index, store):
+    store.remove_pc('server')
+    store.add_pc(PC(name='laptop', components={'ram': {'size': '16 GB'}}))
+    store.get_pc('Gaming').update_component(category='cpu', param_name='name', param_value='i9-9900K')
+    store.get_pc('office').swap_component(category='cpu', spec={'name': 'i5-10400'})
+
+    assert index.complete('i') == ['i5-10400', 'i9-9900K']
+    assert index.find('16 gb') == [store.get_pc('laptop')]
+    assert index.find('server') == []
+    assert len(index) == 8
+
+
+def test_remove_when_value_is_repeated_in_pc_then_it_stays_until_last_occurrence_is_removed(index, store):
+    store.get_pc('server').remove_component('hdd')
+    assert index.find('i7-9700K') == [store.get_pc('Gaming'), store.get_pc('server')]
+
+    store.get_pc('server').remove_component('cpu')
+    assert index.find('i7-9700K') == [store.get_pc('Gaming')]
+
+
+def test_complete_when_terms_are_added_and_removed_between_searches_then_only_indexed_terms_are_found(index, store):
+    store.add_pc(PC(name='laptop', components={'cpu': {'name': 'i5-1135G7'}}))
+    store.remove_pc('laptop')
+    store.add_pc(PC(name='nas', components={'cpu': {'name': 'i5-1135G7'}}))
+    assert index.complete('i') == ['i3-10100', 'i5-1135G7', 'i7-9700K']
+
+    store.remove_pc('office')
+    store.add_pc(PC(name='htpc', components={'cpu': {'name': 'i3-10105'}}))
+    assert index.complete('i') == ['i3-10105', 'i5-1135G7', 'i7-9700K']
+
+
+def test_apply_when_same_component_is_changed_many_times_then_index_has_only_its_last_values(index, store):
+    pc = store.get_pc('Gaming')
+    pc.update_component(category='cpu', param_name='freq', param_value='4 GHz')
+    pc.swap_component(category='cpu', spec={'freq': pc.components['cpu']['freq']})
+    pc.update_component(category='cpu', param_name='cores', param_value='8')
+
+    assert pc.components['cpu'] == {'freq': '4 GHz', 'cores': '8'}
+    assert index.find('4 GHz') == [pc]
+    assert index.find('3.6 GHz') == []
+    assert index.find('i7-9700K') == [store.get_pc('server')]
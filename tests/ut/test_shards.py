@@ -0,0 +1,101 @@
+from pathlib import Path
+from shutil import rmtree
+
+from pytest import fixture, raises
+
+from pc_spec.data import load_store, save_store
+from pc_spec.pc import PC, FrozenSpec
+from pc_spec.shards import save_sharded_store, load_sharded_store, get_shard
+from pc_spec.store import Store
+
+
+@fixture
+def test_dir_path():
+    return Path('test_data', 'test_shards')
+
+
+@fixture
+def remove_test_dir(test_dir_path, request):
+    def teardown():
+        if test_dir_path.is_dir():
+            rmtree(test_dir_path.parent)
+    request.addfinalizer(teardown)
+
+
+@fixture
+def store():
+    return Store(pcs=[PC(name=f'pc_{pc_id}', components={'cpu': {'name': f'cpu_{pc_id % 3}'}}) for pc_id in range(20)])
+
+
+def __content(store):
+    return sorted((pc.name, {category: dict(spec) for category, spec in pc.components.items()}) for pc in store.pcs)
+
+
+def test_get_shard_when_name_is_given_then_shard_is_in_range():
+    assert {get_shard(name=f'pc_{pc_id}', shards=4) for pc_id in range(100)} == {0, 1, 2, 3}
+    assert get_shard(name='pc', shards=4) == get_shard(name='pc', shards=4)
+
+
+def test_save_sharded_store_when_saved_then_it_is_loaded(store, test_dir_path, remove_test_dir):
+    assert save_sharded_store(store=store, target_dir=test_dir_path, shards=4, workers=2) == [0, 1, 2, 3]
+    loaded_store = load_sharded_store(source_dir=test_dir_path, workers=2)
+
+    assert __content(loaded_store) == __content(store)
+    assert not loaded_store.is_dirty
+    assert not store.is_dirty
+
+
+def test_save_sharded_store_when_saved_then_each_shard_is_store_dir(store, test_dir_path, remove_test_dir):
+    save_sharded_store(store=store, target_dir=test_dir_path, shards=3, workers=1, format='binary')
+
+    for shard in range(3):
+        shard_store = load_store(source_dir=Path(test_dir_path, f'shard-{shard}-of-3'), format='binary')
+        assert shard_store.pcs
+        assert {get_shard(name=pc.name, shards=3) for pc in shard_store.pcs} == {shard}
+
+
+def test_save_sharded_store_when_few_pcs_changed_then_only_their_shards_are_rewritten(
+        store, test_dir_path, remove_test_dir):
+    save_sharded_store(store=store, target_dir=test_dir_path, shards=4, workers=1)
+    assert save_sharded_store(store=store, target_dir=test_dir_path, shards=4, workers=1) == []
+
+    store.get_pc('pc_1').add_component(category='gpu')
+    store.remove_pc('pc_2')
+    expected_shards = sorted({get_shard(name='pc_1', shards=4), get_shard(name='pc_2', shards=4)})
+    assert save_sharded_store(store=store, target_dir=test_dir_path, shards=4, workers=1) == expected_shards
+    assert __content(load_sharded_store(source_dir=test_dir_path, workers=1)) == __content(store)
+
+
+def test_save_sharded_store_when_store_was_saved_elsewhere_then_all_shards_are_rewritten(
+        store, test_dir_path, remove_test_dir):
+    save_sharded_store(store=store, target_dir=test_dir_path, shards=4, workers=1)
+    store.get_pc('pc_1').add_component(category='gpu')
+    save_store(store=store, target_dir=Path(test_dir_path.parent, 'test_json'))
+
+    assert save_sharded_store(store=store, target_dir=test_dir_path, shards=4, workers=1) == [0, 1, 2, 3]
+    assert __content(load_sharded_store(source_dir=test_dir_path, workers=1)) == __content(store)
+
+
+def test_save_sharded_store_when_number_of_shards_changes_then_store_is_resharded(
+        store, test_dir_path, remove_test_dir):
+    save_sharded_store(store=store, target_dir=test_dir_path, shards=4, workers=1)
+    assert save_sharded_store(store=store, target_dir=test_dir_path, shards=2, workers=1) == [0, 1]
+
+    assert sorted(path.name for path in test_dir_path.iterdir()) == ['shard-0-of-2', 'shard-1-of-2', 'shards.json']
+    assert __content(load_sharded_store(source_dir=test_dir_path, workers=1)) == __content(store)
+
+
+def test_save_sharded_store_when_number_of_shards_is_not_positive_then_error_is_raised(store, test_dir_path):
+    with raises(ValueError):
+        save_sharded_store(store=store, target_dir=test_dir_path, shards=0)
+
+
+def test_load_sharded_store_when_manifest_is_not_there_then_empty_store_is_loaded(test_dir_path):
+    assert load_sharded_store(source_dir=test_dir_path).pcs == []
+
+
+def test_load_sharded_store_when_read_only_then_specs_are_frozen(store, test_dir_path, remove_test_dir):
+    save_sharded_store(store=store, target_dir=test_dir_path, shards=2, workers=1)
+    loaded_store = load_sharded_store(source_dir=test_dir_path, workers=1, read_only=True)
+    assert isinstance(loaded_store.get_pc('pc_0').components['cpu'], FrozenSpec)
+    assert __content(loaded_store) == __content(store)
@@ -0,0 +1,79 @@
+from concurrent.futures import ProcessPoolExecutor
+
+from pytest import fixture, raises
+
+from pc_spec.pc import PC, FrozenSpec
+from pc_spec.shared import load_shared_store, save_shared_store
+from pc_spec.store import Store
+
+
+@fixture
+def segment():
+    store = Store(pcs=[PC(name='gaming', components={'cpu': {'name': 'i7-9700K'}, 'gpu': {}}),
+                       PC(name='office', components={'cpu': {'name': 'i3-10100'}})])
+    segment = save_shared_store(store)
+    yield segment
+    segment.close()
+    segment.unlink()
+
+
+def __get_components(segment_name, pc_name):
+    store = load_shared_store(segment_name)
+    components = store.get_pc(pc_name).components
+    store.close()
+    return components
+
+
+def test_load_shared_store_when_segment_is_attached_then_pcs_are_decoded_on_access(segment):
+    store = load_shared_store(segment.name)
+
+    assert store.get_pc('office').components == {'cpu': {'name': 'i3-10100'}}
+    assert isinstance(store.get_pc('office').components['cpu'], FrozenSpec)
+    assert store.get_pc('server') is None
+    assert [pc.name for pc in store.pcs] == ['gaming', 'office']
+    store.close()
+
+
+def test_load_shared_store_when_store_is_changed_then_segment_stays_the_same(segment):
+    store = load_shared_store(segment.name)
+    store.remove_pc('gaming')
+    store.add_pc(PC(name='server'))
+    store.close()
+
+    store = load_shared_store(segment.name)
+    assert [pc.name for pc in store.pcs] == ['gaming', 'office']
+    store.close()
+
+
+def test_load_shared_store_when_attached_by_other_processes_then_they_read_the_same_pcs(segment):
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        results = list(executor.map(__get_components, [segment.name] * 2, ['gaming', 'office']))
+
+    assert results == [{'cpu': {'name': 'i7-9700K'}, 'gpu': {}}, {'cpu': {'name': 'i3-10100'}}]
+
+
+def test_save_shared_store_when_store_is_empty_then_empty_store_is_loaded():
+    segment = save_shared_store(Store())
+    store = load_shared_store(segment.name)
+
+    assert store.pcs == []
+    store.close()
+    segment.close()
+    segment.unlink()
+
+
+def test_load_shared_store_when_segment_does_not_exist_then_error_is_raised():
+    with raises(FileNotFoundError):
+        load_shared_store('pc_spec_missing_segment')
+
+
+def test_load_shared_store_when_segment_does_not_contain_store_then_error_is_raised():
+    segment = save_shared_store(Store())
+    segment.buf[:] = bytes(segment.size)
+
+    try:
+        with raises(ValueError):
+            load_shared_store(segment.name)
+    finally:
+        segment.close()
+        segment.unlink()
@@ -0,0 +1,147 @@
+from pathlib import Path
+from shutil import rmtree
+
+from pytest import fixture
+
+from pc_spec.data import save_store
+from pc_spec.pc import PC
+from pc_spec.sqlite import SqliteDatabase, save_sqlite_store, load_sqlite_store
+from pc_spec.store import Store, StoreChanges
+
+
+@fixture
+def test_dir_path():
+    return Path('test_data', 'test_sqlite')
+
+
+@fixture
+def remove_test_dir(test_dir_path, request):
+    def teardown():
+        if test_dir_path.is_dir():
+            rmtree(test_dir_path.parent)
+    request.addfinalizer(teardown)
+
+
+@fixture
+def database(test_dir_path, remove_test_dir):
+    test_dir_path.mkdir(parents=True)
+    with SqliteDatabase(Path(test_dir_path, 'test.sqlite')) as database:
+        yield database
+
+
+@fixture
+def gaming_pc():
+    return PC(name='gaming', components={'cpu': {'name': 'i7-9700K', 'freq': '3.6 GHz'}, 'gpu': {'name': 'RTX 3070'}})
+
+
+@fixture
+def office_pc():
+    return PC(name='office', components={'cpu': {'name': 'i3-10100'}, 'ram': {}})
+
+
+def __content(pcs):
+    return [(pc.name, pc.components) for pc in pcs]
+
+
+def test_get_pc_when_pc_is_there_then_it_is_read(database, gaming_pc, office_pc):
+    database.put_pc(gaming_pc)
+    database.put_pc(office_pc)
+
+    assert __content([database.get_pc('office')]) == __content([office_pc])
+    assert database.get_pc('workstation') is None
+    assert database.names == ['gaming', 'office']
+
+
+def test_put_pc_when_pc_is_there_then_it_is_replaced_in_place(database, gaming_pc, office_pc):
+    database.put_pc(gaming_pc)
+    database.put_pc(office_pc)
+    database.put_pc(PC(name='gaming', components={'ram': {'size': '32 GB'}}))
+
+    assert __content(database.iter_pcs()) == [('gaming', {'ram': {'size': '32 GB'}}), ('office', office_pc.components)]
+
+
+def test_component_writes_when_made_then_they_are_read(database, gaming_pc):
+    database.put_pc(gaming_pc)
+    database.update_component('gaming', 'cpu', 'name', 'i9-9900K')
+    database.update_component('gaming', 'cpu', 'cores', '8')
+    database.delete_component('gaming', 'gpu')
+    database.put_component('gaming', 'mobo', {'format': 'ATX'})
+    database.update_component('gaming', 'psu', 'power', '650 W')
+    database.commit()
+
+    assert database.get_pc('gaming').components == {'cpu': {'name': 'i9-9900K', 'freq': '3.6 GHz', 'cores': '8'},
+                                                    'mobo': {'format': 'ATX'}}
+    assert database.find_names('mobo') == ['gaming']
+
+
+def test_delete_pc_when_pc_is_there_then_it_is_deleted(database, gaming_pc, office_pc):
+    database.put_pc(gaming_pc)
+    database.put_pc(office_pc)
+    database.delete_pc('gaming')
+
+    assert database.names == ['office']
+    assert database.find_names('gpu') == []
+
+
+def test_apply_when_subscribed_to_store_then_it_mirrors_the_store(database, gaming_pc, office_pc):
+    store = Store(pcs=[gaming_pc])
+    database.put_pc(gaming_pc)
+    store.subscribe(database.apply)
+    store.add_pc(office_pc)
+    gaming_pc.update_component('cpu', 'freq', '4 GHz')
+    gaming_pc.remove_component('gpu')
+    office_pc.swap_component('cpu', {'name': 'i5-10400'})
+    store.remove_pc('office')
+    store.add_pc(PC(name='server'))
+
+    assert __content(database.iter_pcs()) == [('gaming', {'cpu': {'name': 'i7-9700K', 'freq': '4 GHz'}}),
+                                              ('server', {})]
+
+
+def test_save_sqlite_store_when_saved_then_it_is_loaded(test_dir_path, gaming_pc, office_pc, remove_test_dir):
+    store = Store(pcs=[gaming_pc, office_pc])
+    assert save_sqlite_store(store, test_dir_path) == StoreChanges(changed=[gaming_pc, office_pc], removed=[])
+
+    loaded_store = load_sqlite_store(test_dir_path)
+    assert __content(loaded_store.pcs) == __content(store.pcs)
+    assert not loaded_store.is_dirty
+
+
+def test_save_sqlite_store_when_saved_again_then_only_changes_are_written(
+        test_dir_path, gaming_pc, office_pc, remove_test_dir):
+    store = Store(pcs=[gaming_pc, office_pc])
+    save_sqlite_store(store, test_dir_path)
+
+    with SqliteDatabase(Path(test_dir_path, 'store.sqlite')) as database:
+        database.put_pc(PC(name='office', components={'hdd': {}}))
+
+    gaming_pc.add_component('ram')
+    assert save_sqlite_store(store, test_dir_path) == StoreChanges(changed=[gaming_pc], removed=[])
+    expected_content = [('gaming', gaming_pc.components), ('office', {'hdd': {}})]
+    assert __content(load_sqlite_store(test_dir_path).pcs) == expected_content
+
+    save_sqlite_store(store, test_dir_path, force=True)
+    assert __content(load_sqlite_store(test_dir_path).pcs) == __content(store.pcs)
+
+
+def test_save_sqlite_store_when_store_was_saved_elsewhere_then_all_pcs_are_written(
+        test_dir_path, gaming_pc, office_pc, remove_test_dir):
+    save_sqlite_store(Store(pcs=[office_pc]), test_dir_path)
+    store = Store(pcs=[gaming_pc])
+    save_store(store, Path(test_dir_path, 'json'))
+
+    assert save_sqlite_store(store, test_dir_path) == StoreChanges(changed=[], removed=[])
+    assert __content(load_sqlite_store(test_dir_path).pcs) == __content(store.pcs)
+
+
+def test_save_sqlite_store_when_saved_in_other_order_then_it_is_loaded_in_that_order(
+        test_dir_path, gaming_pc, office_pc, remove_test_dir):
+    save_sqlite_store(Store(pcs=[gaming_pc, office_pc]), test_dir_path)
+    store = Store(pcs=[office_pc, PC(name='server'), gaming_pc])
+
+    save_sqlite_store(store, test_dir_path, force=True)
+    assert __content(load_sqlite_store(test_dir_path).pcs) == __content(store.pcs)
+
+
+def test_load_sqlite_store_when_database_is_not_there_then_empty_store_is_loaded(test_dir_path):
+    assert load_sqlite_store(test_dir_path).pcs == []
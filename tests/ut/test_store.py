@@ -1,8 +1,11 @@
-from unittest.mock import Mock
+from threading import Thread
+from unittest.mock import Mock, call
 
 from pytest import fixture
 
-from pc_spec.store import Store
+from pc_spec.cached import CachedPCs, CacheStats
+from pc_spec.pc import PC, ComponentChange
+from pc_spec.store import AddResult, RemoveResult, Store, StoreChange, StoreChanges
 
 
 @fixture
@@ -66,3 +69,331 @@ def test_remove_pc_when_pc_with_same_name_not_there_then_nothing_is_removed(stor
 def test_remove_pc_when_pc_with_same_name_is_there_then_it_is_removed(store_with_pc, pc):
     store_with_pc.remove_pc(name=pc.name)
     assert store_with_pc.pcs == []
+
+
+def test_new_custom_store_when_pcs_share_name_then_first_one_is_stored(pc):
+    new_pc = Mock()
+    new_pc.name = pc.name
+    store = Store(pcs=[pc, new_pc])
+    assert store.pcs == [pc]
+
+
+def test_remove_pc_when_pc_is_removed_then_order_of_other_pcs_is_kept(store):
+    pcs = [Mock() for _ in range(4)]
+    for pc_id, pc in enumerate(pcs):
+        pc.name = f'pc_{pc_id}'
+        store.add_pc(pc=pc)
+
+    store.remove_pc(name='pc_1')
+    store.add_pc(pc=pcs[1])
+    assert store.pcs == [pcs[0], pcs[2], pcs[3], pcs[1]]
+
+
+def test_find_by_component_when_pcs_match_then_they_are_found(store):
+    gaming_pc = PC(name='gaming rig', components={'gpu': {'name': 'Nvidia RTX 3070'}})
+    office_pc = PC(name='office pc', components={'cpu': {'name': 'Intel i7 9700K'}})
+    store.add_pc(pc=gaming_pc)
+    store.add_pc(pc=office_pc)
+    assert store.find_by_component('gpu', name='Nvidia RTX 3070') == [gaming_pc]
+    assert store.find_by_component('cpu') == [office_pc]
+
+
+def test_find_by_component_when_stored_pc_is_changed_then_index_follows(store):
+    pc = PC(name='gaming rig', components={'gpu': {'name': 'Nvidia RTX 3070'}})
+    store.add_pc(pc=pc)
+    assert store.find_by_component('gpu', name='Nvidia RTX 3070') == [pc]
+
+    pc.update_component(category='gpu', param_name='name', param_value='Nvidia RTX 3080')
+    assert store.find_by_component('gpu', name='Nvidia RTX 3070') == []
+    assert store.find_by_component('gpu', name='Nvidia RTX 3080') == [pc]
+
+    pc.remove_component(category='gpu')
+    pc.add_component(category='cpu', spec={'name': 'Intel i7 9700K'})
+    assert store.find_by_component('gpu') == []
+    assert store.find_by_component('cpu', name='Intel i7 9700K') == [pc]
+
+
+def test_find_by_component_when_pcs_added_or_removed_then_index_follows(store):
+    pc = PC(name='gaming rig', components={'gpu': {'name': 'Nvidia RTX 3070'}})
+    assert store.find_by_component('gpu') == []
+
+    store.add_pc(pc=pc)
+    assert store.find_by_component('gpu') == [pc]
+
+    store.remove_pc(name=pc.name)
+    pc.add_component(category='cpu')
+    assert store.find_by_component('gpu') == []
+    assert store.find_by_component('cpu') == []
+
+
+def test_subscribe_when_pcs_are_added_and_removed_then_listener_is_notified(store, pc):
+    listener = Mock()
+    store.subscribe(listener)
+    store.add_pc(pc=pc)
+    store.add_pc(pc=pc)
+    store.remove_pc(name=pc.name)
+    store.remove_pc(name=pc.name)
+    assert listener.call_args_list == [call(StoreChange('add_pc', pc)), call(StoreChange('remove_pc', pc))]
+
+
+def test_subscribe_when_stored_pc_is_changed_then_listener_is_notified(store):
+    pc = PC(name='gaming rig')
+    store.add_pc(pc=pc)
+    listener = Mock()
+    store.subscribe(listener)
+    pc.add_component(category='cpu')
+    listener.assert_called_once_with(StoreChange('change_component', pc, ComponentChange('add', 'cpu', None, {})))
+
+
+def test_subscribe_when_removed_pc_is_changed_then_listener_is_not_notified(store):
+    pc = PC(name='gaming rig')
+    store.add_pc(pc=pc)
+    store.remove_pc(name=pc.name)
+    listener = Mock()
+    store.subscribe(listener)
+    pc.add_component(category='cpu')
+    listener.assert_not_called()
+
+
+def test_unsubscribe_when_listener_is_unsubscribed_then_it_is_not_notified(store, pc):
+    listener = Mock()
+    store.subscribe(listener)
+    store.unsubscribe(listener)
+    store.add_pc(pc=pc)
+    listener.assert_not_called()
+
+
+@fixture
+def pcs():
+    pcs = [Mock() for _ in range(8)]
+    for pc_id, pc in enumerate(pcs):
+        pc.name = f'pc_{pc_id}'
+    return pcs
+
+
+@fixture
+def store_with_pcs(store, pcs):
+    store.add_pcs(pcs=pcs)
+    return store
+
+
+def test_add_pcs_when_pcs_not_there_then_they_are_added(store, pcs):
+    result = store.add_pcs(pcs=pcs)
+    assert store.pcs == pcs
+    assert result == AddResult(added=[pc.name for pc in pcs], duplicates=[])
+
+
+def test_add_pcs_when_duplicates_given_then_they_are_skipped(store_with_pc, pc, pcs):
+    new_pc = Mock()
+    new_pc.name = pc.name
+    result = store_with_pc.add_pcs(pcs=[pcs[0], new_pc, pcs[0]])
+    assert store_with_pc.pcs == [pc, pcs[0]]
+    assert result == AddResult(added=[pcs[0].name], duplicates=[pc.name, pcs[0].name])
+
+
+def test_get_pcs_when_names_given_then_pcs_are_returned_in_same_order(store_with_pcs, pcs, not_existing_pc_name):
+    assert store_with_pcs.get_pcs(names=['pc_3', not_existing_pc_name, 'pc_1']) == [pcs[3], None, pcs[1]]
+
+
+def test_remove_pcs_when_few_pcs_removed_then_others_are_kept_in_order(store_with_pcs, pcs, not_existing_pc_name):
+    result = store_with_pcs.remove_pcs(names=['pc_5', not_existing_pc_name, 'pc_5'])
+    assert store_with_pcs.pcs == pcs[:5] + pcs[6:]
+    assert result == RemoveResult(removed=['pc_5'], not_found=[not_existing_pc_name, 'pc_5'])
+
+
+def test_remove_pcs_when_most_pcs_removed_then_others_are_kept_in_order(store_with_pcs, pcs):
+    result = store_with_pcs.remove_pcs(names=[pc.name for pc in pcs[1:7]])
+    assert store_with_pcs.pcs == [pcs[0], pcs[7]]
+    assert store_with_pcs.get_pc(name='pc_3') is None
+    assert result == RemoveResult(removed=[pc.name for pc in pcs[1:7]], not_found=[])
+
+
+def test_remove_pcs_when_pcs_removed_then_listener_and_index_follow(store):
+    pcs = [PC(name=f'pc_{pc_id}', components={'cpu': {}}) for pc_id in range(4)]
+    store.add_pcs(pcs=pcs)
+    assert store.find_by_component('cpu') == pcs
+
+    listener = Mock()
+    store.subscribe(listener)
+    store.remove_pcs(names=['pc_0', 'pc_1', 'pc_2'])
+    assert listener.call_args_list == [call(StoreChange('remove_pc', pc)) for pc in pcs[:3]]
+    assert store.find_by_component('cpu') == [pcs[3]]
+
+    pcs[0].add_component(category='gpu')
+    assert store.find_by_component('gpu') == []
+
+
+def test_changes_when_store_is_new_then_its_pcs_are_changed(pc):
+    store = Store(pcs=[pc])
+    assert store.is_dirty
+    assert store.changes == StoreChanges(changed=[pc], removed=[])
+
+
+def test_changes_when_store_is_marked_clean_then_they_are_forgotten(store_with_pc):
+    version = store_with_pc.version
+    store_with_pc.mark_clean()
+    assert not store_with_pc.is_dirty
+    assert store_with_pc.changes == StoreChanges(changed=[], removed=[])
+    assert store_with_pc.version == version
+
+
+def test_changes_when_pcs_are_changed_then_only_they_are_reported(store):
+    pcs = [PC(name=f'pc_{pc_id}') for pc_id in range(4)]
+    store.add_pcs(pcs=pcs)
+    store.mark_clean()
+    version = store.version
+
+    pcs[2].add_component(category='cpu')
+    store.remove_pc(name='pc_0')
+    store.add_pc(pc=PC(name='pc_4'))
+    pcs[2].add_component(category='gpu')
+    pcs[0].add_component(category='gpu')
+
+    assert store.changes == StoreChanges(changed=[pcs[2], store.get_pc(name='pc_4')], removed=['pc_0'])
+    assert store.version == version + 4
+
+
+def test_changes_when_removed_pc_is_added_again_then_it_is_changed(store_with_pc, pc):
+    store_with_pc.mark_clean()
+    store_with_pc.remove_pc(name=pc.name)
+    store_with_pc.add_pc(pc=pc)
+    assert store_with_pc.changes == StoreChanges(changed=[pc], removed=[])
+
+
+def test_changes_when_changed_pc_was_evicted_by_mapping_then_it_is_not_kept_and_is_loaded_again():
+    store = Store(pcs=[PC(name='pc_0'), PC(name='pc_1')], mapping=CachedPCs({}, capacity=1))
+    store.mark_clean()
+    evicted_pc = store.get_pc(name='pc_0')
+    evicted_pc.add_component(category='cpu')
+    store.get_pc(name='pc_1')
+
+    changed_pcs = store.changes.changed
+    assert [(pc.name, pc.components) for pc in changed_pcs] == [('pc_0', {'cpu': {}})]
+    assert changed_pcs[0] is not evicted_pc
+
+
+def test_cache_stats_when_mapping_caches_pcs_then_its_counters_are_reported(store):
+    cached_store = Store(pcs=[PC(name='pc_0'), PC(name='pc_1')], mapping=CachedPCs({}, capacity=1))
+    cached_store.get_pc(name='pc_0')
+    assert cached_store.cache_stats == CacheStats(hits=0, misses=1, evictions=2, write_backs=2)
+    assert cached_store.resident_pcs == 1
+
+    assert store.cache_stats is None
+    assert store.resident_pcs is None
+
+
+def test_snapshot_when_store_is_changed_then_snapshot_is_not(store):
+    pcs = [PC(name=f'pc_{pc_id}', components={'cpu': {'name': 'i5'}}) for pc_id in range(3)]
+    store.add_pcs(pcs=pcs)
+    snapshot = store.snapshot()
+
+    store.add_pc(pc=PC(name='pc_3'))
+    store.remove_pc(name='pc_0')
+    pcs[1].update_component(category='cpu', param_name='name', param_value='i7')
+    pcs[1].add_component(category='gpu')
+    pcs[2].remove_component(category='cpu')
+
+    expected_content = [(f'pc_{pc_id}', {'cpu': {'name': 'i5'}}) for pc_id in range(3)]
+    assert [(pc.name, pc.components) for pc in snapshot.pcs] == expected_content
+    assert snapshot.get_pc(name='pc_3') is None
+    assert snapshot.get_pc(name='pc_1').components == {'cpu': {'name': 'i5'}}
+    assert [pc.name for pc in store.pcs] == ['pc_1', 'pc_2', 'pc_3']
+    assert pcs[1].components == {'cpu': {'name': 'i7'}, 'gpu': {}}
+
+
+def test_snapshot_when_pcs_are_got_before_store_is_changed_then_they_are_not_changed(store):
+    pc = PC(name='pc_0', components={'cpu': {'freq': '1'}})
+    store.add_pc(pc=pc)
+    snapshot = store.snapshot()
+    snapshot_pcs = snapshot.pcs
+    got_pc = snapshot_pcs[0]
+
+    pc.update_component(category='cpu', param_name='freq', param_value='2')
+    pc.update_component(category='cpu', param_name='cores', param_value='8')
+
+    assert snapshot_pcs[0].components == {'cpu': {'freq': '1'}}
+    assert got_pc.components == {'cpu': {'freq': '1'}}
+    assert snapshot.get_pc(name='pc_0').components == {'cpu': {'freq': '1'}}
+    assert len(snapshot_pcs) == 1
+    assert [pc.name for pc in snapshot_pcs[:1]] == ['pc_0']
+
+
+def test_snapshot_when_read_while_store_is_changed_by_other_thread_then_it_is_consistent():
+    store = Store(pcs=[PC(name=f'pc_{pc_id}', components={'cpu': {'freq': '0'}}) for pc_id in range(2000)],
+                  concurrent=True)
+    snapshot = store.snapshot()
+
+    def change():
+        for value in range(1, 6):
+            for pc in store.pcs:
+                pc.update_component(category='cpu', param_name=f'param_{value}', param_value=str(value))
+
+    thread = Thread(target=change)
+    thread.start()
+    contents = [[dict(spec) for spec in pc.components.values()] for _ in range(5) for pc in snapshot.pcs]
+    thread.join()
+
+    assert contents == [[{'freq': '0'}]] * 10000
+
+
+def test_snapshot_when_taken_then_changes_are_captured(store_with_pc, pc):
+    snapshot = store_with_pc.snapshot()
+    assert snapshot.is_dirty
+    assert snapshot.changes == StoreChanges(changed=[pc], removed=[])
+    assert snapshot.version == store_with_pc.version
+
+
+def test_snapshot_when_marked_clean_then_store_is_clean_unless_changed(store_with_pc, pcs):
+    store_with_pc.snapshot().mark_clean()
+    assert not store_with_pc.is_dirty
+
+    store_with_pc.add_pc(pc=pcs[0])
+    snapshot = store_with_pc.snapshot()
+    store_with_pc.add_pc(pc=pcs[1])
+    snapshot.mark_clean()
+    assert store_with_pc.changes == StoreChanges(changed=[pcs[0], pcs[1]], removed=[])
+
+
+def test_concurrent_store_when_used_by_many_threads_then_no_update_is_lost():
+    store = Store(concurrent=True)
+    pcs = [PC(name=f'pc_{pc_id}') for pc_id in range(4000)]
+    listener = Mock()
+    store.subscribe(listener)
+    assert store.find_by_component('cpu') == []
+
+    def add_and_change(thread_id):
+        for pc in pcs[thread_id::4]:
+            store.add_pc(pc=pc)
+            pc.add_component(category='cpu')
+            store.get_pc(name=pc.name)
+            store.snapshot()
+        store.remove_pcs(names=[pc.name for pc in pcs[thread_id:100:4]])
+
+    threads = [Thread(target=add_and_change, args=(thread_id,)) for thread_id in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(store.pcs) == 3900
+    assert len(store.find_by_component('cpu')) == 3900
+    assert listener.call_count == 4000 * 2 + 100
+    assert len(store.changes.changed) == 3900
+
+
+def test_concurrent_store_when_pc_is_changed_by_many_threads_then_no_update_is_lost():
+    pc = PC(name='pc_0', components={'cpu': {}})
+    store = Store(pcs=[pc], concurrent=True)
+
+    def update(thread_id):
+        for value in range(500):
+            pc.update_component(category='cpu', param_name=f'param_{thread_id}', param_value=str(value))
+
+    threads = [Thread(target=update, args=(thread_id,)) for thread_id in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert pc.components == {'cpu': {f'param_{thread_id}': '499' for thread_id in range(4)}}
+    assert store.version == 1 + 4 * 500